@@ -11,6 +11,10 @@ from flask_talisman import Talisman
 def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
 
+    # jsonify / |tojson için hızlı JSON encoder (jinja_env oluşmadan önce)
+    from services.json_response import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # Config yükle
     app_config = config.get_config()
     app.config.from_object(app_config)
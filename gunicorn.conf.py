@@ -0,0 +1,31 @@
+"""
+ORBIS Gunicorn ayarlari
+- Komut satiri (Dockerfile / Procfile) bind, worker ve timeout'u belirler
+- Bu dosya sadece worker yasam dongusu kancalarini tanimlar
+- Worker kapanirken process icinde biriken sayac / presence deltalari flush edilir;
+  atexit'e ek olarak, gunicorn'un worker'i kapattigi yolda da calisir
+"""
+import sys
+
+
+def _flush_buffers(log):
+    """Worker'da yuklenmis tamponlari flush et (yuklenmemis modulu import etme)"""
+    counter_buffer = sys.modules.get("services.counter_buffer")
+    if counter_buffer is not None:
+        counter_buffer.shutdown_all()
+    presence = sys.modules.get("services.presence")
+    if presence is not None:
+        try:
+            presence.presence_tracker.shutdown()
+        except Exception as e:
+            log.error(f"[Gunicorn] Presence flush hatasi: {e}")
+
+
+def worker_exit(server, worker):
+    """Worker process'i cikarken (max_requests geri donusumu, SIGTERM, reload)"""
+    _flush_buffers(server.log)
+
+
+def worker_abort(worker):
+    """Timeout'a ugrayan worker SIGABRT ile oldurulmeden once"""
+    _flush_buffers(worker.log)
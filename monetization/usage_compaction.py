@@ -0,0 +1,274 @@
+"""
+Kullanım Geçmişi Sıkıştırma
+- usage map'inde sadece son RECENT_DAYS gün tutulur
+- Daha eski günler usage_monthly.<YYYY-MM> aylık toplamlarına devredilir
+- Firestore işi: update_time ön koşuluyla küçük batch'ler halinde update
+  (eşzamanlı iki çalıştırma aynı günleri iki kez toplayamaz); ön koşulu tutmayan
+  batch'in dokümanları tek tek yeniden okunup tekrar denenir
+- LocalUsageLog: local dosya backend'i için append-only log + periyodik snapshot
+
+Çalıştırma (günlük cron):  python -m monetization.usage_compaction
+"""
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: tek process'li local geliştirme
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "usage_tracking"
+RECENT_DAYS = int(os.getenv("USAGE_RECENT_DAYS", "14"))
+SNAPSHOT_EVERY = int(os.getenv("USAGE_SNAPSHOT_EVERY", "500"))  # log satırı
+COMPACTION_BATCH_SIZE = 20  # tek dokümanın çakışması en fazla bu kadarını tekrar denemeye düşürür
+
+
+def split_usage(usage: dict, today: Optional[date] = None, keep_days: int = RECENT_DAYS) -> Tuple[dict, Dict[str, int]]:
+    """usage {gün: adet} -> (son keep_days gün, {ay: devredilecek toplam})"""
+    cutoff = ((today or date.today()) - timedelta(days=keep_days - 1)).isoformat()
+    recent, rolled = {}, {}
+    for day, count in (usage or {}).items():
+        if day >= cutoff:
+            recent[day] = count
+        else:
+            rolled[day[:7]] = rolled.get(day[:7], 0) + (count or 0)
+    return recent, rolled
+
+
+def compact_record(record: dict, today: Optional[date] = None, keep_days: int = RECENT_DAYS) -> dict:
+    """Tek cihaz kaydını yerinde sıkıştır (local backend)"""
+    recent, rolled = split_usage(record.get("usage", {}), today, keep_days)
+    if rolled:
+        monthly = record.setdefault("usage_monthly", {})
+        for month, count in rolled.items():
+            monthly[month] = monthly.get(month, 0) + count
+        record["usage"] = recent
+    return record
+
+
+# ═══════════════════════════════════════════════════════════════
+# FIRESTORE
+# ═══════════════════════════════════════════════════════════════
+
+def _compaction_updates(usage: dict, today: Optional[date], keep_days: int) -> Tuple[dict, int]:
+    """Firestore update alanları ve devredilen gün sayısı (devredilecek yoksa ({}, 0))"""
+    from firebase_admin import firestore
+    from google.cloud.firestore_v1.field_path import FieldPath
+
+    recent, rolled = split_usage(usage, today, keep_days)
+    if not rolled:
+        return {}, 0
+    updates = {FieldPath("usage", day).to_api_repr(): firestore.DELETE_FIELD
+               for day in usage if day not in recent}
+    days = len(updates)
+    for month, count in rolled.items():
+        updates[FieldPath("usage_monthly", month).to_api_repr()] = firestore.Increment(count)
+    return updates, days
+
+
+def compact_firestore(db, keep_days: int = RECENT_DAYS, today: Optional[date] = None,
+                      batch_size: int = COMPACTION_BATCH_SIZE) -> dict:
+    """usage_tracking dokümanlarında eski günleri aylık toplamlara devret"""
+    stats = {"scanned": 0, "compacted": 0, "days_rolled": 0, "skipped": 0, "retried": 0}
+    pending = []
+
+    for snap in db.collection(COLLECTION).select(["usage"]).stream():
+        stats["scanned"] += 1
+        updates, days = _compaction_updates((snap.to_dict() or {}).get("usage") or {}, today, keep_days)
+        if not updates:
+            continue
+        pending.append((snap, updates, days))
+        if len(pending) >= batch_size:
+            _commit(db, pending, stats, keep_days, today)
+            pending = []
+
+    if pending:
+        _commit(db, pending, stats, keep_days, today)
+    logger.info(f"[UsageCompaction] {stats}")
+    return stats
+
+
+def _commit(db, pending: list, stats: dict, keep_days: int, today: Optional[date]):
+    """Küçük batch'i yaz; ön koşul hatasında dokümanlar tek tek yeniden denenir"""
+    batch = db.batch()
+    for snap, updates, _ in pending:
+        # Okuduğumuz sürüm değiştiyse (araya yeni kayıt girdiyse) yazma başarısız olur
+        batch.update(snap.reference, updates, option=db.write_option(last_update_time=snap.update_time))
+    try:
+        batch.commit()
+        stats["compacted"] += len(pending)
+        stats["days_rolled"] += sum(days for _, _, days in pending)
+        return
+    except Exception as e:
+        logger.info(f"[UsageCompaction] Batch çakıştı ({len(pending)} doküman), tek tek deneniyor: {e}")
+
+    for snap, _, _ in pending:
+        stats["retried"] += 1
+        try:
+            fresh = snap.reference.get(["usage"])
+            updates, days = _compaction_updates((fresh.to_dict() or {}).get("usage") or {}, today, keep_days)
+            if updates:
+                snap.reference.update(updates, option=db.write_option(last_update_time=fresh.update_time))
+                stats["compacted"] += 1
+                stats["days_rolled"] += days
+        except Exception as e:
+            # Hâlâ eşzamanlı yazılıyor: bir sonraki çalıştırmada tekrar denenir
+            logger.warning(f"[UsageCompaction] Doküman atlandı ({snap.id}): {e}")
+            stats["skipped"] += 1
+
+
+# ═══════════════════════════════════════════════════════════════
+# LOCAL DOSYA BACKEND'İ
+# ═══════════════════════════════════════════════════════════════
+
+@contextmanager
+def _file_lock(path: str):
+    """Worker'lar arası kilit (snapshot sırasında araya satır eklenmesin). fcntl yoksa no-op."""
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class LocalUsageLog:
+    """Append-only kullanım logu + periyodik snapshot.
+
+    Snapshot (usage_data.json) eski tam-dosya formatıyla aynıdır; her kayıt
+    sadece log'a (usage_data.log) tek satır ekler. SNAPSHOT_EVERY satırda bir
+    snapshot sıkıştırılarak atomik yazılır ve log sıfırlanır. Diğer worker'ların
+    eklediği satırlar okumadan önce log ofsetinden itibaren uygulanır.
+    """
+
+    def __init__(self, snapshot_path: str, snapshot_every: int = SNAPSHOT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.log_path = os.path.splitext(snapshot_path)[0] + ".log"
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._data: Dict[str, dict] = {}
+        self._offset = 0
+        self._lines = 0
+        self._snapshot_mtime = None
+        self._reload()
+
+    # ─── Okuma ──────────────────────────────────────────────────
+
+    def _reload(self):
+        try:
+            with open(self.snapshot_path, "r") as f:
+                self._data = json.load(f)
+            self._snapshot_mtime = os.path.getmtime(self.snapshot_path)
+        except (OSError, ValueError):
+            self._data, self._snapshot_mtime = {}, None
+        self._offset = self._lines = 0
+        self._replay()
+
+    def _replay(self):
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # yarım yazılmış satır: sonraki senkronda
+                    self._offset += len(line)
+                    self._lines += 1
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+
+    def _sync(self):
+        try:
+            mtime = os.path.getmtime(self.snapshot_path)
+        except OSError:
+            mtime = None
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            log_size = 0
+        if mtime != self._snapshot_mtime or log_size < self._offset:
+            self._reload()  # başka worker snapshot aldı
+        elif log_size > self._offset:
+            self._replay()
+
+    def _apply(self, entry: dict):
+        record = self._data.setdefault(entry["d"], {"usage": {}})
+        usage = record.setdefault("usage", {})
+        usage[entry["day"]] = usage.get(entry["day"], 0) + entry.get("n", 1)
+        if entry.get("t"):
+            record["last_ad_watch"] = entry["t"]
+
+    def get(self, device_id: str) -> dict:
+        with self._lock:
+            self._sync()
+            return dict(self._data.get(device_id) or {"usage": {}})
+
+    # ─── Yazma ──────────────────────────────────────────────────
+
+    def record(self, device_id: str, day: str, timestamp: Optional[str], count: int = 1) -> dict:
+        """Tek satır ekle, güncel cihaz kaydını döndür (count=-1: iade, timestamp değişmez)"""
+        entry = {"d": device_id, "day": day, "n": count, "t": timestamp}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock, _file_lock(self.log_path):
+            self._sync()
+            with open(self.log_path, "a") as f:
+                f.write(line)
+            self._offset += len(line.encode())
+            self._lines += 1
+            self._apply(entry)
+            if self._lines >= self.snapshot_every:
+                self._snapshot()
+            return dict(self._data[device_id])
+
+    def snapshot(self):
+        with self._lock, _file_lock(self.log_path):
+            self._sync()
+            self._snapshot()
+
+    def _snapshot(self):
+        for record in self._data.values():
+            compact_record(record)
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.snapshot_path)
+        open(self.log_path, "w").close()
+        self._snapshot_mtime = os.path.getmtime(self.snapshot_path)
+        self._offset = self._lines = 0
+
+
+_local_logs: Dict[str, LocalUsageLog] = {}
+_local_logs_lock = threading.Lock()
+
+
+def get_local_log(snapshot_path: str) -> LocalUsageLog:
+    """Dosya başına process içi tek LocalUsageLog (UsageTracker istek başına oluşturulur)"""
+    with _local_logs_lock:
+        log = _local_logs.get(snapshot_path)
+        if log is None:
+            log = _local_logs[snapshot_path] = LocalUsageLog(snapshot_path)
+        return log
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from services.firebase_service import firebase_service
+
+    if firebase_service.db:
+        print(compact_firestore(firebase_service.db))
+    else:
+        get_local_log("instance/usage_data.json").snapshot()
+        print("Local snapshot yazıldı")
@@ -8,16 +8,24 @@ from datetime import datetime, date
 from flask import current_app
 import json
 import os
+import time
 import logging
 
+from .usage_compaction import get_local_log
+
 logger = logging.getLogger(__name__)
 
+USAGE_CACHE_TTL = 30  # saniye - get_user_usage cihaz cache'i
+USAGE_CACHE_MAX = 10000
+
 
 class UsageTracker:
     """Kullanıcı kullanım takibi - Her işlem için reklam zorunlu"""
 
     # In-memory storage (fallback)
     _memory_storage = {}
+    # device_id -> (son_gecerlilik, gun, bugunku_kullanim, last_ad_watch)
+    _usage_cache = {}
 
     def __init__(self, storage_path=None, use_supabase=True):
         self.storage_path = storage_path or "instance/usage_data.json"
@@ -77,49 +85,63 @@ class UsageTracker:
             except:
                 self._memory_storage = data
 
+    @staticmethod
+    def _usage_result(device_id: str, today_usage: int, last_ad_watch=None) -> dict:
+        return {
+            "device_id": device_id,
+            "today_usage": today_usage,
+            "daily_limit": 0,
+            "remaining": "requires_ad",
+            "is_premium": False,
+            "show_ads": True,
+            "requires_ad": True,
+            "last_ad_watch": last_ad_watch
+        }
+
+    @classmethod
+    def _cache_get(cls, device_id: str, today: str):
+        entry = cls._usage_cache.get(device_id)
+        if entry and entry[0] > time.time() and entry[1] == today:
+            return entry[2], entry[3]
+        return None
+
+    @classmethod
+    def _cache_put(cls, device_id: str, today: str, today_usage: int, last_ad_watch):
+        if len(cls._usage_cache) >= USAGE_CACHE_MAX:
+            cls._usage_cache.clear()  # TTL 30sn: toptan bosaltmak yeterli, sinirsiz buyumez
+        cls._usage_cache[device_id] = (time.time() + USAGE_CACHE_TTL, today, today_usage, last_ad_watch)
+
     def get_user_usage(self, device_id: str, email: str = None) -> dict:
         """Kullanıcının bugünkü kullanımını getir"""
         today = date.today().isoformat()
 
-        # Firestore'dan oku
+        # Firestore'dan oku (kısa TTL'li cihaz cache'i önünde)
         if self.use_supabase:
+            cached = self._cache_get(device_id, today)
+            if cached is not None:
+                return self._usage_result(device_id, *cached)
             try:
                 doc = self.db.collection('usage_tracking').document(device_id).get()
-                if doc.exists:
-                    user_data = doc.to_dict()
-                else:
-                    # Yeni kullanıcı oluştur
-                    user_data = {
-                        "device_id": device_id,
-                        "email": email,
-                        "usage": {},
-                        "created_at": datetime.now().isoformat()
-                    }
-                    self.db.collection('usage_tracking').document(device_id).set(user_data)
+                # Doküman yoksa oluşturulmaz: ilk record_usage merge ile oluşturur
+                user_data = doc.to_dict() if doc.exists else {}
             except Exception as e:
                 logger.debug(f"[UsageTracker] Firestore error: {e}")
                 user_data = self._memory_storage.get(device_id, {"usage": {}})
-        else:
+            today_usage = (user_data.get("usage") or {}).get(today, 0)
+            self._cache_put(device_id, today, today_usage, user_data.get("last_ad_watch"))
+            return self._usage_result(device_id, today_usage, user_data.get("last_ad_watch"))
+
+        if self.use_memory:
             data = self._load_data()
             if device_id not in data:
                 data[device_id] = {"usage": {}}
                 self._save_data(data)
             user_data = data[device_id]
+        else:
+            user_data = get_local_log(self.storage_path).get(device_id)
 
         today_usage = user_data.get("usage", {}).get(today, 0)
-
-        result = {
-            "device_id": device_id,
-            "today_usage": today_usage,
-            "daily_limit": 0,
-            "remaining": "requires_ad",
-            "is_premium": False,
-            "show_ads": True,
-            "requires_ad": True,
-            "last_ad_watch": user_data.get("last_ad_watch")
-        }
-
-        return result
+        return self._usage_result(device_id, today_usage, user_data.get("last_ad_watch"))
 
     def can_use_feature(self, device_id: str, feature: str = "ad_watch", email: str = None) -> dict:
         """
@@ -135,6 +157,40 @@ class UsageTracker:
             "message": "Devam etmek için reklam izlemeniz gerekiyor."
         }
 
+    @staticmethod
+    def _increment_result(write_result):
+        """set() WriteResult'ındaki Increment sonucunu int olarak döndür (yoksa None)"""
+        try:
+            value = write_result.transform_results[0]
+            return int(value.integer_value or value.double_value)
+        except (AttributeError, IndexError, TypeError, ValueError):
+            return None
+
+    def refund_usage(self, device_id: str, day: str = None) -> None:
+        """record_usage ile önceden ayrılan bir kullanımı geri al (başarısız iş)"""
+        day = day or date.today().isoformat()
+
+        if self.use_supabase:
+            try:
+                from firebase_admin import firestore
+                doc_ref = self.db.collection('usage_tracking').document(device_id)
+                doc_ref.set({"usage": {day: firestore.Increment(-1)}}, merge=True)
+                self._usage_cache.pop(device_id, None)
+                return
+            except Exception as e:
+                logger.debug(f"[UsageTracker] Firestore error: {e}")
+                usage = self._memory_storage.get(device_id, {}).get("usage", {})
+                if usage.get(day):
+                    usage[day] -= 1
+        elif not self.use_memory:
+            get_local_log(self.storage_path).record(device_id, day, None, count=-1)
+        else:
+            data = self._load_data()
+            usage = data.get(device_id, {}).get("usage", {})
+            if usage.get(day):
+                usage[day] -= 1
+                self._save_data(data)
+
     def record_usage(self, device_id: str, feature: str = "ad_watch", email: str = None) -> dict:
         """
         Kullanımı kaydet (reklam izleme)
@@ -144,27 +200,28 @@ class UsageTracker:
 
         if self.use_supabase:
             try:
+                from firebase_admin import firestore
                 doc_ref = self.db.collection('usage_tracking').document(device_id)
-                doc = doc_ref.get()
-
-                if doc.exists:
-                    user_data = doc.to_dict()
-                else:
-                    user_data = {
-                        "device_id": device_id,
-                        "email": email,
-                        "usage": {},
-                        "created_at": now.isoformat()
-                    }
-
-                if "usage" not in user_data:
-                    user_data["usage"] = {}
-                old_usage = user_data["usage"].get(today, 0)
-                user_data["usage"][today] = old_usage + 1
-                user_data["last_ad_watch"] = now.isoformat()
-                user_data["updated_at"] = now.isoformat()
-
-                doc_ref.set(user_data)
+                update = {
+                    "device_id": device_id,
+                    "usage": {today: firestore.Increment(1)},
+                    "last_ad_watch": now.isoformat(),
+                    "updated_at": now.isoformat()
+                }
+                if email:
+                    update["email"] = email
+                # Tek round-trip: atomik Increment + merge (doküman yoksa oluşur).
+                # Yeni sayaç değeri commit yanıtındaki transform sonucundan okunur.
+                write_result = doc_ref.set(update, merge=True)
+                today_usage = self._increment_result(write_result)
+                if today_usage is None:
+                    cached = self._cache_get(device_id, today)
+                    if cached is None:
+                        self._usage_cache.pop(device_id, None)
+                        return self.get_user_usage(device_id, email)
+                    today_usage = cached[0] + 1
+                self._cache_put(device_id, today, today_usage, now.isoformat())
+                return self._usage_result(device_id, today_usage, now.isoformat())
 
             except Exception as e:
                 logger.debug(f"[UsageTracker] Firestore error: {e}")
@@ -174,6 +231,10 @@ class UsageTracker:
                     self._memory_storage[device_id]["usage"][today] = 0
                 self._memory_storage[device_id]["usage"][today] += 1
                 self._memory_storage[device_id]["last_ad_watch"] = now.isoformat()
+        elif not self.use_memory:
+            # Local dosya: tüm JSON'u yeniden yazmak yerine log'a tek satır
+            user_data = get_local_log(self.storage_path).record(device_id, today, now.isoformat())
+            return self._usage_result(device_id, user_data["usage"].get(today, 0), now.isoformat())
         else:
             data = self._load_data()
 
@@ -16,6 +16,9 @@ import logging
 
 from google.cloud.firestore_v1.base_query import FieldFilter
 
+from services.firestore_pagination import InvalidPageToken, aggregate_count, count_cache, paginate
+from services.admin_overview import overview_aggregator
+
 logger = logging.getLogger(__name__)
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -160,18 +163,18 @@ def statistics():
 @admin_required
 @handle_errors("İstatistikler alınamadı")
 def get_stats_overview():
-    """Dashboard için genel istatistikler - StatsCounter kullanır (1 READ)"""
-    from services.stats_counter import stats_counter
-    
-    stats = stats_counter.get_overview()
-    
-    if not stats:
+    """Dashboard için genel istatistikler - zamanlanmış snapshot'tan (services.admin_overview)"""
+    snapshot = overview_aggregator.get(request.args.get('range', '7d'))
+
+    if not snapshot:
         return jsonify({
             'success': False,
             'error': 'DATABASE_UNAVAILABLE',
             'message': 'İstatistikler alınamadı'
         }), 500
-    
+
+    parts = snapshot['parts']
+    stats = parts.get('stats', {})
     return jsonify({
         'success': True,
         'data': {
@@ -190,15 +193,23 @@ def get_stats_overview():
             'lastLoginName': stats.get('last_login_name', ''),
             'lastLoginTime': stats.get('last_login_time', ''),
             # GA4 series (None ise client default gösterir)
-            **_attach_ga_data(request.args.get('range', '7d')),
+            **parts.get('ga', {}),
             # AdMob (None ise client default gösterir)
-            **_attach_admob_data(request.args.get('range', '7d')),
+            **parts.get('admob', {}),
             # Activity feed (Firestore son olaylar)
-            **_attach_activity(),
+            **parts.get('activity', {}),
+            # Snapshot tazeliği
+            'generatedAt': snapshot.get('generated_at'),
+            'sources': snapshot.get('sources', {}),
         }
     })
 
 
+def _stats_source(date_range: str):
+    from services.stats_counter import stats_counter
+    return stats_counter.get_overview()
+
+
 def _attach_ga_data(date_range: str) -> dict:
     """GA4 Data API'den series çek. Service yoksa boş döner (client default)."""
     try:
@@ -274,52 +285,94 @@ def _attach_admob_data(date_range: str) -> dict:
         return {}
 
 
+def _cursor_invalid_response(error: InvalidPageToken):
+    """pageToken'in dokumani silinmis / token bozuk: istemci ilk sayfadan yeniden baslamali"""
+    logger.info(f"[Admin] Gecersiz pageToken: {error}")
+    return jsonify({
+        'success': False,
+        'error': 'CURSOR_INVALID',
+        'cursor_invalid': True,
+        'message': 'Sayfa bağlantısı geçersiz, liste baştan yüklenmeli'
+    }), 400
+
+
+def _activity_page(limit: int = 10, page_token: str = None):
+    """purchases koleksiyonundan en yeni olaylar (cursor sayfalama) -> (items, next_token)"""
+    from google.cloud.firestore import Query
+    purchases_ref = firebase_service.db.collection('purchases')
+    docs, next_token = paginate(
+        purchases_ref.order_by('timestamp', direction=Query.DESCENDING),
+        purchases_ref, limit, page_token
+    )
+    items = []
+    for d in docs:
+        data = d.to_dict() or {}
+        t = data.get('timestamp')
+        rel = ''
+        if t:
+            try:
+                from datetime import datetime, timezone
+                dt = t if isinstance(t, datetime) else datetime.fromisoformat(str(t))
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                delta = datetime.now(timezone.utc) - dt
+                if delta.days > 0:
+                    rel = f'{delta.days}g önce'
+                elif delta.seconds > 3600:
+                    rel = f'{delta.seconds // 3600}s önce'
+                elif delta.seconds > 60:
+                    rel = f'{delta.seconds // 60}dk önce'
+                else:
+                    rel = 'az önce'
+            except Exception:
+                rel = ''
+        # Premium kaldirildi: sadece push/info olaylari goster
+        items.append({
+            'type': 'info',
+            'title': f"Etkinlik · {data.get('packageId', data.get('type', 'bilinmiyor'))}",
+            'meta': f"uid: {data.get('userId', '?')[:12]}…",
+            'relative': rel,
+            'at': str(t) if t else None,
+        })
+    return items, next_token
+
+
 def _attach_activity() -> dict:
     """Firestore son 10 olay (signup, push, error). Premium kaldirildi."""
     try:
-        from services.firebase_service import firebase_service
         if not firebase_service.db:
             return {}
-        # purchases koleksiyonundan son 10 kayıt (geriye uyumluluk)
-        from google.cloud.firestore import Query
-        docs = firebase_service.db.collection('purchases') \
-            .order_by('timestamp', direction=Query.DESCENDING) \
-            .limit(10).stream()
-        items = []
-        for d in docs:
-            data = d.to_dict() or {}
-            t = data.get('timestamp')
-            rel = ''
-            if t:
-                try:
-                    from datetime import datetime, timezone
-                    dt = t if isinstance(t, datetime) else datetime.fromisoformat(str(t))
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    delta = datetime.now(timezone.utc) - dt
-                    if delta.days > 0:
-                        rel = f'{delta.days}g önce'
-                    elif delta.seconds > 3600:
-                        rel = f'{delta.seconds // 3600}s önce'
-                    elif delta.seconds > 60:
-                        rel = f'{delta.seconds // 60}dk önce'
-                    else:
-                        rel = 'az önce'
-                except Exception:
-                    rel = ''
-            # Premium kaldirildi: sadece push/info olaylari goster
-            items.append({
-                'type': 'info',
-                'title': f"Etkinlik · {data.get('packageId', data.get('type', 'bilinmiyor'))}",
-                'meta': f"uid: {data.get('userId', '?')[:12]}…",
-                'relative': rel,
-                'at': str(t) if t else None,
-            })
-        return {'activity': items} if items else {}
+        items, next_token = _activity_page(10)
+        if not items:
+            return {}
+        return {'activity': items, 'activityNextPageToken': next_token}
     except Exception:
         return {}
 
 
+# Dashboard snapshot kaynaklari: paralel calisir, her biri kendi timeout'u ile
+overview_aggregator.register('stats', _stats_source, timeout=10, required=True, per_range=False)
+overview_aggregator.register('ga', _attach_ga_data, timeout=8)
+overview_aggregator.register('admob', _attach_admob_data, timeout=8)
+overview_aggregator.register('activity', lambda date_range: _attach_activity(), timeout=5, per_range=False)
+
+
+@admin_bp.route('/api/activity', methods=['GET'])
+@admin_required
+@handle_errors("Etkinlikler alınamadı")
+def get_activity():
+    """Etkinlik akışının sonraki sayfaları (pageToken ile)"""
+    if not firebase_service.db:
+        raise DatabaseError("Veritabanı bağlantısı yok")
+    try:
+        items, next_token = _activity_page(
+            request.args.get('limit', 10, type=int), request.args.get('pageToken')
+        )
+    except InvalidPageToken as e:
+        return _cursor_invalid_response(e)
+    return jsonify({'success': True, 'data': {'activity': items, 'nextPageToken': next_token}})
+
+
 # ─── GA4 + AdMob standalone endpoints (deep link için) ─────
 @admin_bp.route('/api/analytics/overview', methods=['GET'])
 @admin_required
@@ -401,7 +454,7 @@ def get_admob_apps():
 @admin_required
 @handle_errors("Kullanıcı listesi alınamadı")
 def get_users():
-    """Kullanıcı listesi - select() projection + Firestore pagination"""
+    """Kullanıcı listesi - select() projection + cursor pagination (pageToken)"""
     db = firebase_service.db
     if not db:
         return jsonify({
@@ -411,9 +464,10 @@ def get_users():
         }), 500
 
     limit = request.args.get('limit', 50, type=int)
-    offset = request.args.get('offset', 0, type=int)
+    offset = request.args.get('offset', 0, type=int)  # sadece arama sonuclari icin
     filter_type = request.args.get('filter', 'all')
     search = request.args.get('search', '').lower()
+    next_page_token = None
 
     # Sadece gerekli field'lari oku (premium/credits kaldirildi)
     PROJECTION = ["email", "displayName", "photoURL",
@@ -425,8 +479,19 @@ def get_users():
     # Premium/free filtreleri kaldirildi — uygulama ucretsiz.
     # Geriye uyumluluk: filter=all kabul edilir, premium/free no-op sayilir.
 
-    # Search varsa tumunu oku (Firestore text search desteklemez)
+    # Search: prefix indeksi (services.user_search); indeks yoksa eski tam tarama
+    indexed = None
     if search:
+        from services.user_search import user_search_index
+        indexed = user_search_index.search(search, offset, limit)
+
+    if search and indexed is not None:
+        total, page_ids = indexed
+        refs = [users_ref.document(uid) for uid in page_ids]
+        snapshots = {s.id: s for s in db.get_all(refs, field_paths=PROJECTION)} if refs else {}
+        users = [(uid, snapshots[uid].to_dict() or {}) for uid in page_ids
+                 if uid in snapshots and snapshots[uid].exists]
+    elif search:
         all_users = list(users_ref.select(PROJECTION).stream())
         filtered = []
         for u in all_users:
@@ -438,15 +503,14 @@ def get_users():
         total = len(filtered)
         users = filtered[offset:offset + limit]
     else:
-        # COUNT ile toplam sayi
-        total = users_ref.count().get()[0][0].value
-        # Pagination ile oku
-        users_data = list(
-            users_ref.select(PROJECTION)
-            .offset(offset)
-            .limit(limit)
-            .stream()
-        )
+        # Cursor sayfalama (start_after) + cache'li COUNT
+        total = count_cache.get('users', lambda: aggregate_count(users_ref))
+        try:
+            users_data, next_page_token = paginate(
+                users_ref.select(PROJECTION), users_ref, limit, request.args.get('pageToken')
+            )
+        except InvalidPageToken as e:
+            return _cursor_invalid_response(e)
         users = [(u.id, u.to_dict()) for u in users_data]
 
     user_list = [{
@@ -469,7 +533,8 @@ def get_users():
             'users': user_list,
             'total': total,
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'nextPageToken': next_page_token
         }
     })
 
@@ -602,10 +667,10 @@ def send_push_notification():
     result = None
     
     if target_type == 'user':
-        tokens = firebase_service.get_user_tokens(target)
-        if tokens:
-            result = firebase_service.send_push_to_multiple(tokens, title, body, extra_data)
-        else:
+        from services.push_fanout import push_fanout
+        # Token'lar token_registry'den; geçersiz token temizliği sadece bu kullanıcıyı okur
+        result = push_fanout.send_to_users([target], title, body, extra_data, log=False)
+        if not result['tokens']:
             return jsonify({
                 'success': False,
                 'error': 'NO_TOKENS',
@@ -628,7 +693,9 @@ def send_push_notification():
             'details': {
                 'targetType': target_type,
                 'target': target,
-                'title': title
+                'title': title,
+                # Teslimat istatistikleri (fan-out motoru, sadece user hedefinde)
+                **(result if isinstance(result, dict) else {})
             },
             'timestamp': firestore.SERVER_TIMESTAMP
         })
@@ -641,6 +708,46 @@ def send_push_notification():
     })
 
 
+@admin_bp.route('/api/push/campaign', methods=['POST'])
+@admin_required
+@handle_errors("Kampanya başlatılamadı")
+def start_push_campaign():
+    """Günlük AI push kampanyasını arka planda başlat (aynı id ile tekrar çağrılırsa kaldığı yerden devam eder)"""
+    import threading
+    from services.push_campaign import DailyPushCampaign
+
+    if not firebase_service.db:
+        raise DatabaseError("Veritabanı bağlantısı yok")
+
+    data = request.get_json(silent=True) or {}
+    campaign = DailyPushCampaign(
+        campaign_id=data.get('campaignId'),
+        title=data.get('title') or "Günün Mesajı",
+        admin_email=session.get('admin_email'),
+    )
+    threading.Thread(target=campaign.run, daemon=True, name=f"campaign-{campaign.campaign_id}").start()
+    logger.info(f"Push campaign started by {session.get('admin_email')}: {campaign.campaign_id}")
+
+    return jsonify({
+        'success': True,
+        'campaignId': campaign.campaign_id,
+        'statusUrl': url_for('admin.get_push_campaign', campaign_id=campaign.campaign_id)
+    }), 202
+
+
+@admin_bp.route('/api/push/campaign/<campaign_id>', methods=['GET'])
+@admin_required
+@handle_errors("Kampanya durumu alınamadı")
+def get_push_campaign(campaign_id):
+    """Kampanya ilerlemesi ve throughput raporu"""
+    from services.push_campaign import get_campaign
+
+    campaign = get_campaign(campaign_id)
+    if campaign is None:
+        return jsonify({'success': False, 'error': 'CAMPAIGN_NOT_FOUND'}), 404
+    return jsonify({'success': True, 'campaign': campaign})
+
+
 @admin_bp.route('/api/stats/purchases', methods=['GET'])
 @admin_required
 @handle_errors("Satın alma istatistikleri alınamadı")
@@ -656,16 +763,32 @@ def get_purchase_stats():
     
     # Son 30 günlük etkinlikler (premium/credits kaldirildi)
     from datetime import datetime, timedelta
+    from google.cloud.firestore import Query
     thirty_days_ago = datetime.now() - timedelta(days=30)
 
-    purchases = list(
-        db.collection('purchases')
-        .where(filter=FieldFilter('timestamp', '>=', thirty_days_ago))
-        .stream()
-    )
+    purchases_ref = db.collection('purchases')
+    recent = purchases_ref.where(filter=FieldFilter('timestamp', '>=', thirty_days_ago))
+    # Toplam: count() aggregation (dokümanlar okunmaz), periyodik yenilenir
+    total_events = count_cache.get('purchases_30d', lambda: aggregate_count(recent))
 
-    # Premium/credit satisi kaldirildi — sadece toplam kayit sayisi
-    total_events = len(purchases)
+    # Liste: cursor sayfalama (pageToken)
+    try:
+        docs, next_page_token = paginate(
+            recent.order_by('timestamp', direction=Query.DESCENDING), purchases_ref,
+            request.args.get('limit', 20, type=int), request.args.get('pageToken')
+        )
+    except InvalidPageToken as e:
+        return _cursor_invalid_response(e)
+    purchase_list = []
+    for p in docs:
+        pdata = p.to_dict() or {}
+        purchase_list.append({
+            'id': p.id,
+            'userId': pdata.get('userId'),
+            'type': pdata.get('type'),
+            'item': pdata.get('item') or pdata.get('packageId'),
+            'timestamp': str(pdata.get('timestamp')) if pdata.get('timestamp') else None
+        })
 
     return jsonify({
         'success': True,
@@ -678,7 +801,9 @@ def get_purchase_stats():
                 'totalEvents': total_events,
                 'totalPurchases': total_events,
                 'message': 'Premium ve krediler kaldirildi. Uygulama tamamen ucretsizdir.'
-            }
+            },
+            'purchases': purchase_list,
+            'nextPageToken': next_page_token
         }
     })
 
@@ -762,6 +887,10 @@ def update_pricing():
         'updated_by': session.get('admin_email', 'unknown'),
     })
     
+    # Tum worker'lardaki config cache'i yenile
+    from services.config_cache import config_cache
+    config_cache.invalidate('pricing')
+
     # Admin log
     db.collection('admin_logs').add({
         'action': 'pricing_update',
@@ -846,6 +975,10 @@ def update_ai_settings():
 
     db.collection('config').document('ai_settings').set(doc_data)
 
+    # Tum worker'lardaki config cache'i yenile (AIService fallback zinciri)
+    from services.config_cache import config_cache
+    config_cache.invalidate('ai_settings')
+
     # Admin log
     db.collection('admin_logs').add({
         'action': 'ai_settings_update',
@@ -14,7 +14,8 @@ from services.ai_service import (
     get_ai_interpretation_engine as get_ai_interpretation_engine_service,
 )
 from services.astro_service import calculate_astro_data
-from services.chart_db_service import smart_calculate
+from services.chart_db_service import smart_calculate, get_cached_chart_body
+from services.json_response import dumps as json_dumps, json_response
 from datetime import datetime
 import json
 import logging
@@ -120,28 +121,25 @@ Sitemap: https://app.orbisastro.online/sitemap.xml
 @handle_errors("Fiyat bilgileri alınamadı")
 def api_get_pricing():
     """
-    Firestore'dan fiyat bilgilerini getir (public)
+    Firestore'dan fiyat bilgilerini getir (public, paylaşılan config cache ile)
     Eğer Firestore'da yoksa varsayılan fiyatları döndür
     """
     try:
-        from services.firebase_service import firebase_service
-        db = firebase_service.db
-        
-        if db:
-            doc = db.collection("config").document("pricing").get()
-            if doc.exists:
-                data = doc.to_dict()
-                return jsonify({
-                    "success": True,
-                    "source": "firestore",
-                    "data": {
-                        "daily": data.get("daily", 30),
-                        "monthly": data.get("monthly", 300),
-                        "yearly": data.get("yearly", 3000),
-                        "updated_at": data.get("updated_at"),
-                    }
-                })
-        
+        from services.config_cache import config_cache
+        data = config_cache.get("pricing")
+
+        if data:
+            return jsonify({
+                "success": True,
+                "source": "firestore",
+                "data": {
+                    "daily": data.get("daily", 30),
+                    "monthly": data.get("monthly", 300),
+                    "yearly": data.get("yearly", 3000),
+                    "updated_at": data.get("updated_at"),
+                }
+            })
+
         # Fallback: varsayılan fiyatlar
         return jsonify({
             "success": True,
@@ -347,6 +345,142 @@ def show_results():
     return render_template("new_result.html", astro_data=None, user_name=None)
 
 
+@bp.route("/api/chart", methods=["POST"])
+@handle_errors("Harita hesaplanamadı")
+def api_chart():
+    """Harita verisi (JSON). Tam cache hit'te saklı JSON parçaları çözülmeden
+    yanıtlanır; gzip/br sıkıştırılmış kopya cache anahtarıyla saklanır."""
+    data = request.get_json() or {}
+    birth_date_str = str(data.get("birth_date", "")).strip()
+    birth_time_str = str(data.get("birth_time", "")).strip()
+
+    try:
+        birth_date = datetime.strptime(birth_date_str, "%Y-%m-%d").date()
+    except ValueError as ve:
+        raise InvalidDateError(birth_date_str, "%Y-%m-%d") from ve
+
+    birth_time = parse_time_flexible(birth_time_str)
+
+    try:
+        lat = float(data.get("latitude"))
+        lng = float(data.get("longitude"))
+    except (TypeError, ValueError) as ve:
+        raise ValidationError(
+            message="Geçersiz koordinat değerleri!",
+            error_code="INVALID_COORDINATES",
+            details={"latitude": data.get("latitude"), "longitude": data.get("longitude")}
+        ) from ve
+
+    transit_info = None
+    if data.get("transit_date") and data.get("transit_time"):
+        transit_info = {
+            "date": data["transit_date"],
+            "time": data["transit_time"],
+            "latitude": float(data.get("transit_latitude") or lat),
+            "longitude": float(data.get("transit_longitude") or lng),
+        }
+
+    cached = get_cached_chart_body(birth_date, birth_time, lat, lng, transit_info)
+    if cached:
+        body, cache_key = cached
+        return json_response(body, cache_key=cache_key)
+
+    astro_data = smart_calculate(
+        birth_date=birth_date,
+        birth_time=birth_time,
+        latitude=lat,
+        longitude=lng,
+        transit_info=transit_info,
+    )
+
+    if not astro_data or "error" in astro_data:
+        error_msg = (
+            astro_data.get("error", "Bilinmeyen hata")
+            if astro_data
+            else "Hesaplama başarısız"
+        )
+        raise CalculationError(
+            message=f"Hesaplama sırasında bir hata oluştu: {error_msg}",
+            error_code="CALCULATION_FAILED",
+            details={"astro_error": error_msg}
+        )
+
+    return json_response(json_dumps(astro_data))
+
+
+def _is_native_client() -> bool:
+    """Capacitor (Android) istemci mi? PWA'da AdMob calismadigi icin reklam zorunlulugu yok."""
+    user_agent = request.headers.get('User-Agent', '')
+    client_platform = request.headers.get('X-Client-Platform', '').lower()
+    return (
+        'capacitor' in user_agent.lower() or
+        client_platform in ('capacitor', 'native', 'android')
+    )
+
+
+def _extract_ai_extra_params(data: dict) -> dict:
+    """Ek parametreler (tarih, dönem vb.) - hem Türkçe hem İngilizce destekle"""
+    extra_params = {
+        "date": data.get("date") or data.get("tarih"),
+        "start_date": data.get("start_date") or data.get("baslangic_tarihi"),
+        "end_date": data.get("end_date") or data.get("bitis_tarihi"),
+        "period": data.get("period") or data.get("donem"),
+        "duration": data.get("duration") or data.get("sure"),
+    }
+    # None değerleri temizle
+    return {k: v for k, v in extra_params.items() if v is not None}
+
+
+def _requires_ad_response(device_id, email):
+    """Native istemcide kullanım limiti aşıldıysa 429 yanıtı döndür, yoksa None."""
+    from monetization.usage_tracker import UsageTracker
+    usage_tracker = UsageTracker()
+
+    can_use = usage_tracker.can_use_feature(device_id, "ai_interpretation", email)
+
+    if not can_use.get("allowed"):
+        return jsonify({
+            "success": False,
+            "error": "requires_ad",
+            "message": can_use.get("message", "Devam etmek için reklam izlemeniz gerekiyor."),
+            "remaining": 0,
+            "requires_ad": True
+        }), 429
+    return None
+
+
+def _record_ai_usage(device_id, email, is_pwa: bool) -> dict:
+    """Kullanımı say (sadece native) ve yanıttaki `usage` alanını döndür"""
+    if device_id and not is_pwa:
+        from monetization.usage_tracker import UsageTracker
+        usage_tracker = UsageTracker()
+        usage_info = usage_tracker.record_usage(device_id, "ai_interpretation", email)
+        return {
+            "remaining": usage_info.get("remaining", 0),
+            "requires_ad": usage_info.get("requires_ad", True)
+        }
+    # PWA: reklam kontrolü yok
+    return {
+        "remaining": 999,
+        "requires_ad": False
+    }
+
+
+def _record_analysis_completed():
+    """Stats counter: analiz sayısını artır"""
+    try:
+        from services.stats_counter import stats_counter
+        stats_counter.on_analysis_completed()
+    except Exception:
+        pass
+
+
+def _record_ai_success(result: dict, device_id, email, is_pwa: bool):
+    """Başarılı yorum sonrası → kullanımı say + stats counter güncelle"""
+    result["usage"] = _record_ai_usage(device_id, email, is_pwa)
+    _record_analysis_completed()
+
+
 @bp.route("/api/get_ai_interpretation", methods=["POST"])
 @handle_errors("AI yorum alınamadı")
 def api_get_ai_interpretation():
@@ -361,76 +495,119 @@ def api_get_ai_interpretation():
     device_id = data.get("device_id")
     email = data.get("email")
 
-    # ═══════════════════════════════════════════════════════════════
-    # PWA tespiti: Web istemcilerde reklam zorunlulugu yok
-    # ═══════════════════════════════════════════════════════════════
-    user_agent = request.headers.get('User-Agent', '')
-    client_platform = request.headers.get('X-Client-Platform', '').lower()
-    is_pwa = (
-        'capacitor' not in user_agent.lower() and
-        client_platform != 'capacitor' and
-        client_platform != 'native' and
-        client_platform != 'android'
-    )
+    is_pwa = not _is_native_client()
 
     # Kullanım limiti kontrolü — sadece native için
     if device_id and not is_pwa:
-        from monetization.usage_tracker import UsageTracker
-        usage_tracker = UsageTracker()
+        limited = _requires_ad_response(device_id, email)
+        if limited:
+            return limited
 
-        can_use = usage_tracker.can_use_feature(device_id, "ai_interpretation", email)
-
-        if not can_use.get("allowed"):
-            return jsonify({
-                "success": False,
-                "error": "requires_ad",
-                "message": can_use.get("message", "Devam etmek için reklam izlemeniz gerekiyor."),
-                "remaining": 0,
-                "requires_ad": True
-            }), 429
-
-    # Ek parametreler (tarih, dönem vb.) - hem Türkçe hem İngilizce destekle
-    extra_params = {
-        "date": data.get("date") or data.get("tarih"),
-        "start_date": data.get("start_date") or data.get("baslangic_tarihi"),
-        "end_date": data.get("end_date") or data.get("bitis_tarihi"),
-        "period": data.get("period") or data.get("donem"),
-        "duration": data.get("duration") or data.get("sure"),
-    }
-    # None değerleri temizle
-    extra_params = {k: v for k, v in extra_params.items() if v is not None}
+    extra_params = _extract_ai_extra_params(data)
 
     # API'den yorum al
     result = get_ai_interpretation_engine_service(
         astro_data, interpretation_type, user_name, **extra_params
     )
 
-    # Başarılı yorum sonrası → kullanımı say + stats counter güncelle
     if result.get("success"):
-        # Kullanımı kaydet — sadece native için
+        _record_ai_success(result, device_id, email, is_pwa)
+
+    return jsonify(result)
+
+
+@bp.route("/api/ai/jobs", methods=["POST"])
+@handle_errors("AI yorum işi oluşturulamadı")
+def api_submit_ai_job():
+    """AI yorumunu arka plan kuyruğuna al, hemen job_id döndür.
+
+    Sonuç GET /api/ai/jobs/<job_id> ile sorgulanır; istekte `push_token`
+    varsa iş bitince FCM push da gönderilir. Gövde /api/get_ai_interpretation
+    ile aynıdır.
+    """
+    from services.ai_jobs import ai_job_queue
+
+    data = request.get_json() or {}
+    interpretation_type = data.get("interpretation_type", "daily")
+    astro_data = data.get("astro_data", {})
+    user_name = data.get("user_name", "Değerli Danışanım")
+    device_id = data.get("device_id")
+    email = data.get("email")
+    push_token = data.get("push_token")
+
+    is_pwa = not _is_native_client()
+
+    if device_id and not is_pwa:
+        limited = _requires_ad_response(device_id, email)
+        if limited:
+            return limited
+
+    # Kullanım hakkı submit anında ayrılır (iş bitmeden yeni işler limiti
+    # aşamasın); iş başarısız olursa veya kuyruğa alınamazsa iade edilir.
+    usage = _record_ai_usage(device_id, email, is_pwa)
+    usage_day = datetime.now().date().isoformat()
+
+    def refund(_result=None):
         if device_id and not is_pwa:
             from monetization.usage_tracker import UsageTracker
-            usage_tracker = UsageTracker()
-            usage_info = usage_tracker.record_usage(device_id, "ai_interpretation", email)
-            result["usage"] = {
-                "remaining": usage_info.get("remaining", 0),
-                "requires_ad": usage_info.get("requires_ad", True)
-            }
-        else:
-            # PWA: reklam kontrolü yok
-            result["usage"] = {
-                "remaining": 999,
-                "requires_ad": False
-            }
+            UsageTracker().refund_usage(device_id, usage_day)
 
-        # Stats counter: analiz sayısını artır
-        try:
-            from services.stats_counter import stats_counter
-            stats_counter.on_analysis_completed()
-        except Exception:
-            pass
+    def on_success(result):
+        result["usage"] = usage
+        _record_analysis_completed()
 
-    return jsonify(result)
+    try:
+        job_id = ai_job_queue.submit(
+            astro_data,
+            interpretation_type,
+            user_name,
+            extra_params=_extract_ai_extra_params(data),
+            push_token=push_token,
+            on_success=on_success,
+            on_failure=refund,
+        )
+    except Exception:
+        refund()
+        raise
+
+    if job_id is None:
+        refund()
+        return jsonify({
+            "success": False,
+            "error": "QUEUE_FULL",
+            "message": "Şu anda çok fazla istek var, lütfen biraz sonra tekrar deneyin."
+        }), 503
+
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for("main.api_get_ai_job", job_id=job_id),
+    }), 202
+
+
+@bp.route("/api/ai/jobs/<job_id>", methods=["GET"])
+@handle_errors("AI yorum işi sorgulanamadı")
+def api_get_ai_job(job_id):
+    """AI job durumunu/sonucunu döndür (polling)."""
+    from services.ai_jobs import ai_job_queue
+
+    job = ai_job_queue.get(job_id)
+    if not job:
+        return jsonify({
+            "success": False,
+            "error": "JOB_NOT_FOUND",
+            "message": "İş bulunamadı veya süresi doldu"
+        }), 404
+
+    response = {
+        "success": True,
+        "job_id": job_id,
+        "status": job.get("status"),
+    }
+    if "result" in job:
+        response["result"] = job["result"]
+    return jsonify(response)
 
 
 @bp.route("/settings")
@@ -661,9 +838,13 @@ def api_record_ad_watch():
 @bp.route("/api/stats/user-created", methods=["POST"])
 @handle_errors("İstatistik güncellenemedi")
 def api_user_created():
-    """Yeni kullanıcı oluşturulduğunda stats counter'ı güncelle"""
+    """Yeni kullanıcı oluşturulduğunda stats counter'ı ve admin arama indeksini güncelle"""
     from services.stats_counter import stats_counter
+    from services.user_search import user_search_index
+    data = request.get_json(silent=True) or {}
     stats_counter.on_user_created()
+    # email / ad istemciden alınmaz: users/{uid} sunucuda okunur
+    user_search_index.refresh_user(data.get("uid"))
     return jsonify({"success": True})
 
 
@@ -727,5 +908,7 @@ def api_user_login():
     name = data.get("display_name", email)
     if email:
         stats_counter.on_user_login(email, name)
+        from services.user_search import user_search_index
+        user_search_index.refresh_user(data.get("uid"))
     return jsonify({"success": True})
 
@@ -42,12 +42,10 @@ def _is_premium(uid):
 
 
 def _token_belongs(uid, token):
-    """Token sahipliği: users/{uid}.fcmTokens içinde mi?"""
+    """Token sahipliği: users/{uid}.fcmTokens içinde mi? (token_registry cache'i üzerinden)"""
     try:
-        doc = firebase_service.db.collection('users').document(uid).get()
-        if doc.exists:
-            tokens = doc.to_dict().get('fcmTokens', [])
-            return any(t.get('token') == token for t in tokens if isinstance(t, dict))
+        from services.token_registry import token_registry
+        return token_registry.owns(uid, token)
     except Exception as e:
         logger.warning(f"[Push] token ownership check failed: {e}")
     return False
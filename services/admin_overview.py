@@ -0,0 +1,219 @@
+"""
+ORBIS Admin Overview Aggregator
+- Dashboard verisi (sayaclar, GA4, AdMob, etkinlik akisi) istek aninda degil,
+  arka planda REFRESH_INTERVAL'da bir hazirlanan snapshot'tan servis edilir
+- Kaynaklar paralel calisir; her kaynagin kendi timeout'u vardir. Zaman asimi /
+  hata durumunda o kaynagin bir onceki snapshot'taki verisi kullanilir (stale)
+- Redis varsa snapshot worker'lar arasi paylasilir ve yenilemeyi tek worker yapar
+- Tarih araligina bagli olmayan kaynaklar (per_range=False: sayaclar, etkinlik
+  akisi) tek bir ortak snapshot'ta uretilir; range basina tekrar calismaz
+"""
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = int(os.getenv("ADMIN_OVERVIEW_INTERVAL", "60"))  # saniye
+DEFAULT_TIMEOUT = float(os.getenv("ADMIN_OVERVIEW_TIMEOUT", "8"))  # kaynak basina saniye
+RANGE_IDLE_TTL = 3600  # bu sure istenmeyen range'ler zamanlanmis yenilemeden cikar
+SNAPSHOT_KEY = "admin_overview:"
+LOCK_KEY = "admin_overview:lock:"
+SHARED_SCOPE = "_shared"  # range'den bagimsiz kaynaklarin snapshot anahtari
+
+
+class OverviewAggregator:
+    """Kaynak kaydi + zamanlanmis snapshot uretimi"""
+
+    def __init__(self, redis_client=None, use_redis: bool = True, interval: int = REFRESH_INTERVAL):
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self.interval = interval
+        self._sources: Dict[str, tuple] = {}
+        self._snapshots: Dict[str, dict] = {}
+        self._requested: Dict[str, float] = {}  # range -> son istenme zamani
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+
+    @property
+    def redis(self):
+        if not self._use_redis:
+            return None
+        if self._redis is None:
+            from services.redis_client import get_redis
+            self._redis = get_redis()
+        return self._redis
+
+    def register(self, name: str, fn: Callable[[str], Optional[dict]], timeout: float = DEFAULT_TIMEOUT,
+                 required: bool = False, per_range: bool = True):
+        """fn(date_range) -> dict. required kaynak hic veri uretemezse snapshot olusmaz.
+
+        per_range=False: kaynak araliga bagli degil; SHARED_SCOPE ile bir kez uretilir.
+        """
+        self._sources[name] = (fn, timeout, required, per_range)
+
+    def _scope_sources(self, scope: str) -> Dict[str, tuple]:
+        per_range = scope != SHARED_SCOPE
+        return {name: source for name, source in self._sources.items() if source[3] == per_range}
+
+    # ─── Snapshot uretimi ───────────────────────────────────────
+
+    def _ensure_runtime(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=max(2, len(self._sources) * 2),
+                                                thread_name_prefix="admin-overview")
+            threading.Thread(target=self._schedule, name="admin-overview-scheduler", daemon=True).start()
+
+    def build(self, date_range: str) -> Optional[dict]:
+        """Kapsamdaki (range veya SHARED_SCOPE) kaynaklari paralel calistir, snapshot'i kaydet"""
+        self._ensure_runtime()
+        scope_sources = self._scope_sources(date_range)
+        previous = self._load(date_range) or {}
+        prev_parts = previous.get("parts", {})
+        started = time.time()
+        futures = {name: self._executor.submit(fn, date_range) for name, (fn, *_) in scope_sources.items()}
+
+        parts, sources = {}, {}
+        for name, future in futures.items():
+            timeout = scope_sources[name][1]
+            remaining = max(0.0, started + timeout - time.time())
+            try:
+                value = future.result(timeout=remaining)
+                if not value and prev_parts.get(name):
+                    raise ValueError("bos sonuc")  # helper'lar hatada {} doner
+                parts[name] = value or {}
+                sources[name] = {"ok": True, "ms": int((time.time() - started) * 1000)}
+            except Exception as e:
+                error = "timeout" if isinstance(e, FutureTimeout) else str(e)[:100]
+                logger.warning(f"[AdminOverview] {name} kaynagi basarisiz ({error}), onceki veri kullaniliyor")
+                if name in prev_parts:
+                    parts[name] = prev_parts[name]
+                sources[name] = {"ok": False, "error": error, "stale": name in prev_parts}
+
+        for name, (_, _, required, _) in scope_sources.items():
+            if required and not parts.get(name):
+                return previous or None
+
+        snapshot = {
+            "parts": parts,
+            "sources": sources,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_ts": time.time(),
+            "build_ms": int((time.time() - started) * 1000),
+        }
+        self._store(date_range, snapshot)
+        return snapshot
+
+    def _store(self, date_range: str, snapshot: dict):
+        self._snapshots[date_range] = snapshot
+        if self.redis is not None:
+            try:
+                self.redis.set(SNAPSHOT_KEY + date_range, json.dumps(snapshot, default=str),
+                               ex=max(self.interval * 30, 600))
+            except Exception as e:
+                logger.warning(f"[AdminOverview] Redis yazma hatasi: {e}")
+
+    def _load(self, date_range: str) -> Optional[dict]:
+        local = self._snapshots.get(date_range)
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(SNAPSHOT_KEY + date_range)
+                if raw:
+                    shared = json.loads(raw)
+                    if not local or shared.get("generated_ts", 0) > local.get("generated_ts", 0):
+                        self._snapshots[date_range] = shared
+                        return shared
+            except Exception as e:
+                logger.warning(f"[AdminOverview] Redis okuma hatasi: {e}")
+        return local
+
+    def _claim(self, date_range: str) -> bool:
+        """Bu aralikta yenilemeyi bu worker mi yapacak (Redis yoksa her zaman evet)"""
+        if self.redis is None:
+            return True
+        try:
+            return bool(self.redis.set(LOCK_KEY + date_range, os.getpid(), nx=True,
+                                       ex=max(1, self.interval - 1)))
+        except Exception:
+            return True
+
+    def _refresh_async(self, date_range: str):
+        with self._lock:
+            if date_range in self._refreshing:
+                return
+            self._refreshing.add(date_range)
+
+        def run():
+            try:
+                if self._claim(date_range):
+                    self.build(date_range)
+            except Exception as e:
+                logger.error(f"[AdminOverview] Yenileme hatasi ({date_range}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(date_range)
+
+        threading.Thread(target=run, name=f"admin-overview-{date_range}", daemon=True).start()
+
+    def _schedule(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.time()
+            for date_range, last in list(self._requested.items()):
+                if now - last > RANGE_IDLE_TTL:
+                    self._requested.pop(date_range, None)
+                    continue
+                snapshot = self._load(date_range)
+                if not snapshot or now - snapshot.get("generated_ts", 0) >= self.interval:
+                    self._refresh_async(date_range)
+
+    # ─── Public API ─────────────────────────────────────────────
+
+    def _get_scope(self, scope: str) -> Optional[dict]:
+        self._requested[scope] = time.time()
+        snapshot = self._load(scope)
+        if snapshot is None:
+            return self.build(scope)
+        if time.time() - snapshot.get("generated_ts", 0) >= self.interval:
+            self._refresh_async(scope)
+        return snapshot
+
+    def get(self, date_range: str = "7d") -> Optional[dict]:
+        """Son snapshot'i hemen dondur; hic yoksa (soguk baslangic) bir kez senkron uret.
+
+        Ortak (range'den bagimsiz) ve range snapshot'lari birlestirilir;
+        generated_at ikisinden eski olaninkidir.
+        """
+        self._ensure_runtime()
+        scopes = [scope for scope in (SHARED_SCOPE, date_range) if self._scope_sources(scope)]
+        snapshots = []
+        for scope in scopes:
+            snapshot = self._get_scope(scope)
+            if snapshot is None:
+                return None
+            snapshots.append(snapshot)
+        if len(snapshots) <= 1:
+            return snapshots[0] if snapshots else None
+        oldest = min(snapshots, key=lambda snap: snap.get("generated_ts", 0))
+        return {
+            "parts": {k: v for snap in snapshots for k, v in snap["parts"].items()},
+            "sources": {k: v for snap in snapshots for k, v in snap["sources"].items()},
+            "generated_at": oldest.get("generated_at"),
+            "generated_ts": oldest.get("generated_ts"),
+            "build_ms": max(snap.get("build_ms", 0) for snap in snapshots),
+        }
+
+
+overview_aggregator = OverviewAggregator()
@@ -0,0 +1,330 @@
+"""
+ORBIS AI Job Queue
+- AI yorumlarini Flask istek thread'i disinda, arka planda uretir
+- Submit -> job_id doner; sonuc polling ile veya FCM push ile alinir
+- Sinirli async worker havuzu + provider bazli eszamanlilik limiti
+- Job kayitlari Redis'te (worker'lar arasi), Redis yoksa in-memory (gelistirme)
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Callable
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL = 3600  # saniye - tamamlanan job'lar 1 saat saklanir
+MAX_WORKERS = int(os.getenv("AI_JOB_WORKERS", "8"))
+MAX_PENDING = int(os.getenv("AI_JOB_MAX_PENDING", "200"))
+PROVIDER_CONCURRENCY = int(os.getenv("AI_PROVIDER_CONCURRENCY", "4"))
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+# ═══════════════════════════════════════════════════════════════
+# JOB STORE
+# ═══════════════════════════════════════════════════════════════
+
+class InMemoryJobStore:
+    """Gelistirme icin process-ici job deposu (tek worker'da tutarli)"""
+
+    def __init__(self, ttl: int = JOB_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float):
+        expired = [k for k, t in self._expires.items() if t <= now]
+        for k in expired:
+            self._jobs.pop(k, None)
+            self._expires.pop(k, None)
+
+    def save(self, job: dict):
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            self._jobs[job["id"]] = dict(job)
+            self._expires[job["id"]] = now + self.ttl
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            self._purge(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+
+class RedisJobStore:
+    """Redis job deposu - tum gunicorn worker'lari ayni job'u gorur.
+
+    Job bir hash olarak tutulur (alan basina JSON deger); update sadece
+    verilen alanlari HSET'ler, WATCH/MULTI ile suresi dolmus job'u yeniden
+    olusturmaz. Eszamanli status/result guncellemeleri birbirini ezmez.
+    """
+
+    KEY_PREFIX = "ai_job:"
+
+    def __init__(self, client, ttl: int = JOB_TTL):
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}"
+
+    @staticmethod
+    def _encode(fields: dict) -> dict:
+        return {k: json.dumps(v, default=str) for k, v in fields.items()}
+
+    def save(self, job: dict):
+        key = self._key(job["id"])
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=self._encode(job))
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raw = self.client.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        return {
+            (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+            for k, v in raw.items()
+        }
+
+    def update(self, job_id: str, **fields):
+        from redis.exceptions import WatchError
+
+        key = self._key(job_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    if not pipe.exists(key):
+                        pipe.unwatch()
+                        return
+                    pipe.multi()
+                    pipe.hset(key, mapping=self._encode(fields))
+                    pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+
+def _default_store():
+    from services.redis_client import get_redis
+    client = get_redis()
+    if client is not None:
+        return RedisJobStore(client)
+    logger.info("[AIJobs] Redis yok, in-memory job store kullaniliyor (sadece gelistirme)")
+    return InMemoryJobStore()
+
+
+# ═══════════════════════════════════════════════════════════════
+# PROVIDER LIMITER
+# ═══════════════════════════════════════════════════════════════
+
+class ProviderLimiter:
+    """Provider basina asyncio.Semaphore.
+
+    Limit provider kaydindaki `max_concurrency` alanindan (Firestore
+    config/ai_settings) okunur, yoksa AI_PROVIDER_CONCURRENCY kullanilir.
+    Semaphore'lar worker loop'una bagli oldugu icin sadece o loop icinde kullanilmali.
+    """
+
+    def __init__(self, default_limit: int = PROVIDER_CONCURRENCY):
+        self.default_limit = max(1, default_limit)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, provider: dict) -> asyncio.Semaphore:
+        name = provider.get("name", "unknown")
+        sem = self._semaphores.get(name)
+        if sem is None:
+            limit = int(provider.get("max_concurrency") or self.default_limit)
+            sem = asyncio.Semaphore(max(1, limit))
+            self._semaphores[name] = sem
+        return sem
+
+
+# ═══════════════════════════════════════════════════════════════
+# WORKER POOL
+# ═══════════════════════════════════════════════════════════════
+
+class AIJobQueue:
+    """Arka plan event loop'unda calisan sinirli AI job havuzu.
+
+    Loop ayri bir daemon thread'de ilk submit'te baslatilir. Gunicorn fork
+    sonrasi thread'ler kopyalanmadigi icin pid degisirse loop yeniden kurulur.
+    """
+
+    def __init__(self, store=None, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING):
+        self._store = store
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid = None
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[ProviderLimiter] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = _default_store()
+        return self._store
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._workers = asyncio.Semaphore(self.max_workers)
+                self._limiter = ProviderLimiter()
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name="ai-job-worker", daemon=True).start()
+            ready.wait()
+            self._loop = loop
+            self._pid = os.getpid()
+            self._pending = 0
+            return loop
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(
+        self,
+        astro_data: dict,
+        interpretation_type: str,
+        user_name: str,
+        extra_params: Optional[dict] = None,
+        push_token: Optional[str] = None,
+        on_success: Optional[Callable[[dict], None]] = None,
+        on_failure: Optional[Callable[[dict], None]] = None,
+    ) -> Optional[str]:
+        """Job'u kuyruga al ve job_id dondur. Kuyruk doluysa None doner.
+
+        on_success: basarili sonuc dict'i ile (worker thread'inde) cagrilir;
+        istatistik gibi yan etkiler icin.
+        on_failure: basarisiz sonuc dict'i ile cagrilir; submit aninda
+        ayrilan kullanim hakkinin iadesi icin.
+
+        Job kaydedilemez veya worker'a verilemezse (orn. Redis hatasi) ayrilan
+        kuyruk yeri geri birakilir ve hata yukari iletilir; bu durumda
+        callback'ler cagrilmaz, iadeyi cagiran yapar.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning(f"[AIJobs] Kuyruk dolu ({self._pending}/{self.max_pending})")
+                return None
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        saved = False
+        try:
+            self.store.save({
+                "id": job_id,
+                "status": STATUS_QUEUED,
+                "interpretation_type": interpretation_type,
+                "created_at": time.time(),
+            })
+            saved = True
+
+            loop = self._ensure_loop()
+            asyncio.run_coroutine_threadsafe(
+                self._run(job_id, astro_data, interpretation_type, user_name,
+                          extra_params or {}, push_token, on_success, on_failure),
+                loop,
+            )
+        except Exception as e:
+            logger.error(f"[AIJobs] Job kuyruga alinamadi ({job_id}): {e}", exc_info=True)
+            with self._lock:
+                self._pending = max(0, self._pending - 1)
+            if saved:
+                try:
+                    self.store.update(job_id, status=STATUS_FAILED, finished_at=time.time(),
+                                      result={"success": False, "error": "SUBMIT_FAILED"})
+                except Exception:
+                    pass
+            raise
+        logger.info(f"[AIJobs] Job kuyruga alindi: {job_id} ({interpretation_type})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    async def _run(self, job_id, astro_data, interpretation_type, user_name,
+                   extra_params, push_token, on_success, on_failure):
+        from services.ai_service import ai_service
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._workers:
+                self.store.update(job_id, status=STATUS_RUNNING, started_at=time.time())
+                result = await ai_service.get_ai_interpretation_async(
+                    astro_data, interpretation_type, user_name,
+                    limiter=self._limiter, **extra_params
+                )
+
+            status = STATUS_DONE if result.get("success") else STATUS_FAILED
+        except Exception as e:
+            logger.error(f"[AIJobs] Job hatasi ({job_id}): {e}", exc_info=True)
+            status = STATUS_FAILED
+            result = {"success": False, "error": str(e)[:200]}
+
+        try:
+            callback = on_success if status == STATUS_DONE else on_failure
+            if callback:
+                try:
+                    await loop.run_in_executor(None, callback, result)
+                except Exception as e:
+                    logger.error(f"[AIJobs] {status} callback hatasi ({job_id}): {e}")
+
+            self.store.update(job_id, status=status, result=result, finished_at=time.time())
+            logger.info(f"[AIJobs] Job tamamlandi: {job_id} -> {status}")
+        except Exception as e:
+            logger.error(f"[AIJobs] Job kaydi guncellenemedi ({job_id}): {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending = max(0, self._pending - 1)
+
+        if push_token:
+            await loop.run_in_executor(None, self._notify, push_token, job_id, status)
+
+    @staticmethod
+    def _notify(push_token: str, job_id: str, status: str):
+        """Job bitince cihaza FCM push gonder (data degerleri string olmali)"""
+        try:
+            from services.firebase_service import firebase_service
+            if status == STATUS_DONE:
+                title, body = "Yorumunuz hazır", "Kişisel analiziniz tamamlandı, görüntülemek için dokunun."
+            else:
+                title, body = "Yorum oluşturulamadı", "Lütfen daha sonra tekrar deneyin."
+            firebase_service.send_push(
+                push_token, title, body,
+                data={"type": "ai_job", "job_id": job_id, "status": status},
+            )
+        except Exception as e:
+            logger.error(f"[AIJobs] Push bildirimi gonderilemedi ({job_id}): {e}")
+
+
+ai_job_queue = AIJobQueue()
@@ -1,6 +1,6 @@
 """
 ORBIS AI Service
-- Firestore'dan provider ayarlarını okur (config/ai_settings)
+- Firestore'dan provider ayarlarını okur (config/ai_settings, paylaşılan cache ile)
 - Sıralı yedekleme: Aktif -> Y-1 -> Y-2 -> Y-3
 - Async HTTP çağrıları
 """
@@ -8,7 +8,7 @@ import os
 import json
 import logging
 import asyncio
-import re
+import contextlib
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -16,6 +16,7 @@ import aiohttp
 from openai import OpenAI
 
 from extensions import cache
+from services.ai_text import clean_ai_text
 from utils import Constants
 
 logger = logging.getLogger(__name__)
@@ -41,11 +42,13 @@ class AIService:
 - Her bolum en az 3-4 paragraf icersin, ornekler ve somut tavsiyeler ver.
 """
 
-    # Provider ayarlarını cache'le
-    _providers_cache = None
-    _fallback_order = []
-    _last_fetch = 0
-    CACHE_TTL = 60  # saniye
+    # Push bildirimi icin kisa format (toplu gunluk kampanyalar)
+    PUSH_RULES = """
+## KESİN KURALLAR
+- Gezegen, burç, ev ve açı isimlerini KULLANMA; teknik terim yok.
+- Sade, samimi Türkçe; emoji yok.
+- En fazla 2 cümle ve 160 karakter. Başlık, madde işareti veya tırnak yok.
+"""
 
     def __init__(self):
         self.sync_client = None
@@ -58,26 +61,13 @@ class AIService:
             )
 
     def _get_providers_from_firestore(self) -> dict:
-        """Firestore'dan AI ayarlarını getir (cache'li)"""
-        now = datetime.now().timestamp()
-        if self._providers_cache and (now - self._last_fetch) < self.CACHE_TTL:
-            return self._providers_cache
+        """Firestore config/ai_settings ayarlarını getir.
 
-        try:
-            from services.firebase_service import firebase_service
-            db = firebase_service.db
-            if db:
-                doc = db.collection('config').document('ai_settings').get()
-                if doc.exists:
-                    data = doc.to_dict()
-                    self._providers_cache = data
-                    self._last_fetch = now
-                    logger.info(f"[AI] Ayarlar Firestore'dan yüklendi. Provider: {len(data.get('providers', []))} adet")
-                    return data
-        except Exception as e:
-            logger.error(f"[AI] Firestore okuma hatası (önemsiz, env fallback): {e}")
-
-        return {}
+        Paylaşılan config cache üzerinden okunur (bkz. services.config_cache);
+        admin güncellemesi cache'i geçersiz kılar, sıcak yolda Firestore okuması yok.
+        """
+        from services.config_cache import config_cache
+        return config_cache.get("ai_settings")
 
     def _get_provider_by_name(self, name: str, providers: list) -> Optional[dict]:
         """Provider adına göre provider bilgisini bul"""
@@ -141,17 +131,8 @@ class AIService:
 
     @staticmethod
     def remove_emojis(text: str) -> str:
-        emoji_pattern = re.compile(
-            "[\U0001f600-\U0001f64f\U0001f300-\U0001f5ff\U0001f680-\U0001f6ff\U0001f700-\U0001f77f"
-            "\U0001f780-\U0001f7ff\U0001f800-\U0001f8ff\U0001f900-\U0001f9ff\U0001fa00-\U0001fa6f"
-            "\U0001fa70-\U0001faff\U00002702-\U000027b0\U000024c2-\U0001f251\U0001f1e0-\U0001f1ff"
-            "\U00002600-\U000026ff\U00002700-\U000027bf\U0000fe00-\U0000fe0f\U0001f000-\U0001f02f"
-            "\U0001f0a0-\U0001f0ff]+",
-            flags=re.UNICODE,
-        )
-        cleaned = emoji_pattern.sub("", text)
-        cleaned = re.sub(r" +", " ", cleaned)
-        return "\n".join(line.strip() for line in cleaned.split("\n")).strip()
+        """Emoji temizle + boşluk normalize et (bkz. services.ai_text)"""
+        return clean_ai_text(text)
 
     async def call_provider(self, session: aiohttp.ClientSession, provider: dict, prompt: str) -> dict:
         """Tek bir provider'a API çağrısı yap"""
@@ -199,9 +180,15 @@ class AIService:
             logger.warning(f"[AI] ❌ {name} exception: {str(e)[:100]}")
             return {"success": False, "error": f"{name}: {str(e)[:100]}", "provider": name}
 
-    async def get_ai_interpretation_async(self, astro_data: dict, interpretation_type: str, user_name: str, **kwargs) -> dict:
-        """Sıralı yedekleme ile AI yorumu al"""
-        prompt = f"User: {user_name}\nType: {interpretation_type}\nData: {json.dumps(astro_data, default=str)}\n{self.BASE_RULES}"
+    async def get_ai_interpretation_async(self, astro_data: dict, interpretation_type: str, user_name: str,
+                                          limiter=None, rules: Optional[str] = None, **kwargs) -> dict:
+        """Sıralı yedekleme ile AI yorumu al
+
+        limiter: opsiyonel provider bazlı eşzamanlılık sınırlayıcı
+        (bkz. services.ai_jobs.ProviderLimiter). Verilmezse sınırsız.
+        rules: BASE_RULES yerine kullanılacak kurallar (örn. PUSH_RULES)
+        """
+        prompt = f"User: {user_name}\nType: {interpretation_type}\nData: {json.dumps(astro_data, default=str)}\n{rules or self.BASE_RULES}"
         extra = {k: v for k, v in kwargs.items() if v}
         if extra:
             prompt += f"\nExtra: {json.dumps(extra, default=str)}"
@@ -216,7 +203,9 @@ class AIService:
             for i, provider in enumerate(fallback_chain):
                 tag = "AKTİF" if i == 0 else f"YEDEK-{i}"
                 logger.info(f"[AI] Deneniyor: {tag} -> {provider['name']}")
-                result = await self.call_provider(session, provider, prompt)
+                slot = limiter.slot(provider) if limiter else contextlib.nullcontext()
+                async with slot:
+                    result = await self.call_provider(session, provider, prompt)
                 if result["success"]:
                     return result
                 errors.append(result.get("error", "Bilinmeyen hata"))
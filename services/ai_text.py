@@ -0,0 +1,131 @@
+"""
+ORBIS AI Text Pipeline
+- AI yanitlarindan emoji temizleme + bosluk normalizasyonu
+- Emoji regex'i modul yuklenirken bir kez derlenir; ortusen araliklar birlestirildi
+- Bosluk normalizasyonu C seviyesindeki str metodlariyla (regex callback yok)
+- StreamingTextCleaner: chunk chunk gelen (stream) yanitlar icin ayni sonucu uretir
+
+`python -m services.ai_text` eski AIService.remove_emojis ile karsilastirmali benchmark calistirir.
+"""
+import re
+
+# Eski AIService.remove_emojis araliklarinin birlesimi (ayni karakter kumesi):
+#   24C2-1F251 zaten 2600-27BF, 2702-27B0, FE00-FE0F, 1F000-1F02F, 1F0A0-1F0FF, 1F1E0-1F1FF'i kapsar
+#   1F300-1F5FF + 1F600-1F64F ve 1F680-1F6FF ... 1FA70-1FAFF ardisiktir
+_EMOJI_CLASS = "[\U000024c2-\U0001f251\U0001f300-\U0001f64f\U0001f680-\U0001faff]"
+# `X+` yerine `XX*`: sre ancak bu formda charset prefix taramasini kullanir (~2x hizli)
+EMOJI_RE = re.compile(_EMOJI_CLASS + _EMOJI_CLASS + "*")
+
+
+def _collapse_spaces(text: str) -> str:
+    """Ardisik bosluklari teke indir (re.sub(r" +", " ") ile ayni, ~8x hizli)"""
+    while "  " in text:
+        text = text.replace("  ", " ")
+    return text
+
+
+def _strip_lines(text: str) -> str:
+    return "\n".join([line.strip() for line in text.split("\n")])
+
+
+def normalize_whitespace(text: str) -> str:
+    """Ardisik bosluklari teke indir, satir basi/sonu bosluklarini at, metni strip et."""
+    return _strip_lines(_collapse_spaces(text)).strip()
+
+
+def clean_ai_text(text: str) -> str:
+    """AI yanitini temizle: emoji kaldir + bosluk normalizasyonu"""
+    if not text:
+        return ""
+    return normalize_whitespace(EMOJI_RE.sub("", text))
+
+
+class StreamingTextCleaner:
+    """clean_ai_text'in chunk bazli versiyonu.
+
+    feed() ciktilarinin birlesimi + flush(), tum metne clean_ai_text
+    uygulanmis haliyle aynidir. Chunk sonundaki bosluklar bir sonraki
+    bosluk olmayan karakter gelene kadar bekletilir; boylece chunk
+    sinirina denk gelen bosluk dizileri de dogru normalize edilir.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        buf = self._pending + EMOJI_RE.sub("", chunk)
+        body = buf.rstrip()
+        if not body:
+            self._pending = buf
+            return ""
+        self._pending = buf[len(body):]
+
+        if not self._started:
+            self._started = True
+            return _strip_lines(_collapse_spaces(body.lstrip()))
+
+        # body, daha once yazilan bosluk olmayan karakterden sonra gelen
+        # tam bir bosluk dizisiyle baslar: satir icindeyse teke indir,
+        # satir sonu iceriyorsa sadece satir sonlari kalir
+        rest = body.lstrip()
+        lead = body[:len(body) - len(rest)]
+        newlines = lead.count("\n")
+        lead = "\n" * newlines if newlines else _collapse_spaces(lead)
+        return lead + _strip_lines(_collapse_spaces(rest))
+
+    def flush(self) -> str:
+        """Akis bitti: bekleyen sondaki bosluklar atilir (strip)"""
+        self._pending = ""
+        return ""
+
+
+if __name__ == "__main__":
+    # Benchmark: eski remove_emojis uygulamasina karsi
+    import timeit
+
+    def legacy_remove_emojis(text: str) -> str:
+        emoji_pattern = re.compile(
+            "[\U0001f600-\U0001f64f\U0001f300-\U0001f5ff\U0001f680-\U0001f6ff\U0001f700-\U0001f77f"
+            "\U0001f780-\U0001f7ff\U0001f800-\U0001f8ff\U0001f900-\U0001f9ff\U0001fa00-\U0001fa6f"
+            "\U0001fa70-\U0001faff\U00002702-\U000027b0\U000024c2-\U0001f251\U0001f1e0-\U0001f1ff"
+            "\U00002600-\U000026ff\U00002700-\U000027bf\U0000fe00-\U0000fe0f\U0001f000-\U0001f02f"
+            "\U0001f0a0-\U0001f0ff]+",
+            flags=re.UNICODE,
+        )
+        cleaned = emoji_pattern.sub("", text)
+        cleaned = re.sub(r" +", " ", cleaned)
+        return "\n".join(line.strip() for line in cleaned.split("\n")).strip()
+
+    paragraph = (
+        "## Kariyer ✨\n"
+        "Ayşe,  bu dönem iş hayatında   yeni kapılar açılıyor 🚀. Uzun süredir "
+        "beklediğin fırsatlar   netleşiyor; ekip içinde sorumluluk almaktan çekinme.  \n"
+        "  - Somut öneri: haftalık hedeflerini yaz ve takip et 📌\n"
+        "  - İletişimde sabırlı ol, acele kararlardan kaçın.\n\n"
+    )
+    sample = paragraph * 60  # ~1500+ kelimelik tipik bir yanit
+    chunks = [sample[i:i + 40] for i in range(0, len(sample), 40)]
+
+    assert clean_ai_text(sample) == legacy_remove_emojis(sample)
+    streamer = StreamingTextCleaner()
+    streamed = "".join(streamer.feed(c) for c in chunks) + streamer.flush()
+    assert streamed == legacy_remove_emojis(sample)
+
+    n = 200
+    legacy = timeit.timeit(lambda: legacy_remove_emojis(sample), number=n) / n
+    new = timeit.timeit(lambda: clean_ai_text(sample), number=n) / n
+
+    def stream_all():
+        s = StreamingTextCleaner()
+        for c in chunks:
+            s.feed(c)
+        s.flush()
+
+    stream = timeit.timeit(stream_all, number=n) / n
+    print(f"Ornek: {len(sample.split())} kelime, {len(chunks)} chunk")
+    print(f"legacy remove_emojis : {legacy * 1e6:8.1f} us")
+    print(f"clean_ai_text        : {new * 1e6:8.1f} us ({legacy / new:.1f}x)")
+    print(f"StreamingTextCleaner : {stream * 1e6:8.1f} us (tum chunk'lar)")
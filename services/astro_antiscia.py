@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Antiscia / contra-antiscia motoru.
+
+Antiscion, boylamın Yengeç-Oğlak eksenine göre yansımasıdır (180 - d);
+contra-antiscion ise Koç-Terazi eksenine göre yansımadır (360 - d). Tüm
+pozisyonlar bir kez yansıtılır, hedef boylamlar ±360 kopyalarıyla sıralı bir
+halkaya dizilir ve her yansıma noktası için orb penceresi ikili arama ile
+bulunur: n kaynak, m hedef için O((n + m) log m). Eski çift döngü her kaynak
+için tüm hedefleri tarıyordu (O(n·m)).
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, NamedTuple, Sequence
+
+DEFAULT_ORB = 1.0
+ANTISCIA = "antiscia"
+CONTRA_ANTISCIA = "contra_antiscia"
+REFLECTIONS = (ANTISCIA, CONTRA_ANTISCIA)
+
+# Pencere sınırlarında kayan nokta yuvarlamasını tolere etmek için pay;
+# kesin karar eski formülle (kısa yay <= orb) verilir.
+_EPSILON = 1e-9
+
+
+class Contact(NamedTuple):
+    source: int  # yansıtılan noktanın indeksi
+    target: int  # yansımaya orb içinde düşen noktanın indeksi
+    kind: str  # ANTISCIA / CONTRA_ANTISCIA
+    reflection: float  # yansıma noktası (0-360)
+    orb: float
+
+
+def antiscion(degree: float) -> float:
+    """Yengeç-Oğlak eksenine göre yansıma (0-360)."""
+    return (180 - degree) % 360
+
+
+def contra_antiscion(degree: float) -> float:
+    """Koç-Terazi eksenine göre yansıma (0-360)."""
+    return (360 - degree) % 360
+
+
+_REFLECT = {ANTISCIA: antiscion, CONTRA_ANTISCIA: contra_antiscion}
+
+
+def reflect(degree: float, kind: str) -> float:
+    return _REFLECT[kind](degree % 360)
+
+
+def _arc(a: float, b: float) -> float:
+    diff = abs(a - b)
+    return min(diff, 360 - diff)
+
+
+class _Ring:
+    """Hedef boylamların ±360 kopyalı sıralı dizisi"""
+
+    def __init__(self, degrees: Sequence[float]):
+        ring = sorted(
+            (deg % 360 + shift, index)
+            for index, deg in enumerate(degrees)
+            for shift in (-360.0, 0.0, 360.0)
+        )
+        self.degrees = [deg for deg, _ in ring]
+        self.indexes = [index for _, index in ring]
+        self.targets = [deg % 360 for deg in degrees]
+
+    def near(self, degree: float, orb: float):
+        """degree'ye orb içindeki hedefler: (indeks, kısa yay) çiftleri"""
+        lo = bisect_left(self.degrees, degree - orb - _EPSILON)
+        hi = bisect_right(self.degrees, degree + orb + _EPSILON)
+        seen = set()
+        for index in self.indexes[lo:hi]:
+            if index in seen:
+                continue
+            seen.add(index)
+            value = _arc(self.targets[index], degree)
+            if value <= orb:
+                yield index, value
+
+
+def find_contacts(sources: Sequence[float], targets: Sequence[float] = None,
+                  orb: float = DEFAULT_ORB, kinds: Sequence[str] = REFLECTIONS) -> List[Contact]:
+    """Kaynak noktaların yansımalarına orb içinde düşen hedefleri bul.
+
+    targets verilmezse kaynak kümesi kendisiyle karşılaştırılır ve bir nokta
+    kendi yansımasıyla eşleştirilmez. Sonuç (kaynak, tür, orb, hedef) sırasındadır.
+    """
+    same_set = targets is None
+    ring = _Ring(sources if same_set else targets)
+    contacts = []
+    for source, degree in enumerate(sources):
+        for kind in kinds:
+            point = reflect(degree, kind)
+            hits = [
+                Contact(source, target, kind, point, value)
+                for target, value in ring.near(point, orb)
+                if not (same_set and target == source)
+            ]
+            hits.sort(key=lambda c: (round(c.orb, 2), c.target))
+            contacts.extend(hits)
+    return contacts
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Açı (aspect) motoru.
+
+Açı tanımları ve orb'lar modül yüklenirken bir kez hazırlanır. İkinci set
+derecesine göre sıralanır; birinci setteki her nokta için her açının hedef
+boylamları (derece ± açı) etrafındaki orb penceresi ikili arama ile bulunur.
+Böylece her çift için her açı tipi denenmez, sadece orb penceresine düşen
+adaylar kontrol edilir (O(n·a·log m + eşleşme)).
+
+Orb değeri ve "en küçük orb kazanır" seçimi eski iç içe döngüyle birebir
+aynıdır; varsayılan açı setinde sonuçlar değişmez. Minör açılar ve gezegen
+başına orb (moiety) ek maliyet getirmez: sadece pencere sayısı/genişliği değişir.
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# (açı adı, ideal derece) - sıra, eşit orb'da hangi açının seçileceğini belirler
+ASPECT_ANGLES = (
+    ("Conjunction", 0.0),
+    ("Semi-sextile", 30.0),
+    ("Sextile", 60.0),
+    ("Quintile", 72.0),
+    ("Square", 90.0),
+    ("Trine", 120.0),
+    ("Biquintile", 144.0),
+    ("Quincunx", 150.0),
+    ("Opposition", 180.0),
+)
+
+DEFAULT_ORBS = {
+    "Conjunction": 8.0,
+    "Opposition": 8.0,
+    "Trine": 8.0,
+    "Square": 8.0,
+    "Sextile": 6.0,
+}
+
+MINOR_ORBS = {
+    "Semi-sextile": 2.0,
+    "Quintile": 2.0,
+    "Biquintile": 2.0,
+    "Quincunx": 3.0,
+}
+
+_EPSILON = 1e-9  # pencere sınırında kayan nokta farkı yüzünden aday kaçmasın
+
+
+def _orb_value(name: str, ideal: float, deg1: float, deg2: float, aspect_diff: float) -> float:
+    """Eski calculate_aspects ile aynı orb formülü (kavuşum/karşıt özel durumlu)."""
+    if name == "Conjunction":
+        return min(abs(deg1 - deg2), 360 - abs(deg1 - deg2))
+    if name == "Opposition":
+        return min(abs(deg1 - deg2 - 180) % 360, abs(deg1 - deg2 + 180) % 360)
+    return abs(aspect_diff - ideal)
+
+
+class AspectEngine:
+    """Sabit açı/orb setiyle sıralı tarama."""
+
+    def __init__(self, orbs: Dict[str, float], planet_orbs: Optional[Dict[str, float]] = None):
+        # Orb'u 0 veya tanımsız açılar kontrol edilmez
+        self.aspects = tuple(
+            (name, ideal, float(orbs[name]))
+            for name, ideal in ASPECT_ANGLES
+            if (orbs.get(name) or 0) > 0
+        )
+        self.planet_orbs = dict(planet_orbs or {})
+
+    def _limit(self, aspect_orb: float, p1: str, p2: str) -> float:
+        """Gezegen başına orb verilmişse iki gezegenin ortalaması (moiety), açı orb'unu aşmaz."""
+        if not self.planet_orbs:
+            return aspect_orb
+        own1 = self.planet_orbs.get(p1, aspect_orb)
+        own2 = self.planet_orbs.get(p2, aspect_orb)
+        return min(aspect_orb, (own1 + own2) / 2.0)
+
+    def find(self, positions1: Dict[str, float], positions2: Optional[Dict[str, float]] = None) -> List[dict]:
+        """{nokta: derece} setleri arasındaki açılar; positions2 None ise set kendi içinde.
+
+        Kendi içinde kıyasta her çift bir kez (anahtar sırası p1 < p2) değerlendirilir.
+        Sonuç orb'a göre sıralıdır; eşit orb'larda girdi sırası korunur.
+        """
+        same_set = positions2 is None
+        keys1 = list(positions1)
+        keys2 = keys1 if same_set else list(positions2)
+        degs1 = [positions1[k] % 360 for k in keys1]
+        degs2 = degs1 if same_set else [positions2[k] % 360 for k in keys2]
+
+        # Sıralı ikinci set + sarma için ±360 kopyaları
+        order = sorted(range(len(keys2)), key=lambda j: degs2[j])
+        ring = [(degs2[j] - 360, j) for j in order] + [(degs2[j], j) for j in order] + \
+            [(degs2[j] + 360, j) for j in order]
+        ring_degs = [deg for deg, _ in ring]
+
+        best: Dict[Tuple[int, int], Tuple[float, str, float]] = {}
+        for i, (p1, deg1) in enumerate(zip(keys1, degs1)):
+            for name, ideal, aspect_orb in self.aspects:
+                targets = {deg1 + ideal, deg1 - ideal}
+                for target in targets:
+                    lo = bisect_left(ring_degs, target - aspect_orb - _EPSILON)
+                    hi = bisect_right(ring_degs, target + aspect_orb + _EPSILON)
+                    for _, j in ring[lo:hi]:
+                        p2 = keys2[j]
+                        if same_set and p1 >= p2:
+                            continue
+                        deg2 = degs2[j]
+                        diff = abs(deg1 - deg2)
+                        aspect_diff = min(diff, 360 - diff)
+                        orb_value = _orb_value(name, ideal, deg1, deg2, aspect_diff)
+                        if orb_value > self._limit(aspect_orb, p1, p2):
+                            continue
+                        current = best.get((i, j))
+                        # Birden fazla açı orb içindeyse en küçük orb; eşitlikte açı sırası
+                        if current is None or orb_value < current[0]:
+                            best[(i, j)] = (orb_value, name, aspect_diff)
+
+        aspects_list = [
+            {
+                "planet1": keys1[i],
+                "planet2": keys2[j],
+                "aspect_type": name,
+                "orb": round(orb_value, 2),
+                "exact_difference_0_180": round(aspect_diff, 2),
+            }
+            for (i, j), (orb_value, name, aspect_diff) in sorted(best.items())
+        ]
+        aspects_list.sort(key=lambda x: x["orb"])
+        return aspects_list
+
+
+@lru_cache(maxsize=32)
+def _cached_engine(orbs: Tuple[Tuple[str, float], ...], planet_orbs: Tuple[Tuple[str, float], ...]) -> AspectEngine:
+    return AspectEngine(dict(orbs), dict(planet_orbs))
+
+
+def get_engine(orbs: Optional[Dict[str, float]] = None, include_minor: bool = False,
+               planet_orbs: Optional[Dict[str, float]] = None) -> AspectEngine:
+    """Orb setine göre önceden hazırlanmış motor (aynı set için tekrar kurulmaz)."""
+    if orbs is None:
+        orbs = {**DEFAULT_ORBS, **MINOR_ORBS} if include_minor else DEFAULT_ORBS
+    return _cached_engine(tuple(sorted(orbs.items())), tuple(sorted((planet_orbs or {}).items())))
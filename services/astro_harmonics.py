@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Harmonik harita motoru.
+
+Bir harita için (harmonik × nokta) boylam matrisi kurulur: her satır
+(boylam · N) mod 360, burç indeksi ise tamsayı bölmesiyle (boylam // 30)
+bulunur. Satırlar harita başına bir kez ve ilk erişimde hesaplanır (varga
+kuralıyla raporlanan bölümler için hiç kurulmaz); nokta başına {degree, sign, degree_in_sign} sözlükleri ilk erişimde üretilir ve
+önbellekte tutulur. Derin analiz (analysis(None)) raporlanan setin tamamını
+üretir; bu çıktı natal önbelleğe yazılır ve harmonik yorumuna gider.
+
+Parashari kuralı tanımlı bölümler (D2, D3, D9, ...) derin analizde
+services.astro_vargas tablolarından, diğerleri batı harmoniği olarak üretilir.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from services import zodiac
+from services.astro_vargas import VARGA_TABLES, varga_chart
+
+# Harmonik sayı -> (ad, açıklama); derin harmonik analizde raporlanan set
+HARMONICS: Dict[int, Dict[str, str]] = {
+    1: {"name": "Rāśi (D1)", "details": "Ana harita, hayatın tamamı"},
+    2: {"name": "Hora (D2)", "details": "Para kazanma şekli, finans akışı"},
+    3: {"name": "Drekkana (D3)", "details": "Cesaret, kardeşler, mücadele gücü"},
+    4: {"name": "Chaturthamsa (D4)", "details": "Mülk, ev, yerleşim, taşınma"},
+    7: {"name": "Saptamsa (D7)", "details": "Çocuklar, yaratıcılık, torunlar"},
+    9: {
+        "name": "Navamsa (D9)",
+        "details": "Evlilik, partner, dharma, ruhsal yolculuk, En kritik varga",
+    },
+    10: {"name": "Dasamsa (D10)", "details": "Kariyer, meslek, toplumsal statü"},
+    12: {"name": "Dvadasamsa (D12)", "details": "Ebeveynler, geçmiş yaşamlar"},
+    13: {
+        "name": "Trayodashamsa (D13)",
+        "details": "arzuların, tutkuların, bastırılmış dürtülerin ve irade gücünün analiz edildiği bölünmüş haritadır",
+    },
+    16: {
+        "name": "Shodasamsa (D16)",
+        "details": "Taşıtlar, gayrimenkul, genel mutluluk/üzüntü, konfor",
+    },
+    17: {
+        "name": "Saptadashamsa (D17)",
+        "details": "güç, statü, onur, toplumsal saygınlık ve “yüksek konumda durabilme” sorusuna cevap verir.",
+    },
+    19: {
+        "name": "Navatara (D19)",
+        "details": "Ruhsal bilinç + ilahi planla senkronizasyon tanrısal düzen bu kişiyi ne kadar kolluyor?” sorusuna cevap verir.",
+    },
+    20: {"name": "Vimsamsa (D20)", "details": "Ruhsal gelişim, ibadet, inanç"},
+    23: {
+        "name": "Vimsamsa / Trimsamsa-23 (D23)",
+        "details": "Bilgiyi alma, işleme ve aktarma haritası",
+    },
+    24: {"name": "Chaturvimsamsa (D24)", "details": "Eğitim, bilgi, öğrenme"},
+    27: {
+        "name": "Nakshatramsa (D27) / Bhamsa",
+        "details": "Güç, zayıflık, fiziksel dayanıklılık",
+    },
+    30: {
+        "name": "Trimsamsa (D30)",
+        "details": "Zorluklar, talihsizlikler, hastalıklar, Kişinin başına “neden kötü şeyler geliyor?” sorusunun cevabı",
+    },
+    40: {"name": "Khavedamsa (D40)", "details": "Anne soyundan karma"},
+    45: {"name": "Akshavedamsa (D45)", "details": "Baba soyundan karma"},
+    60: {"name": "Shashtiamsa (D60)", "details": "Saf karma, önceki yaşam"},
+}
+
+
+class HarmonicMatrix:
+    """Bir haritanın tüm harmonik boylamları; dict çıktısı talep üzerine üretilir"""
+
+    def __init__(self, positions: dict, harmonics: Iterable[int] = HARMONICS):
+        self.positions = positions
+        self.names: List[str] = []
+        self.degrees: List[float] = []
+        for name, data in positions.items():
+            if isinstance(data, dict) and "degree" in data:
+                self.names.append(name)
+                self.degrees.append(data["degree"])
+
+        self.harmonics = tuple(harmonics)
+        for harmonic in self.harmonics:
+            if not isinstance(harmonic, int) or harmonic <= 0:
+                raise ValueError("Harmonik sayı pozitif bir tam sayı olmalıdır.")
+
+        # rows[N][j] = (boylam_j · N) mod 360; varga kuralıyla raporlanan
+        # bölümler satıra ihtiyaç duymaz, bu yüzden satırlar ilk erişimde kurulur
+        self.rows: Dict[int, List[float]] = {}
+        self._charts: Dict[int, Dict[str, dict]] = {}
+        self._vargas: Dict[int, Dict[str, dict]] = {}
+
+    def row(self, harmonic: int) -> List[float]:
+        """Harmonik satırı: noktaların (boylam · N) mod 360 değerleri (önbellekli)"""
+        row = self.rows.get(harmonic)
+        if row is None:
+            row = self.rows[harmonic] = [(deg * harmonic) % 360 for deg in self.degrees]
+        return row
+
+    def signs(self, harmonic: int) -> List[int]:
+        """Harmonik satırının burç indeksleri (0-11)"""
+        return [int(deg // 30) % 12 for deg in self.row(harmonic)]
+
+    def chart(self, harmonic: int) -> Dict[str, dict]:
+        """Tek harmonik için {isim: {degree, sign, degree_in_sign}} (önbellekli)"""
+        chart = self._charts.get(harmonic)
+        if chart is None:
+            sign_names = zodiac.SIGN_NAMES[zodiac.DEFAULT_LANG]
+            chart = {
+                name: {
+                    "degree": round(deg, 2),
+                    "sign": sign_names[sign],
+                    "degree_in_sign": round(deg % 30, 2),
+                }
+                for name, deg, sign in zip(self.names, self.row(harmonic), self.signs(harmonic))
+            }
+            self._charts[harmonic] = chart
+        return chart
+
+    def varga(self, division: int) -> Dict[str, dict]:
+        """Parashari varga haritası (önbellekli)"""
+        chart = self._vargas.get(division)
+        if chart is None:
+            chart = self._vargas[division] = varga_chart(self.positions, division)
+        return chart
+
+    def analysis(self, harmonics: Optional[Sequence[int]] = None, vargas: bool = True) -> Dict[str, dict]:
+        """Derin harmonik analiz çıktısı; harmonics verilirse sadece onlar üretilir.
+
+        vargas=True iken Parashari tablosu olan bölümler varga kuralıyla hesaplanır.
+        """
+        selected = self.harmonics if harmonics is None else [h for h in self.harmonics if h in harmonics]
+        analysis = {}
+        for harmonic in selected:
+            parashari = vargas and harmonic in VARGA_TABLES
+            analysis[f"H{harmonic}"] = {
+                "name": HARMONICS.get(harmonic, {}).get("name", f"H{harmonic}"),
+                "details": HARMONICS.get(harmonic, {}).get("details", ""),
+                "method": "parashari" if parashari else "harmonic",
+                "planet_positions": self.varga(harmonic) if parashari else self.chart(harmonic),
+            }
+        return analysis
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Midpoint (orta nokta) motoru.
+
+Tüm nokta çiftlerinin midpointleri bir kez hesaplanır ve seçilen kadrana
+(dial) katlanır: 90° (4. harmonik), 45° (8. harmonik, Uranian/Ebertin
+varsayılanı) veya 22.5° (16. harmonik). Kadranda orb içinde kalan her
+(midpoint, nokta) eşleşmesi, midpoint ile noktanın arasındaki açının
+kadranın bir katına yakın olduğu anlamına gelir.
+
+Eşleşmeler sıralama + iki işaretçili tarama ile bulunur: n nokta için
+n(n-1)/2 midpoint sıralanır (O(n² log n)), her midpoint için sadece orb
+penceresindeki noktalar gezilir. Eski çift döngü her çift için tüm
+noktaları tarıyordu (O(n³)).
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+DEFAULT_DIAL = 45.0
+DEFAULT_ORB = 2.0
+SUPPORTED_DIALS = (90.0, 45.0, 22.5)
+
+# Midpoint ile nokta arasındaki açı (0-180 aralığına katlanmış) -> açı adı
+MIDPOINT_ASPECT_NAMES = {
+    0.0: "Conjunction/Opposition",
+    180.0: "Conjunction/Opposition",
+    90.0: "Square",
+    45.0: "Semisquare",
+    135.0: "Sesquiquadrate",
+    22.5: "Semioctile",
+    67.5: "Trioctile",
+    112.5: "Quintoctile",
+    157.5: "Septoctile",
+}
+
+MIDPOINT_ASPECT_WEIGHTS = {
+    "Conjunction/Opposition": 5,
+    "Square": 4,
+    "Sesquiquadrate": 3,
+    "Semisquare": 2,
+}
+
+
+class MidpointHit(NamedTuple):
+    first: int  # çiftin ilk noktasının indeksi
+    second: int  # çiftin ikinci noktasının indeksi
+    point: int  # midpointe açı yapan noktanın indeksi
+    midpoint: float  # 0-360
+    orb: float
+    aspect_type: str
+
+
+def midpoint(deg1: float, deg2: float) -> float:
+    """İki boylamın kısa yay üzerindeki orta noktası (0-360)."""
+    deg1 %= 360
+    deg2 %= 360
+    mid = (deg1 + deg2) / 2.0
+    if abs(deg1 - deg2) > 180:
+        mid += 180.0
+    return mid % 360
+
+
+def aspect_name(angle: float) -> str:
+    """Kadranın katı olan açıyı (0-360) 0-180 aralığına katlayıp adlandırır."""
+    angle %= 360
+    folded = round(min(angle, 360 - angle), 4)
+    return MIDPOINT_ASPECT_NAMES.get(folded, f"{folded:g}°")
+
+
+class MidpointEngine:
+    """Sıralı kadran üzerinde midpoint açı taraması."""
+
+    def __init__(self, dial: float = DEFAULT_DIAL, orb: float = DEFAULT_ORB):
+        if dial not in SUPPORTED_DIALS:
+            raise ValueError(f"Desteklenmeyen kadran: {dial} (desteklenen: {SUPPORTED_DIALS})")
+        if not 0 <= orb < dial / 2:
+            raise ValueError(f"Orb 0 ile {dial / 2} arasında olmalı: {orb}")
+        self.dial = dial
+        self.orb = orb
+
+    def midpoints(self, degrees: Sequence[float]) -> List[Tuple[int, int, float]]:
+        """Tüm çiftlerin midpointleri: (i, j, derece), i < j."""
+        n = len(degrees)
+        return [
+            (i, j, midpoint(degrees[i], degrees[j]))
+            for i in range(n)
+            for j in range(i + 1, n)
+        ]
+
+    def find(self, degrees: Sequence[float]) -> List[MidpointHit]:
+        """Orb içindeki tüm (midpoint, nokta) eşleşmeleri; çiftin kendi noktaları hariç."""
+        dial, orb = self.dial, self.orb
+        n = len(degrees)
+        if n < 3:
+            return []
+
+        # Noktaları kadrana katla ve sırala; sarma için -dial ve +dial kopyaları ekle
+        folded = sorted((deg % 360 % dial, k) for k, deg in enumerate(degrees))
+        ring = (
+            [(pos - dial, k) for pos, k in folded]
+            + folded
+            + [(pos + dial, k) for pos, k in folded]
+        )
+
+        mids = sorted(
+            ((mid % dial, i, j, mid) for i, j, mid in self.midpoints(degrees)),
+        )
+
+        hits: List[MidpointHit] = []
+        lo = 0
+        for pos, i, j, mid in mids:
+            while ring[lo][0] < pos - orb:
+                lo += 1
+            hi = lo
+            while hi < len(ring) and ring[hi][0] <= pos + orb:
+                k = ring[hi][1]
+                hi += 1
+                if k == i or k == j:
+                    continue
+                diff = (mid - degrees[k] % 360) % 360
+                multiple = round(diff / dial) * dial
+                distance = abs(diff - multiple)
+                hits.append(MidpointHit(i, j, k, mid, distance, aspect_name(multiple)))
+        return hits
+
+
+def analyze_midpoints(
+    positions: Dict[str, float],
+    dial: float = DEFAULT_DIAL,
+    orb: float = DEFAULT_ORB,
+    significant_only: bool = True,
+) -> Dict[Tuple[str, str], Tuple[float, List[dict]]]:
+    """{nokta: derece} -> {(p1, p2): (midpoint, açılar)}; çiftler girdi sırasında.
+
+    Açılar orb'a göre sıralıdır. significant_only: sadece ağırlığı >= 4 olanlar
+    ile orb'u <= 0.7 olan ağırlık-3 açılar (22.5° kadranda False verilmeli).
+    """
+    names = list(positions)
+    degrees = [positions[name] for name in names]
+    grouped: Dict[Tuple[int, int], List[MidpointHit]] = {}
+    midpoint_of: Dict[Tuple[int, int], float] = {}
+    for hit in MidpointEngine(dial, orb).find(degrees):
+        weight = MIDPOINT_ASPECT_WEIGHTS.get(hit.aspect_type, 1)
+        if not significant_only or weight >= 4 or (weight == 3 and round(hit.orb, 2) <= 0.7):
+            grouped.setdefault((hit.first, hit.second), []).append(hit)
+            midpoint_of[(hit.first, hit.second)] = hit.midpoint
+
+    results = {}
+    for pair in sorted(grouped):
+        aspects = [
+            {
+                "celestial_body": names[hit.point],
+                "aspect_type": hit.aspect_type,
+                "weight": MIDPOINT_ASPECT_WEIGHTS.get(hit.aspect_type, 1),
+                "orb": round(hit.orb, 2),
+            }
+            for hit in sorted(grouped[pair], key=lambda h: h.point)
+        ]
+        aspects.sort(key=lambda a: a["orb"])
+        results[(names[pair[0]], names[pair[1]])] = (midpoint_of[pair], aspects)
+    return results
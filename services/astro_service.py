@@ -17,6 +17,7 @@ from typing import Dict, List, Optional, Any, Tuple, Union, TypedDict, BinaryIO
 import requests
 import swisseph as swe
 from flask import jsonify, Blueprint, render_template, current_app
+from services import zodiac
 from exceptions import (
     AstroError,
     CalculationError,
@@ -217,27 +218,8 @@ def convert_house_data_to_strings(data):
 
 
 def get_zodiac_sign(degree):
-    """Dereceye göre burcu döndürür."""
-    zodiac_signs = [
-        "Koç",
-        "Boğa",
-        "İkizler",
-        "Yengeç",
-        "Aslan",
-        "Başak",
-        "Terazi",
-        "Akrep",
-        "Yay",
-        "Oğlak",
-        "Kova",
-        "Balık",
-    ]
-    normalized_degree = degree % 360
-    if normalized_degree < 0:
-        normalized_degree += 360
-    sign_index = int(normalized_degree // 30)
-    # logger.debug(f"{degree:.2f} derece burcu: {zodiac_signs[sign_index]}")
-    return zodiac_signs[sign_index]
+    """Dereceye göre burcu döndürür (services.zodiac tablosundan)."""
+    return zodiac.sign_name(degree)
 
 
 def get_degree_in_sign(degree):
@@ -510,115 +492,46 @@ def calculate_natal_additional_points(
 
 
 # Natal veya transit-natal açı hesaplamaları
-def calculate_aspects(positions1, positions2=None, orb=None):
+def calculate_aspects(positions1, positions2=None, orb=None, include_minor=False, planet_orbs=None):
     """İki set pozisyon arasındaki (natal-natal veya transit-natal) açıları hesaplar.
 
+    Hesaplama services.astro_aspects motorunda sıralı tarama ile yapılır.
+
     Args:
         positions1 (dict): Gezegen/nokta pozisyonları dict'i (örn. natal pozisyonlar)
         positions2 (dict, optional): İki set pozisyonları (örn. transit pozisyonları).
                                      None ise positions1 kendi içinde kıyaslanır (natal-natal).
         orb (dict, optional): Açı tipleri için özel orb değerleri (örn. {"Conjunction": 8, ...}).
-                              Yoksa varsayılanlar kullanılır.
+                              Yoksa varsayılanlar kullanılır. Minör açılar da verilebilir
+                              ("Semi-sextile", "Quintile", "Biquintile", "Quincunx").
+        include_minor (bool): orb verilmemişse minör açıları varsayılan orb'larıyla ekle.
+        planet_orbs (dict, optional): Gezegen başına orb (örn. {"Sun": 10, "Pluto": 5});
+                                      çiftin orb'u iki gezegenin ortalamasıdır, açı orb'unu aşmaz.
 
     Returns:
         list: Bulunan açıların listesi [{planet1, planet2, aspect_type, orb}, ...]
     """
     try:
-        # Varsayılan orb değerleri (daha esnek olabilir veya yapılandırılabilir)
-        default_orbs = {
-            "Conjunction": 8.0,
-            "Opposition": 8.0,
-            "Trine": 8.0,
-            "Square": 8.0,
-            "Sextile": 6.0,
-        }
-        orbs_to_use = orb if isinstance(orb, dict) else default_orbs
+        from services.astro_aspects import get_engine
 
-        aspects_list = []
         # Sadece 'degree' anahtarı olan geçerli pozisyonları al
         valid_positions1 = {
-            k: v for k, v in positions1.items() if isinstance(v, dict) and "degree" in v
+            k: v["degree"] for k, v in positions1.items() if isinstance(v, dict) and "degree" in v
         }
-        valid_positions2 = {
-            k: v
-            for k, v in (
-                positions2.items() if positions2 is not None else positions1.items()
-            )
-            if isinstance(v, dict) and "degree" in v
-        }
-
-        planets1_keys = list(valid_positions1.keys())
-        planets2_keys = list(valid_positions2.keys())
-
-        # Açı dereceleri
-        aspect_degrees = {
-            "Conjunction": 0.0,
-            "Sextile": 60.0,
-            "Square": 90.0,
-            "Trine": 120.0,
-            "Opposition": 180.0,
-        }
-
-        for p1_key in planets1_keys:
-            deg1 = valid_positions1[p1_key]["degree"] % 360  # Normalize
-
-            for p2_key in planets2_keys:
-                deg2 = valid_positions2[p2_key]["degree"] % 360  # Normalize
+        valid_positions2 = None
+        if positions2 is not None:
+            valid_positions2 = {
+                k: v["degree"] for k, v in positions2.items() if isinstance(v, dict) and "degree" in v
+            }
 
-                # Natal-natal kıyaslama yapılıyorsa aynı gezegeni veya çiftleri atla (Sun-Moon vs Moon-Sun)
-                if positions2 is None and p1_key >= p2_key:
-                    continue
+        engine = get_engine(
+            orb if isinstance(orb, dict) else None,
+            include_minor=include_minor,
+            planet_orbs=planet_orbs,
+        )
+        aspects_list = engine.find(valid_positions1, valid_positions2)
 
-                # Açı farkını hesapla (0-180 derece aralığında)
-                diff = abs(deg1 - deg2)
-                aspect_diff = min(diff, 360 - diff)  # En kısa yay
-
-                found_aspect = None
-                min_orb = float("inf")
-
-                for aspect_name, ideal_degree in aspect_degrees.items():
-                    current_orb_limit = orbs_to_use.get(
-                        aspect_name, 0.0
-                    )  # Orb limitini al
-                    if current_orb_limit <= 0:
-                        continue  # Orb 0 veya negatifse bu açıyı kontrol etme
-
-                    # Açı farkını ideal dereceye göre orb içinde mi kontrol et
-                    # Farklı açı tipleri için farklı kontrol yöntemleri olabilir, özellikle 0/180 çevresi
-                    orb_value = abs(aspect_diff - ideal_degree)
-
-                    # Kavuşum (0) ve Karşıt (180) özel kontrolü (0-360 farkı üzerinden)
-                    if aspect_name == "Conjunction":
-                        orb_value = min(
-                            abs(deg1 - deg2), 360 - abs(deg1 - deg2)
-                        )  # 0'a yakınlık
-                    elif aspect_name == "Opposition":
-                        orb_value = min(
-                            abs(deg1 - deg2 - 180) % 360, abs(deg1 - deg2 + 180) % 360
-                        )  # 180'e yakınlık
-
-                    if orb_value <= current_orb_limit:
-                        # Birden fazla orb içinde olabilir, en küçüğünü al (hassas açı)
-                        if orb_value < min_orb:
-                            min_orb = orb_value
-                            found_aspect = {
-                                "planet1": p1_key,
-                                "planet2": p2_key,
-                                "aspect_type": aspect_name,
-                                "orb": round(orb_value, 2),
-                                "exact_difference_0_180": round(
-                                    aspect_diff, 2
-                                ),  # 0-180 fark
-                            }
-
-                if found_aspect:
-                    aspects_list.append(found_aspect)
-
-        # Orb'a göre sırala
-        aspects_list = sorted(aspects_list, key=lambda x: x["orb"])
-
-        logger.info(f"Hesaplanan açı sayısı: {len(aspects_list)}")
-        # logger.debug(f"Hesaplanan açılar: {aspects_list}")
+        logger.debug(f"Hesaplanan açı sayısı: {len(aspects_list)}")
         return aspects_list
 
     except Exception as e:
@@ -629,61 +542,19 @@ def calculate_aspects(positions1, positions2=None, orb=None):
 # Burcun elementini belirleyen fonksiyon
 def get_element(sign):
     """Burcun elementini döndürür."""
-    elements = {
-        "Koç": "Ateş",
-        "Aslan": "Ateş",
-        "Yay": "Ateş",
-        "Boğa": "Toprak",
-        "Başak": "Toprak",
-        "Oğlak": "Toprak",
-        "İkizler": "Hava",
-        "Terazi": "Hava",
-        "Kova": "Hava",
-        "Yengeç": "Su",
-        "Akrep": "Su",
-        "Balık": "Su",
-    }
-    return elements.get(sign, "Bilinmiyor")
+    return zodiac.element_name(sign)
 
 
 # Burcun niteliğini belirleyen fonksiyon (Kardinal, Sabit, Değişken)
 def get_modality(sign):
     """Burcun niteliğini (Kardinal, Sabit, Değişken) döndürür."""
-    modalities = {
-        "Koç": "Kardinal",
-        "Yengeç": "Kardinal",
-        "Terazi": "Kardinal",
-        "Oğlak": "Kardinal",
-        "Boğa": "Sabit",
-        "Aslan": "Sabit",
-        "Akrep": "Sabit",
-        "Kova": "Sabit",
-        "İkizler": "Değişken",
-        "Başak": "Değişken",
-        "Yay": "Değişken",
-        "Balık": "Değişken",
-    }
-    return modalities.get(sign, "Bilinmiyor")
+    return zodiac.modality_name(sign)
 
 
 # Burcun polaritesini belirleyen fonksiyon (Erkek/Pozitif, Dişi/Negatif)
 def get_polarity(sign):
     """Burcun polaritesini (Erkek/Dişi) döndürür."""
-    polarities = {
-        "Koç": "Erkek",
-        "İkizler": "Erkek",
-        "Aslan": "Erkek",
-        "Terazi": "Erkek",
-        "Yay": "Erkek",
-        "Kova": "Erkek",
-        "Boğa": "Dişi",
-        "Yengeç": "Dişi",
-        "Başak": "Dişi",
-        "Akrep": "Dişi",
-        "Oğlak": "Dişi",
-        "Balık": "Dişi",
-    }
-    return polarities.get(sign, "Bilinmiyor")
+    return zodiac.polarity_name(sign)
 
 
 # Natal harita özet yorumunun oluşturulması (Basit versiyon)
@@ -1076,32 +947,6 @@ NAKSHATRAS = [
     },
 ]
 
-# Dasa Periyotları (Yıl cinsinden) - Toplam 120 yıl
-DASA_YEARS = {
-    "Ketu": 7,
-    "Venus": 20,
-    "Sun": 6,
-    "Moon": 10,
-    "Mars": 7,
-    "Rahu": 18,
-    "Jupiter": 16,
-    "Saturn": 19,
-    "Mercury": 17,
-}
-
-# Dasa Sırası (Ketu'dan başlar)
-DASA_ORDER = [
-    "Ketu",
-    "Venus",
-    "Sun",
-    "Moon",
-    "Mars",
-    "Rahu",
-    "Jupiter",
-    "Saturn",
-    "Mercury",
-]
-
 # Gezegen Türkçe İsimleri
 PLANET_NAMES_TR = {
     "Ketu": "Ketu (Güney Ay Düğümü)",
@@ -1115,8 +960,6 @@ PLANET_NAMES_TR = {
     "Mercury": "Merkür (Budha)",
 }
 
-# Toplam Dasa döngüsü (yıl)
-TOTAL_DASA_CYCLE = 120.0
 NAKSHATRA_SPAN = 360.0 / 27.0  # ~13.333333 derece
 
 
@@ -1147,38 +990,14 @@ def get_nakshatra_info(moon_degree):
     }
 
 
-def calculate_dasa_balance_at_birth(moon_degree):
-    """Doğum anında kalan Dasa süresini hesaplar."""
-    nakshatra_info = get_nakshatra_info(moon_degree)
-    start_lord = nakshatra_info["lord"]
-
-    # Nakshatra'nın kalan kısmı = Dasa'nın kalan kısmı
-    remaining_in_nakshatra = NAKSHATRA_SPAN - nakshatra_info["degree_in_nakshatra"]
-    balance_ratio = remaining_in_nakshatra / NAKSHATRA_SPAN
-
-    # Başlangıç Dasa'sının kalan süresi (yıl)
-    balance_years = balance_ratio * DASA_YEARS[start_lord]
-
-    return {
-        "start_lord": start_lord,
-        "balance_years": balance_years,
-        "balance_days": balance_years * 365.25,
-        "nakshatra_info": nakshatra_info,
-    }
+def get_vimshottari_timeline(birth_dt, natal_moon_degree):
+    """Doğuma bağlı (tarihten bağımsız) Vimshottari Maha Dasa sınırları (JD)."""
+    from services.vimshottari import DasaTimeline, datetime_to_jd
 
+    return DasaTimeline.from_birth(datetime_to_jd(birth_dt), natal_moon_degree)
 
-def get_dasa_sequence_from_lord(start_lord):
-    """Belirli bir lord'dan başlayan Dasa sırasını döndürür."""
-    start_idx = DASA_ORDER.index(start_lord)
-    return DASA_ORDER[start_idx:] + DASA_ORDER[:start_idx]
 
-
-def calculate_sub_period_duration(main_years, sub_lord_years):
-    """Alt periyot süresini hesaplar (gün cinsinden)."""
-    return (main_years * sub_lord_years / TOTAL_DASA_CYCLE) * 365.25
-
-
-def get_vimshottari_dasa(birth_dt, natal_moon_degree):
+def get_vimshottari_dasa(birth_dt, natal_moon_degree, now=None, timeline=None):
     """
     Kapsamlı Vimshottari Dasa hesaplaması.
 
@@ -1189,199 +1008,88 @@ def get_vimshottari_dasa(birth_dt, natal_moon_degree):
     - Nakshatra bilgisi
     - Gelecek 5 yıllık Dasa takvimi
 
+    Maha Dasa sınırları services.vimshottari zaman çizelgesinden gelir
+    (timeline verilirse yeniden hesaplanmaz); mevcut periyotlar ikili
+    arama ile bulunur, alt seviyeler sadece mevcut periyot için açılır.
+
     Args:
         birth_dt: Doğum tarihi (datetime)
         natal_moon_degree: Ay'ın ekliptik derecesi (0-360)
+        now: Referans an (varsayılan: şu an)
+        timeline: Önceden hesaplanmış DasaTimeline
 
     Returns:
         dict: Kapsamlı Dasa bilgileri
     """
     try:
+        from services.vimshottari import datetime_to_jd, jd_to_datetime
+
         if natal_moon_degree is None:
             return {
                 "error": "Ay pozisyonu bulunamadığı için Vimshottari Dasa hesaplanamadı."
             }
 
-        now = datetime.now()
-
-        # 1. Nakshatra ve başlangıç Dasa bilgisi
-        birth_balance = calculate_dasa_balance_at_birth(natal_moon_degree)
-        nakshatra_info = birth_balance["nakshatra_info"]
-        start_lord = birth_balance["start_lord"]
-        balance_days = birth_balance["balance_days"]
-
-        # 2. Tüm Dasa periyotlarını hesapla (doğumdan itibaren)
-        dasa_sequence = get_dasa_sequence_from_lord(start_lord)
-        all_dasas = []
-
-        # İlk Dasa (kalan süre ile)
-        first_dasa_end = birth_dt + timedelta(days=balance_days)
-        all_dasas.append(
-            {
-                "lord": start_lord,
-                "lord_tr": PLANET_NAMES_TR[start_lord],
-                "start": birth_dt,
-                "end": first_dasa_end,
-                "duration_years": balance_days / 365.25,
-                "is_partial": True,
-            }
-        )
-
-        # Sonraki Dasa'lar (tam periyotlar)
-        current_start = first_dasa_end
-        for i in range(1, len(dasa_sequence)):
-            lord = dasa_sequence[i]
-            duration_days = DASA_YEARS[lord] * 365.25
-            dasa_end = current_start + timedelta(days=duration_days)
-            all_dasas.append(
-                {
-                    "lord": lord,
-                    "lord_tr": PLANET_NAMES_TR[lord],
-                    "start": current_start,
-                    "end": dasa_end,
-                    "duration_years": DASA_YEARS[lord],
-                    "is_partial": False,
-                }
-            )
-            current_start = dasa_end
+        now = now or datetime.now()
+        now_jd = datetime_to_jd(now)
 
-        # İkinci döngü için devam (120 yıl sonrası)
-        for lord in dasa_sequence:
-            duration_days = DASA_YEARS[lord] * 365.25
-            dasa_end = current_start + timedelta(days=duration_days)
-            all_dasas.append(
-                {
-                    "lord": lord,
-                    "lord_tr": PLANET_NAMES_TR[lord],
-                    "start": current_start,
-                    "end": dasa_end,
-                    "duration_years": DASA_YEARS[lord],
-                    "is_partial": False,
-                }
-            )
-            current_start = dasa_end
-
-        # 3. Mevcut Maha Dasa'yı bul
-        current_maha_dasa = None
-        current_maha_dasa_index = 0
-        for i, dasa in enumerate(all_dasas):
-            if dasa["start"] <= now < dasa["end"]:
-                current_maha_dasa = dasa
-                current_maha_dasa_index = i
-                break
+        # 1. Nakshatra bilgisi ve doğuma bağlı Maha Dasa sınırları
+        nakshatra_info = get_nakshatra_info(natal_moon_degree)
+        if timeline is None:
+            timeline = get_vimshottari_timeline(birth_dt, natal_moon_degree)
 
-        if not current_maha_dasa:
+        # 2. Mevcut Maha / Antar / Pratyantar dasa (ikili arama)
+        current = timeline.locate(now_jd, depth=3)
+        if not current:
             return {"error": "Mevcut Dasa periyodu bulunamadı."}
 
-        # 4. Antardasa (Bhukti) hesapla
-        maha_lord = current_maha_dasa["lord"]
-        maha_start = current_maha_dasa["start"]
-        maha_duration_days = (current_maha_dasa["end"] - maha_start).days
-
-        bhukti_sequence = get_dasa_sequence_from_lord(maha_lord)
-        all_bhuktis = []
-        bhukti_start = maha_start
-
-        for bhukti_lord in bhukti_sequence:
-            bhukti_duration_days = calculate_sub_period_duration(
-                maha_duration_days / 365.25, DASA_YEARS[bhukti_lord]
-            )
-            bhukti_end = bhukti_start + timedelta(days=bhukti_duration_days)
-            all_bhuktis.append(
-                {
-                    "lord": bhukti_lord,
-                    "lord_tr": PLANET_NAMES_TR[bhukti_lord],
-                    "start": bhukti_start,
-                    "end": bhukti_end,
-                    "duration_days": bhukti_duration_days,
-                }
-            )
-            bhukti_start = bhukti_end
-
-        # Mevcut Bhukti'yi bul
-        current_bhukti = None
-        current_bhukti_index = 0
-        for i, bhukti in enumerate(all_bhuktis):
-            if bhukti["start"] <= now < bhukti["end"]:
-                current_bhukti = bhukti
-                current_bhukti_index = i
-                break
+        current_maha_dasa = current[0]
+        current_bhukti = current[1] if len(current) > 1 else None
+        current_pratyantardasa = current[2] if len(current) > 2 else None
+        maha_lord = current_maha_dasa.lord
+        all_bhuktis = timeline.periods((current_maha_dasa.index,))
 
-        # 5. Pratyantardasa (3. seviye) hesapla
-        current_pratyantardasa = None
-        all_pratyantardasas = []
+        def fmt(jd):
+            return jd_to_datetime(jd).strftime("%Y-%m-%d")
 
-        if current_bhukti:
-            bhukti_lord = current_bhukti["lord"]
-            bhukti_start = current_bhukti["start"]
-            bhukti_duration_days = current_bhukti["duration_days"]
+        def remaining_days(period):
+            return math.floor(period.end - now_jd) if period else 0
 
-            pratyantar_sequence = get_dasa_sequence_from_lord(bhukti_lord)
-            pratyantar_start = bhukti_start
+        def short_name(period):
+            return PLANET_NAMES_TR[period.lord].split(" ")[0] if period else "?"
 
-            for pratyantar_lord in pratyantar_sequence:
-                pratyantar_duration_days = calculate_sub_period_duration(
-                    bhukti_duration_days / 365.25, DASA_YEARS[pratyantar_lord]
-                )
-                pratyantar_end = pratyantar_start + timedelta(
-                    days=pratyantar_duration_days
-                )
-                all_pratyantardasas.append(
-                    {
-                        "lord": pratyantar_lord,
-                        "lord_tr": PLANET_NAMES_TR[pratyantar_lord],
-                        "start": pratyantar_start,
-                        "end": pratyantar_end,
-                        "duration_days": pratyantar_duration_days,
-                    }
-                )
-                pratyantar_start = pratyantar_end
-
-            # Mevcut Pratyantardasa'yı bul
-            for pratyantar in all_pratyantardasas:
-                if pratyantar["start"] <= now < pratyantar["end"]:
-                    current_pratyantardasa = pratyantar
-                    break
-
-        # 6. Gelecek 5 yıllık Dasa takvimi
+        # 3. Gelecek 5 yıllık Dasa takvimi
         future_timeline = []
-        five_years_later = now + timedelta(days=5 * 365.25)
+        five_years_later = now_jd + 5 * 365.25
 
-        for dasa in all_dasas:
-            if dasa["end"] > now and dasa["start"] < five_years_later:
+        for dasa in timeline.periods():
+            if dasa.end > now_jd and dasa.start < five_years_later:
                 future_timeline.append(
                     {
                         "type": "Maha Dasa",
-                        "lord": dasa["lord"],
-                        "lord_tr": PLANET_NAMES_TR[dasa["lord"]],
-                        "start": dasa["start"].strftime("%Y-%m-%d"),
-                        "end": dasa["end"].strftime("%Y-%m-%d"),
+                        "lord": dasa.lord,
+                        "lord_tr": PLANET_NAMES_TR[dasa.lord],
+                        "start": fmt(dasa.start),
+                        "end": fmt(dasa.end),
                     }
                 )
 
         # Gelecek Bhukti'ler (mevcut Maha Dasa içinde)
         for bhukti in all_bhuktis:
-            if bhukti["end"] > now and bhukti["start"] < five_years_later:
+            if bhukti.end > now_jd and bhukti.start < five_years_later:
                 future_timeline.append(
                     {
                         "type": "Antardasa",
-                        "lord": f"{maha_lord}-{bhukti['lord']}",
-                        "lord_tr": f"{PLANET_NAMES_TR[maha_lord]} / {PLANET_NAMES_TR[bhukti['lord']]}",
-                        "start": bhukti["start"].strftime("%Y-%m-%d"),
-                        "end": bhukti["end"].strftime("%Y-%m-%d"),
+                        "lord": f"{maha_lord}-{bhukti.lord}",
+                        "lord_tr": f"{PLANET_NAMES_TR[maha_lord]} / {PLANET_NAMES_TR[bhukti.lord]}",
+                        "start": fmt(bhukti.start),
+                        "end": fmt(bhukti.end),
                     }
                 )
 
-        # 7. Kalan süreleri hesapla
-        remaining_in_maha = (current_maha_dasa["end"] - now).days
-        remaining_in_bhukti = (
-            (current_bhukti["end"] - now).days if current_bhukti else 0
-        )
-        remaining_in_pratyantar = (
-            (current_pratyantardasa["end"] - now).days if current_pratyantardasa else 0
-        )
+        # 4. Kalan süreler
+        remaining_in_maha = remaining_days(current_maha_dasa)
 
-        # 8. Sonuç
+        # 5. Sonuç
         return {
             # Nakshatra Bilgisi
             "nakshatra": {
@@ -1393,54 +1101,54 @@ def get_vimshottari_dasa(birth_dt, natal_moon_degree):
                 "percentage": nakshatra_info["percentage_traversed"],
             },
             # Mevcut Maha Dasa
-            "main_dasa_lord": current_maha_dasa["lord"],
-            "main_dasa_lord_tr": PLANET_NAMES_TR[current_maha_dasa["lord"]],
-            "main_dasa_start_date": current_maha_dasa["start"].strftime("%Y-%m-%d"),
-            "main_dasa_end_date": current_maha_dasa["end"].strftime("%Y-%m-%d"),
+            "main_dasa_lord": maha_lord,
+            "main_dasa_lord_tr": PLANET_NAMES_TR[maha_lord],
+            "main_dasa_start_date": fmt(current_maha_dasa.start),
+            "main_dasa_end_date": fmt(current_maha_dasa.end),
             "remaining_days_in_main_dasa": remaining_in_maha,
             "remaining_years_in_main_dasa": round(remaining_in_maha / 365.25, 2),
             # Mevcut Antardasa (Bhukti)
-            "sub_dasa_lord": current_bhukti["lord"] if current_bhukti else None,
-            "sub_dasa_lord_tr": PLANET_NAMES_TR[current_bhukti["lord"]]
+            "sub_dasa_lord": current_bhukti.lord if current_bhukti else None,
+            "sub_dasa_lord_tr": PLANET_NAMES_TR[current_bhukti.lord]
             if current_bhukti
             else None,
-            "sub_dasa_start_date": current_bhukti["start"].strftime("%Y-%m-%d")
-            if current_bhukti
-            else None,
-            "sub_dasa_end_date": current_bhukti["end"].strftime("%Y-%m-%d")
-            if current_bhukti
-            else None,
-            "remaining_days_in_sub_dasa": remaining_in_bhukti,
+            "sub_dasa_start_date": fmt(current_bhukti.start) if current_bhukti else None,
+            "sub_dasa_end_date": fmt(current_bhukti.end) if current_bhukti else None,
+            "remaining_days_in_sub_dasa": remaining_days(current_bhukti),
             # Mevcut Pratyantardasa (3. seviye)
-            "pratyantar_lord": current_pratyantardasa["lord"]
+            "pratyantar_lord": current_pratyantardasa.lord
             if current_pratyantardasa
             else None,
-            "pratyantar_lord_tr": PLANET_NAMES_TR[current_pratyantardasa["lord"]]
+            "pratyantar_lord_tr": PLANET_NAMES_TR[current_pratyantardasa.lord]
             if current_pratyantardasa
             else None,
-            "pratyantar_start_date": current_pratyantardasa["start"].strftime(
-                "%Y-%m-%d"
-            )
+            "pratyantar_start_date": fmt(current_pratyantardasa.start)
             if current_pratyantardasa
             else None,
-            "pratyantar_end_date": current_pratyantardasa["end"].strftime("%Y-%m-%d")
+            "pratyantar_end_date": fmt(current_pratyantardasa.end)
             if current_pratyantardasa
             else None,
-            "remaining_days_in_pratyantar": remaining_in_pratyantar,
+            "remaining_days_in_pratyantar": remaining_days(current_pratyantardasa),
             # Mevcut Dasa Dizisi (kısa format)
-            "current_period": f"{current_maha_dasa['lord']}-{current_bhukti['lord'] if current_bhukti else '?'}-{current_pratyantardasa['lord'] if current_pratyantardasa else '?'}",
-            "current_period_tr": f"{PLANET_NAMES_TR[current_maha_dasa['lord']].split(' ')[0]} / {PLANET_NAMES_TR[current_bhukti['lord']].split(' ')[0] if current_bhukti else '?'} / {PLANET_NAMES_TR[current_pratyantardasa['lord']].split(' ')[0] if current_pratyantardasa else '?'}",
+            "current_period": "-".join(
+                p.lord if p else "?"
+                for p in (current_maha_dasa, current_bhukti, current_pratyantardasa)
+            ),
+            "current_period_tr": " / ".join(
+                short_name(p)
+                for p in (current_maha_dasa, current_bhukti, current_pratyantardasa)
+            ),
             # Gelecek 5 Yıllık Takvim
             "future_timeline": future_timeline[:15],  # İlk 15 periyot
             # Tüm Bhukti'ler (mevcut Maha Dasa için)
             "all_bhuktis_in_current_dasa": [
                 {
-                    "lord": b["lord"],
-                    "lord_tr": PLANET_NAMES_TR[b["lord"]],
-                    "start": b["start"].strftime("%Y-%m-%d"),
-                    "end": b["end"].strftime("%Y-%m-%d"),
-                    "is_current": b["lord"]
-                    == (current_bhukti["lord"] if current_bhukti else None),
+                    "lord": b.lord,
+                    "lord_tr": PLANET_NAMES_TR[b.lord],
+                    "start": fmt(b.start),
+                    "end": fmt(b.end),
+                    "is_current": b.lord
+                    == (current_bhukti.lord if current_bhukti else None),
                 }
                 for b in all_bhuktis
             ],
@@ -1627,34 +1335,11 @@ def get_harmonic_chart(dt_object, harmonic_number, celestial_bodies_positions):
     celestial_bodies_positions: { "İsim": {"degree": X, ...} } formatında dict.
     """
     try:
-        if not isinstance(harmonic_number, int) or harmonic_number <= 0:
-            raise ValueError("Harmonik sayı pozitif bir tam sayı olmalıdır.")
+        from services.astro_harmonics import HarmonicMatrix
 
-        harmonic_positions = {}
-        for name, data in celestial_bodies_positions.items():
-            if "degree" not in data:
-                logger.warning(
-                    f"Harmonik {harmonic_number} için {name} pozisyonu (degree) eksik, atlandı."
-                )
-                continue
-            lon = data["degree"]
-
-            # Harmonik derece = (Natal Derece * Harmonik Sayı) % 360
-            harmonic_degree = (lon * harmonic_number) % 360
-            if harmonic_degree < 0:
-                harmonic_degree += 360
-
-            harmonic_positions[name] = {
-                "degree": round(harmonic_degree, 2),
-                "sign": get_zodiac_sign(harmonic_degree),
-                "degree_in_sign": round(get_degree_in_sign(harmonic_degree), 2),
-            }
-            # logger.debug(f"H{harmonic_number} {name}: {harmonic_positions[name]['degree']:.2f}° {harmonic_positions[name]['sign']}")
-
-        logger.info(
-            f"Harmonik H{harmonic_number} haritası hesaplandı ({len(harmonic_positions)} adet)."
+        return HarmonicMatrix(celestial_bodies_positions, (harmonic_number,)).chart(
+            harmonic_number
         )
-        return harmonic_positions
 
     except Exception as e:
         logger.error(
@@ -1665,84 +1350,22 @@ def get_harmonic_chart(dt_object, harmonic_number, celestial_bodies_positions):
 
 
 # Derin harmonik analiz (Birden çok harmonik)
-def calculate_deep_harmonic_analysis(birth_dt, natal_celestial_positions):
+def calculate_deep_harmonic_analysis(birth_dt, natal_celestial_positions, harmonics=None):
     """Doğum tarihine göre çeşitli N. harmonik haritaların gezegen pozisyonlarını hesaplar.
     natal_celestial_positions: { "İsim": {"degree": X, ...} } formatında dict. (Tüm natal noktalar)
+
+    Tüm harmonikler services.astro_harmonics matrisinde tek geçişte hesaplanır;
+    harmonics verilirse çıktıda sadece o harmonikler üretilir, verilmezse
+    raporlanan setin tamamı üretilir.
     """
     try:
-        logger.info("Derin harmonik analiz hesaplanıyor...")
-
-        # Harmonik sayıları ve anlamları
-        harmonics_to_calculate = {
-            1: {"name": "Rāśi (D1)", "details": "Ana harita, hayatın tamamı"},
-            2: {"name": "Hora (D2)", "details": "Para kazanma şekli, finans akışı"},
-            3: {
-                "name": "Drekkana (D3)",
-                "details": "Cesaret, kardeşler, mücadele gücü",
-            },
-            4: {"name": "Chaturthamsa (D4)", "details": "Mülk, ev, yerleşim, taşınma"},
-            7: {"name": "Saptamsa (D7)", "details": "Çocuklar, yaratıcılık, torunlar"},
-            9: {
-                "name": "Navamsa (D9)",
-                "details": "Evlilik, partner, dharma, ruhsal yolculuk, En kritik varga",
-            },
-            10: {
-                "name": "Dasamsa (D10)",
-                "details": "Kariyer, meslek, toplumsal statü",
-            },
-            12: {"name": "Dvadasamsa (D12)", "details": "Ebeveynler, geçmiş yaşamlar"},
-            13: {
-                "name": "Trayodashamsa (D13)",
-                "details": "arzuların, tutkuların, bastırılmış dürtülerin ve irade gücünün analiz edildiği bölünmüş haritadır",
-            },
-            16: {
-                "name": "Shodasamsa (D16)",
-                "details": "Taşıtlar, gayrimenkul, genel mutluluk/üzüntü, konfor",
-            },
-            17: {
-                "name": "Saptadashamsa (D17)",
-                "details": "güç, statü, onur, toplumsal saygınlık ve “yüksek konumda durabilme” sorusuna cevap verir.",
-            },
-            19: {
-                "name": "Navatara (D19)",
-                "details": "Ruhsal bilinç + ilahi planla senkronizasyon tanrısal düzen bu kişiyi ne kadar kolluyor?” sorusuna cevap verir.",
-            },
-            20: {"name": "Vimsamsa (D20)", "details": "Ruhsal gelişim, ibadet, inanç"},
-            23: {
-                "name": "Vimsamsa / Trimsamsa-23 (D23)",
-                "details": "Bilgiyi alma, işleme ve aktarma haritası",
-            },
-            24: {"name": "Chaturvimsamsa (D24)", "details": "Eğitim, bilgi, öğrenme"},
-            27: {
-                "name": "Nakshatramsa (D27) / Bhamsa",
-                "details": "Güç, zayıflık, fiziksel dayanıklılık",
-            },
-            30: {
-                "name": "Trimsamsa (D30)",
-                "details": "Zorluklar, talihsizlikler, hastalıklar, Kişinin başına “neden kötü şeyler geliyor?” sorusunun cevabı",
-            },
-            40: {"name": "Khavedamsa (D40)", "details": "Anne soyundan karma"},
-            45: {"name": "Akshavedamsa (D45)", "details": "Baba soyundan karma"},
-            60: {"name": "Shashtiamsa (D60)", "details": "Saf karma, önceki yaşam"},
-            # Diğer Batı harmonikleri eklenebilir (örn. 4, 5, 8, 11, 13, 14, 15)
-        }
-
-        deep_harmonic_analysis = {}
+        from services.astro_harmonics import HarmonicMatrix
 
-        for harmonic_number, info in harmonics_to_calculate.items():
-            # calculate_celestial_positions'ı her harmonik için tekrar çağırmak yerine,
-            # natal pozisyonları alıp harmonik dönüşümü yapmak daha verimli.
-            harmonic_positions = get_harmonic_chart(
-                birth_dt, harmonic_number, natal_celestial_positions
-            )  # Burada natal_celestial_positions kullanılır
-
-            deep_harmonic_analysis[f"H{harmonic_number}"] = {
-                "name": info["name"],
-                "details": info["details"],
-                "planet_positions": harmonic_positions,
-            }
+        deep_harmonic_analysis = HarmonicMatrix(natal_celestial_positions).analysis(
+            harmonics
+        )
 
-        logger.info(
+        logger.debug(
             f"Derin harmonik analiz tamamlandı ({len(deep_harmonic_analysis)} harmonik hesaplandı)."
         )
         return deep_harmonic_analysis
@@ -2421,141 +2044,36 @@ def calculate_lunar_return_chart(birth_dt, current_dt, latitude, longitude):
         return {}  # Hata durumunda boş sözlük döndür
 
 
+def _fixed_star_jd(birth_dt):
+    dt_utc = birth_dt - timedelta(hours=3)  # Varsayım: UTC+3 Local -> UTC
+    return swe.julday(
+        dt_utc.year,
+        dt_utc.month,
+        dt_utc.day,
+        dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0,
+    )
+
+
 # Sabit yıldızların hesaplanması
 def calculate_fixed_stars(birth_dt):
-    """Doğum tarihine göre sabit yıldızların pozisyonlarını hesaplar"""
-    try:
-        logger.info("Sabit yıldız pozisyonları hesaplanıyor...")
-        dt_utc = birth_dt - timedelta(hours=3)  # Varsayım: UTC+3 Local -> UTC
-        jd_ut = swe.julday(
-            dt_utc.year,
-            dt_utc.month,
-            dt_utc.day,
-            dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0,
-        )
+    """Doğum tarihine göre sabit yıldızların pozisyonlarını hesaplar.
 
-        # Swisseph'in desteklediği yaygın sabit yıldızların listesi
-        # İsimlerin swe.fixstar veya swe.fixstar2_ut tarafından tanınması gerekir.
-        # Tam liste için swisseph belgelerine ve fixstars.cat dosyasına bakılmalıdır.
-        # Bazı isimler birden fazla kelime içerir ve boşluklar alt çizgi (_) ile değiştirilmelidir
-        # veya swe'nin beklediği tam format kullanılmalıdır.
-        # Önceki listedeki bazı isimler (Draco, Hyades, Pleiades, Praesepe, Sirius B, Procyon B, Deneb Okab, Formalhaut)
-        # doğrudan tanınmıyor olabilir veya farklı bir yazılıma sahiptir.
-        # Daha güvenli olması için yaygın ve bilinen isimleri kullanalım ve hata yakalamayı sürdürelim.
-        fixed_stars_list_safe = [
-            "Aldebaran",
-            "Antares",
-            "Regulus",
-            "Spica",
-            "Sirius",
-            "Vega",
-            "Fomalhaut",
-            "Pollux",
-            "Castor",
-            "Procyon",
-            "Algol",
-            "Deneb_Algedi",  # Boşlukları alt çizgi yapalım
-            "Scheat",
-            "Markab",
-            "Capella",
-            "Rigel",
-            "Betelgeuse",
-            "Bellatrix",
-            "Alnilam",
-            "Alnitak",
-            "Saiph",
-            "Polaris",
-            "Kochab",
-            "Alcyone",
-            "Asellus_Borealis",
-            "Asellus_Australis",
-            "Acubens",
-            "Canopus",
-            "Miaplacidus",
-            "Suhail",
-            "Avior",
-            "Wezen",
-            "Aludra",
-            "Alphard",
-            "Alphecca",
-            "Unukalhai",
-            "Rasalhague",
-            "Shaula",
-            "Lesath",
-            "Kaus_Australis",
-            "Nunki",
-            "Ascella",
-            "Deneb_Adige",
-            "Sador",
-            "Albireo",
-            "Altair",
-            "Algedi",
-            "Nashira",
-            "Sadalmelek",
-            "Sadal_Suud",
-            "Formalhaut",  # Formalhaut'u tekrar ekleyelim, belki farklı yazılımı denerken çalışır
-        ]
+    Konumlar services.fixed_stars kataloğunun yıllık tablosundan interpolasyonla gelir
+    (katalog bir kez okunur, aynı yıl için Swisseph tekrar çağrılmaz)."""
+    try:
+        from services.fixed_stars import star_catalogue
 
         results = {}
-        for star_name_raw in fixed_stars_list_safe:
-            # swe fonksiyonları genellikle küçük harf ve alt çizgi ile çalışır
-            star_name = star_name_raw.lower().replace(
-                " ", "_"
-            )  # Boşlukları alt çizgiye çevir
-
-            try:
-                # swe.fixstar(starname, tjd_ut, iflags)
-                # returns ((lon, lat, dist), mag, serr) - Bu format magnitude'u veriyor
-                pos_result_mag = swe.fixstar(star_name, jd_ut, swe.FLG_SWIEPH)
-
-                # Hata kontrolü: pos_result_mag None değilse ve ilk elemanı (konum tuple) None değilse
-                if not pos_result_mag or not pos_result_mag[0]:
-                    # logger.debug(f"Sabit yıldız '{star_name_raw}' pozisyonu hesaplanamadı veya bulunamadı (pos_result_mag[0] None).")
-                    continue  # Bulunamazsa atla
-
-                pos_tuple = pos_result_mag[0]  # (lon, lat, dist)
-                degree = pos_tuple[0] % 360  # Tam boylam, 0-360 normalize
-                if degree < 0:
-                    degree += 360
-                latitude = pos_tuple[1]  # Ekliptik enlem
-
-                # Magnitude kontrolü: pos_result_mag en az 2 elemanlı mı ve 2. eleman sayısal mı?
-                magnitude = None
-                if len(pos_result_mag) > 1:
-                    if isinstance(pos_result_mag[1], (int, float)):
-                        magnitude = float(pos_result_mag[1])
-                    # else: # Eğer sayısal değilse, muhtemelen serr stringidir. Hata yakalandığında loglanır.
-                    # logger.warning(f"Sabit yıldız '{star_name_raw}' için magnitude sayısal değil: {pos_result_mag[1]}.")
-
-                sign = get_zodiac_sign(degree)
-
-                results[star_name_raw] = {  # Orijinal ismi kaydet
-                    "degree": round(degree, 2),  # Tam boylam
-                    "sign": sign,
-                    "degree_in_sign": round(
-                        get_degree_in_sign(degree), 2
-                    ),  # Burç içindeki derece
-                    "latitude": round(latitude, 4),  # Ekliptik enlem
-                    "magnitude": round(magnitude, 2) if magnitude is not None else None,
-                }
-                # logger.debug(f"{star_name_raw} pozisyonu hesaplandı: {results[star_name_raw]}")
-
-            except swe.Error as e:
-                # Swisseph'in kendi hatasını yakala (örn. yıldız bulunamadı)
-                logger.debug(
-                    f"Sabit yıldız {star_name_raw} hesaplanırken Swisseph hatası: {str(e)}"
-                )
-                continue  # Hata olursa atla
-
-            except Exception as e:
-                # Diğer olası hataları yakala (örn. TypeError)
-                logger.error(
-                    f"Sabit yıldız {star_name_raw} hesaplanırken beklenmedik hata: {str(e)}",
-                    exc_info=True,
-                )
-                continue  # Hata olursa atla
+        for star in star_catalogue.positions(_fixed_star_jd(birth_dt)):
+            results[star.name] = {
+                "degree": round(star.longitude, 2),  # Tam boylam
+                "sign": get_zodiac_sign(star.longitude),
+                "degree_in_sign": round(get_degree_in_sign(star.longitude), 2),  # Burç içindeki derece
+                "latitude": round(star.latitude, 4),  # Ekliptik enlem
+                "magnitude": round(star.magnitude, 2) if star.magnitude is not None else None,
+            }
 
-        logger.info(f"Sabit yıldızların hesaplanması tamamlandı ({len(results)} adet).")
+        logger.debug(f"Sabit yıldızların hesaplanması tamamlandı ({len(results)} adet).")
         return results
 
     except Exception as e:
@@ -2565,6 +2083,22 @@ def calculate_fixed_stars(birth_dt):
         return {}
 
 
+def calculate_fixed_star_conjunctions(birth_dt, celestial_positions, orb=1.0):
+    """Natal noktalarla sabit yıldız kavuşumları (sıralı boylam dizisinde ikili arama)."""
+    try:
+        from services.fixed_stars import star_catalogue
+
+        points = {
+            k: v["degree"]
+            for k, v in celestial_positions.items()
+            if isinstance(v, dict) and "degree" in v
+        }
+        return star_catalogue.conjunctions(_fixed_star_jd(birth_dt), points, orb)
+    except Exception as e:
+        logger.error(f"Sabit yıldız kavuşum hatası: {str(e)}", exc_info=True)
+        return []
+
+
 # Eclipse (Tutulma) hesaplaması - Doğum tarihi civarında veya güncel tarih civarında
 def find_eclipses_in_range(start_dt, end_dt):
     """Verilen tarih aralığında Güneş ve Ay tutulmalarını bulur."""
@@ -2809,6 +2343,9 @@ def find_eclipses_in_range(start_dt, end_dt):
 def calculate_antiscia(natal_celestial_positions, orb=1.0):
     """Gezegenlerin antiscia (karşıt dekan) ve contra-antiscia (karşıt burçta aynı dekan) noktalarını ve bağlantılarını hesaplar.
 
+    Yansımalar services.astro_antiscia motorunda bir kez hesaplanır ve sıralı
+    dairesel arama ile diğer noktalarla eşleştirilir.
+
     Args:
         natal_celestial_positions (dict): Natal gezegen/nokta konumları
         orb (float): Maksimum tolerans derecesi (default 1°)
@@ -2817,93 +2354,38 @@ def calculate_antiscia(natal_celestial_positions, orb=1.0):
         dict: Her gezegen/nokta için antiscia/contra-antiscia bilgileri ve bağlantılar
     """
     try:
-        # Sadece 'degree' anahtarı olan geçerli pozisyonları al
-        valid_positions = {
-            k: v
-            for k, v in natal_celestial_positions.items()
-            if isinstance(v, dict) and "degree" in v
-        }
-
-        results = {}
-
-        # Pozisyonları normalize et (0-360)
-        normalized_positions = {
-            p: data["degree"] % 360 for p, data in valid_positions.items()
-        }
+        from services.astro_antiscia import REFLECTIONS, find_contacts, reflect
 
-        for planet1, deg1 in normalized_positions.items():
-            # Antiscia noktası hesapla: (180 - deg1) % 360
-            antiscia_deg = (180 - deg1) % 360
-            if antiscia_deg < 0:
-                antiscia_deg += 360
-
-            # Contra-antiscia noktası hesapla: (360 - deg1) % 360
-            contra_antiscia_deg = (360 - deg1) % 360
-            if contra_antiscia_deg < 0:
-                contra_antiscia_deg += 360
-
-            antiscia_connections = []
-            contra_antiscia_connections = []
-
-            # Diğer gezegen/noktalarla bağlantıları kontrol et
-            for planet2, deg2 in normalized_positions.items():
-                if planet1 == planet2:
-                    continue  # Kendisiyle kıyaslama yapma
-
-                # Antiscia bağlantısı kontrolü: deg2, antiscia_deg'e orb kadar yakın mı?
-                diff_antiscia = abs(deg2 - antiscia_deg)
-                orb_antiscia_value = min(
-                    diff_antiscia, 360 - diff_antiscia
-                )  # En kısa yay
-
-                if orb_antiscia_value <= orb:
-                    antiscia_connections.append(
-                        {
-                            "planet": planet2,
-                            "degree": round(deg2, 2),
-                            "sign": get_zodiac_sign(deg2),
-                            "orb": round(orb_antiscia_value, 2),
-                        }
-                    )
+        # Sadece 'degree' anahtarı olan geçerli pozisyonları al (0-360)
+        names, degrees = _valid_degrees(natal_celestial_positions)
+        signs = [get_zodiac_sign(deg) for deg in degrees]
 
-                # Contra-antiscia bağlantısı kontrolü: deg2, contra_antiscia_deg'e orb kadar yakın mı?
-                diff_contra_antiscia = abs(deg2 - contra_antiscia_deg)
-                orb_contra_antiscia_value = min(
-                    diff_contra_antiscia, 360 - diff_contra_antiscia
-                )  # En kısa yay
-
-                if orb_contra_antiscia_value <= orb:
-                    contra_antiscia_connections.append(
-                        {
-                            "planet": planet2,
-                            "degree": round(deg2, 2),
-                            "sign": get_zodiac_sign(deg2),
-                            "orb": round(orb_contra_antiscia_value, 2),
-                        }
-                    )
+        connections = {(i, kind): [] for i in range(len(names)) for kind in REFLECTIONS}
+        for contact in find_contacts(degrees, orb=orb):
+            connections[(contact.source, contact.kind)].append(
+                {
+                    "planet": names[contact.target],
+                    "degree": round(degrees[contact.target], 2),
+                    "sign": signs[contact.target],
+                    "orb": round(contact.orb, 2),
+                }
+            )
 
-            results[planet1] = {
-                "original_degree": round(deg1, 2),
-                "original_sign": get_zodiac_sign(deg1),
-                "antiscia": {
-                    "degree": round(antiscia_deg, 2),
-                    "sign": get_zodiac_sign(antiscia_deg),
-                    "connections": sorted(
-                        antiscia_connections, key=lambda x: x["orb"]
-                    ),  # Orba göre sırala
-                },
-                "contra_antiscia": {
-                    "degree": round(contra_antiscia_deg, 2),
-                    "sign": get_zodiac_sign(contra_antiscia_deg),
-                    "connections": sorted(
-                        contra_antiscia_connections, key=lambda x: x["orb"]
-                    ),  # Orba göre sırala
-                },
+        results = {}
+        for i, planet in enumerate(names):
+            results[planet] = {
+                "original_degree": round(degrees[i], 2),
+                "original_sign": signs[i],
             }
+            for kind in REFLECTIONS:
+                point = reflect(degrees[i], kind)
+                results[planet][kind] = {
+                    "degree": round(point, 2),
+                    "sign": get_zodiac_sign(point),
+                    "connections": connections[(i, kind)],  # Orba göre sıralı
+                }
 
-            # logger.debug(f"{planet1} antiscia/contra-antiscia hesaplandı.")
-
-        logger.info(
+        logger.debug(
             f"Antiscia/Contra-antiscia hesaplaması tamamlandı ({len(results)} gezegen/nokta için)."
         )
         return results
@@ -2915,6 +2397,52 @@ def calculate_antiscia(natal_celestial_positions, orb=1.0):
         return {}
 
 
+def calculate_antiscia_contacts(positions, natal_positions, orb=1.0):
+    """Transit/progresyon noktalarının antiscia ve contra-antiscia yansımalarının natal noktalarla temaslarını döndürür.
+
+    Args:
+        positions (dict): Transit veya progresyon konumları
+        natal_positions (dict): Natal konumlar
+        orb (float): Maksimum tolerans derecesi (default 1°)
+
+    Returns:
+        list: Orba göre sıralı temas listesi
+    """
+    try:
+        from services.astro_antiscia import find_contacts
+
+        names, degrees = _valid_degrees(positions)
+        natal_names, natal_degrees = _valid_degrees(natal_positions)
+        contacts = [
+            {
+                "planet": names[c.source],
+                "natal_planet": natal_names[c.target],
+                "type": c.kind,
+                "degree": round(c.reflection, 2),
+                "sign": get_zodiac_sign(c.reflection),
+                "natal_degree": round(natal_degrees[c.target], 2),
+                "orb": round(c.orb, 2),
+            }
+            for c in find_contacts(degrees, natal_degrees, orb=orb)
+        ]
+        contacts.sort(key=lambda x: x["orb"])
+        return contacts
+
+    except Exception as e:
+        logger.error(f"Antiscia temas hesaplama hatası: {str(e)}", exc_info=True)
+        return []
+
+
+def _valid_degrees(positions):
+    """'degree' anahtarı olan konumların adları ve 0-360 boylamları"""
+    names, degrees = [], []
+    for name, data in (positions or {}).items():
+        if isinstance(data, dict) and "degree" in data:
+            names.append(name)
+            degrees.append(data["degree"] % 360)
+    return names, degrees
+
+
 # Dignity ve Debility skorlarının hesaplanması (Geleneksel yöneticilik, yücelim vb.)
 def calculate_dignity_scores(natal_planet_positions):
     """Gezegenlerin basit dignity (yönetim, yücelim) skorlarını hesaplar.
@@ -2943,24 +2471,8 @@ def calculate_dignity_scores(natal_planet_positions):
 
         # Helper to get sign degree
         def get_zodiac_sign_degree_value(sign_name):
-            zodiac_signs = [
-                "Koç",
-                "Boğa",
-                "İkizler",
-                "Yengeç",
-                "Aslan",
-                "Başak",
-                "Terazi",
-                "Akrep",
-                "Yay",
-                "Oğlak",
-                "Kova",
-                "Balık",
-            ]
-            try:
-                return zodiac_signs.index(sign_name) * 30
-            except ValueError:
-                return None
+            index = zodiac.index_of(sign_name)
+            return index * 30 if index is not None else None
 
         # Zarar (Detriment)
         detriment_signs = (
@@ -3058,20 +2570,7 @@ def calculate_dignity_scores(natal_planet_positions):
 def calculate_zodiac_sign_degree():
     """Burç derecelerini hesaplar ve döndürür."""
     try:
-        zodiac_signs = [
-            "Koç",
-            "Boğa",
-            "İkizler",
-            "Yengeç",
-            "Aslan",
-            "Başak",
-            "Terazi",
-            "Akrep",
-            "Yay",
-            "Oğlak",
-            "Kova",
-            "Balık",
-        ]
+        zodiac_signs = zodiac.SIGN_NAMES["tr"]
         zodiac_sign_degrees = {sign: i * 30 for i, sign in enumerate(zodiac_signs)}
         return zodiac_sign_degrees
     except Exception as e:
@@ -3098,109 +2597,34 @@ def calculate_detriment_signs():
 
 
 # Midpoint tekniklerinin hesaplanması
-def get_midpoint_aspects(natal_celestial_positions, orb=2.0):
+def get_midpoint_aspects(natal_celestial_positions, orb=2.0, dial=45.0, significant_only=True):
     """Natal haritadaki göksel cisim çiftlerinin midpointlerini ve bu midpointlerin
-    diğer göksel cisimlere olan açılarını hesaplar."""
+    diğer göksel cisimlere olan açılarını hesaplar.
+
+    Hesaplama services.astro_midpoints motorunda yapılır: midpointler bir kez
+    hesaplanıp seçilen kadrana (90°, 45° veya 22.5°) katlanır ve sıralı tarama ile
+    orb içindeki noktalar bulunur."""
     try:
-        ASPECT_WEIGHTS = {
-            "Conjunction/Opposition": 5,
-            "Square": 4,
-            "Sesquiquadrate": 3,
-            "Semisquare": 2,
-        }
+        from services.astro_midpoints import analyze_midpoints
 
-        # Sadece 'degree' anahtarı olan geçerli pozisyonları al
-        valid_positions = {
-            k: v
+        positions = {
+            k: v["degree"]
             for k, v in natal_celestial_positions.items()
             if isinstance(v, dict) and "degree" in v
         }
 
-        midpoint_results = {}  # Değişiklik: Liste yerine Dict kullanıyoruz
-
-        points_keys = list(valid_positions.keys())
-
-        for i in range(len(points_keys)):
-            for j in range(i + 1, len(points_keys)):  # Çiftleri tekrar etmeden al
-                p1_key = points_keys[i]
-                p2_key = points_keys[j]
-                deg1 = valid_positions[p1_key]["degree"] % 360
-                deg2 = valid_positions[p2_key]["degree"] % 360
-
-                # Midpoint hesaplama (kısa yay)
-                diff = abs(deg1 - deg2)
-                if diff > 180:
-                    midpoint_deg = (deg1 + deg2 + 360) / 2.0
-                else:
-                    midpoint_deg = (deg1 + deg2) / 2.0
-
-                midpoint_deg = midpoint_deg % 360
-                if midpoint_deg < 0:
-                    midpoint_deg += 360
-
-                midpoint_sign = get_zodiac_sign(midpoint_deg)
-                midpoint_deg_in_sign = get_degree_in_sign(midpoint_deg)
-
-                normalized_positions = calculate_normalized_positions(valid_positions)
-
-                # Bu midpointe diğer gezegen/noktaların açılarını kontrol et
-                aspects = []
-                for p3_key, deg3 in normalized_positions.items():
-                    if p3_key == p1_key or p3_key == p2_key:
-                        continue
-
-                    aspect_deg_diff = abs(midpoint_deg - deg3) % 180
-
-                    min_orb_found = float("inf")
-                    best_aspect_type = None
-
-                    # Basit kontrol
-                    if (
-                        abs(aspect_deg_diff - 0) <= orb
-                        or abs(aspect_deg_diff - 180) <= orb
-                    ):
-                        best_aspect_type = "Conjunction/Opposition"
-                        min_orb_found = (
-                            min(abs(aspect_deg_diff - 0), abs(aspect_deg_diff - 180))
-                            % 180
-                        )
-                    elif abs(aspect_deg_diff - 90) <= orb:
-                        best_aspect_type = "Square"
-                        min_orb_found = abs(aspect_deg_diff - 90)
-                    elif abs(aspect_deg_diff - 45) <= orb:
-                        best_aspect_type = "Semisquare"
-                        min_orb_found = abs(aspect_deg_diff - 45)
-                    elif abs(aspect_deg_diff - 135) <= orb:
-                        best_aspect_type = "Sesquiquadrate"
-                        min_orb_found = abs(aspect_deg_diff - 135)
-
-                    if best_aspect_type:
-                        aspects.append(
-                            {
-                                "celestial_body": p3_key,
-                                "aspect_type": best_aspect_type,
-                                "weight": ASPECT_WEIGHTS.get(best_aspect_type, 1),
-                                "orb": round(min_orb_found, 2),
-                            }
-                        )
-
-                # Sadece anlamlı açıları tut
-                filtered_aspects = [
-                    a
-                    for a in aspects
-                    if (a["weight"] >= 4 or (a["weight"] == 3 and a["orb"] <= 0.7))
-                ]
-
-                if filtered_aspects:
-                    combined_key = f"{p1_key}/{p2_key}"
-                    midpoint_results[combined_key] = {
-                        "degree": round(midpoint_deg, 2),
-                        "sign": midpoint_sign,
-                        "degree_in_sign": round(midpoint_deg_in_sign, 2),
-                        "aspects": sorted(filtered_aspects, key=lambda x: x["orb"]),
-                    }
+        midpoint_results = {}
+        for (p1_key, p2_key), (midpoint_deg, aspects) in analyze_midpoints(
+            positions, dial=dial, orb=orb, significant_only=significant_only
+        ).items():
+            midpoint_results[f"{p1_key}/{p2_key}"] = {
+                "degree": round(midpoint_deg, 2),
+                "sign": get_zodiac_sign(midpoint_deg),
+                "degree_in_sign": round(get_degree_in_sign(midpoint_deg), 2),
+                "aspects": aspects,
+            }
 
-        logger.info(
+        logger.debug(
             f"Midpoint hesaplamaları tamamlandı ({len(midpoint_results)} adet)."
         )
         return midpoint_results
@@ -3299,13 +2723,19 @@ def calculate_progressed_moon_phase(progressed_positions):
 
 # Azimuth ve Altitude hesaplaması (Belirli bir andaki göksel cisimlerin horizon üzerindeki pozisyonları)
 def calculate_azimuth_altitude_for_bodies(
-    dt_object, latitude, longitude, elevation_m, celestial_positions
+    dt_object, latitude, longitude, elevation_m, celestial_positions, refraction=True
 ):
     """Belirli bir datetime, konum ve yükseklik için göksel cisimlerin Azimuth ve Altitude (Ufuk) koordinatlarını hesaplar.
     celestial_positions: { "İsim": {"degree": X, "latitude": Y, "distance": Z} } formatında dict.
+
+    Yıldız zamanı ve eğiklik an başına bir kez hesaplanır (services.horizon);
+    tüm cisimler aynı rotasyonla dönüştürülür. refraction=True iken görünür
+    yükseklik calculate_refraction ile (1013.25 hPa, 15°C, gözlemci yüksekliği
+    elevation_m) düzeltilir; swe.azalt ile aynı model (ufuk alçalması dahil).
     """
     try:
-        logger.info("Göksel cisimlerin Azimuth ve Altitude hesaplanıyor...")
+        from services.horizon import HorizonFrame
+
         dt_utc = dt_object - timedelta(hours=3)  # Varsayım: UTC+3 Local -> UTC
         jd_ut = swe.julday(
             dt_utc.year,
@@ -3313,14 +2743,11 @@ def calculate_azimuth_altitude_for_bodies(
             dt_utc.day,
             dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0,
         )
-
-        geopos = [longitude, latitude, elevation_m]  # [boylam, enlem, yükseklik metre]
-
-        azalt_positions = {}
+        frame = HorizonFrame(jd_ut, latitude, longitude)
 
         # Sadece 'degree', 'latitude', 'distance' anahtarları olan geçerli pozisyonları al
-        valid_positions = {
-            k: v
+        bodies = {
+            k: (v["degree"], v["latitude"])
             for k, v in celestial_positions.items()
             if isinstance(v, dict)
             and "degree" in v
@@ -3328,72 +2755,21 @@ def calculate_azimuth_altitude_for_bodies(
             and "distance" in v
         }
 
-        for body_name, data in valid_positions.items():
-            try:
-                # Gezegenin ekliptik pozisyonunu kullan (lon, lat, dist)
-                # calculate_celestial_positions'tan gelen veriyi kullanabiliriz.
-                ecl_lon = data["degree"]
-                ecl_lat = data["latitude"]
-                ecl_dist = data["distance"]
-                ecl_coords = [ecl_lon, ecl_lat, ecl_dist]
-
-                # Ecliptic koordinatlardan Horizon koordinatlarına dönüştür (azimuth, altitude)
-                # swe.azalt(tjd_ut, SWE_ECL2HOR, geopos, atpress, attemp, xin)
-                # xin: [lon, lat, dist] from swe.calc_ut
-                # atpress, attemp: Atmosfer basıncı ve sıcaklığı, kırılma (refraction) için kullanılır. Varsayılan 0 kırılma yok.
-                # Kırılma dahil: atpress=1013.25 (deniz seviyesi), attemp=15 (Celsius)
-                atpress = 1013.25
-                attemp = 15.0
-                azalt_result = swe.azalt(
-                    jd_ut, swe.ECL2HOR, geopos, atpress, attemp, ecl_coords
-                )
-
-                # result: (azimuth, true_altitude, apparent_altitude)
-                if azalt_result and len(azalt_result) >= 3:
-                    azimuth = azalt_result[0]
-                    true_altitude = azalt_result[1]
-                    apparent_altitude = azalt_result[2]
-
-                    azalt_positions[body_name] = {
-                        "azimuth": round(
-                            azimuth, 2
-                        ),  # Kuzey 0, Doğu 90, Güney 180, Batı 270
-                        "true_altitude": round(
-                            true_altitude, 2
-                        ),  # Kırılma düzeltilmemiş
-                        "apparent_altitude": round(
-                            apparent_altitude, 2
-                        ),  # Kırılma düzeltilmiş
-                        "is_above_horizon": apparent_altitude
-                        > 0,  # Ufuk üzerinde mi? (Kırılma dahil)
-                    }
-                    # logger.debug(f"{body_name} Az/Alt: {azalt_positions[body_name]}")
-
-                else:
-                    logger.warning(f"{body_name} Azimuth/Altitude hesaplanamadı.")
-                    azalt_positions[body_name] = {
-                        "azimuth": None,
-                        "true_altitude": None,
-                        "apparent_altitude": None,
-                        "is_above_horizon": False,
-                        "error": "Calculation failed",
-                    }
+        def refract(altitude):
+            return calculate_refraction(altitude, geoalt=elevation_m or 0.0)
 
-            except Exception as e:
-                logger.error(
-                    f"{body_name} Azimuth/Altitude hesaplanırken hata: {str(e)}",
-                    exc_info=True,
-                )
-                azalt_positions[body_name] = {
-                    "azimuth": None,
-                    "true_altitude": None,
-                    "apparent_altitude": None,
-                    "is_above_horizon": False,
-                    "error": str(e),
-                }
-                continue
+        azalt_positions = {}
+        for body_name, position in frame.transform_all(
+            bodies, refract if refraction else None
+        ).items():
+            azalt_positions[body_name] = {
+                "azimuth": round(position.azimuth, 2),  # Güneyden batıya (Swiss Ephemeris)
+                "true_altitude": round(position.true_altitude, 2),  # Kırılma düzeltilmemiş
+                "apparent_altitude": round(position.apparent_altitude, 2),  # Kırılma düzeltilmiş
+                "is_above_horizon": position.apparent_altitude > 0,  # Ufuk üzerinde mi? (Kırılma dahil)
+            }
 
-        logger.info(
+        logger.debug(
             f"Azimuth ve Altitude hesaplamaları tamamlandı ({len(azalt_positions)} cisim için)."
         )
         return azalt_positions
@@ -3406,8 +2782,12 @@ def calculate_azimuth_altitude_for_bodies(
         return {}
 
 
+# swe.azalt'ın kullandığı standart atmosfer sıcaklık düşüş oranı (K/m)
+REFRACTION_LAPSE_RATE = 0.0065
+
+
 # Refraction hesaplaması (Yardımcı fonksiyon, doğrudan kullanılmayabilir)
-def calculate_refraction(altitude, atpress=1013.25, attemp=15.0, flag=True):
+def calculate_refraction(altitude, atpress=1013.25, attemp=15.0, flag=True, geoalt=None):
     """Calculate refraction correction.
 
     Args:
@@ -3415,6 +2795,9 @@ def calculate_refraction(altitude, atpress=1013.25, attemp=15.0, flag=True):
         atpress (float): Atmospheric pressure in mbar/hPa
         attemp (float): Atmospheric temperature in Celsius
         flag (bool): True for true->apparent, False for apparent->true
+        geoalt (float): Observer height above sea level in meters. When given,
+            the extended model used by swe.azalt is applied (dip of the horizon,
+            standard lapse rate).
 
     Returns:
         float: Converted altitude in degrees
@@ -3424,6 +2807,16 @@ def calculate_refraction(altitude, atpress=1013.25, attemp=15.0, flag=True):
         if not isinstance(altitude, (int, float)):
             return None
 
+        if geoalt is not None:
+            return swe.refrac_extended(
+                float(altitude),
+                float(geoalt),
+                float(atpress),
+                float(attemp),
+                REFRACTION_LAPSE_RATE,
+                swe.TRUE_TO_APP if flag else swe.APP_TO_TRUE,
+            )[0]
+
         return swe.refrac(
             float(altitude),
             float(atpress),
@@ -3778,6 +3171,9 @@ def calculate_astro_data(
         # 1.7 Natal Sabit Yıldızlar
         natal_fixed_stars = calculate_fixed_stars(birth_dt)
         result["natal_fixed_stars"] = natal_fixed_stars
+        result["natal_fixed_star_conjunctions"] = calculate_fixed_star_conjunctions(
+            birth_dt, all_natal_celestial_positions
+        )
 
         # 1.8 Natal Antiscia ve Contra-antiscia
         natal_antiscia = calculate_antiscia(all_natal_celestial_positions)
@@ -3832,18 +3228,19 @@ def calculate_astro_data(
         natal_midpoint_analysis = get_midpoint_aspects(all_natal_celestial_positions)
         result["natal_midpoint_analysis"] = natal_midpoint_analysis
 
-        # 1.15 Natal Harmonik Analiz
-        deep_harmonic_analysis = calculate_deep_harmonic_analysis(
-            birth_dt, all_natal_celestial_positions
-        )
-        result["deep_harmonic_analysis"] = deep_harmonic_analysis
-        result["navamsa_chart"] = deep_harmonic_analysis.get("H9", {})
+        # 1.15 Natal Harmonik Analiz (harita başına tek matris; navamsa = H9)
+        result.update(calculate_harmonic_data(birth_dt, all_natal_celestial_positions))
 
         # 1.16 Natal Vimshottari Dasa
-        if natal_planet_positions.get("Moon"):
-            natal_moon_degree = natal_planet_positions["Moon"].get("degree")
-            vimshottari_dasa = get_vimshottari_dasa(birth_dt, natal_moon_degree)
-            result["vimshottari_dasa"] = vimshottari_dasa
+        # Sınırlar (statik) natal ile, mevcut periyotlar (tarihe bağlı) transit
+        # tarihine göre günlük veriyle saklanır.
+        natal_moon_degree = (natal_planet_positions.get("Moon") or {}).get("degree")
+        if natal_moon_degree is not None:
+            vimshottari_timeline = get_vimshottari_timeline(birth_dt, natal_moon_degree)
+            result["vimshottari_timeline"] = vimshottari_timeline.to_dict()
+            result["vimshottari_dasa"] = get_vimshottari_dasa(
+                birth_dt, natal_moon_degree, now=transit_dt, timeline=vimshottari_timeline
+            )
         else:
             result["vimshottari_dasa"] = {
                 "error": "Ay pozisyonu eksik, Vimshottari Dasa hesaplanamadı."
@@ -3896,8 +3293,12 @@ def calculate_astro_data(
                 result["transit_positions"], result["natal_planet_positions"]
             )
             result["transit_to_natal_aspects"] = transit_to_natal_aspects
+            result["transit_to_natal_antiscia"] = calculate_antiscia_contacts(
+                result["transit_positions"], all_natal_celestial_positions
+            )
         else:
             result["transit_to_natal_aspects"] = []
+            result["transit_to_natal_antiscia"] = []
 
         #####################################################
         # 3. PROGRESYON HESAPLAMALARI
@@ -3909,6 +3310,10 @@ def calculate_astro_data(
             birth_dt, transit_dt, latitude, longitude, natal_planet_positions
         )
         result.update(progression_data)
+        result["progressed_to_natal_antiscia"] = calculate_antiscia_contacts(
+            progression_data.get("secondary_progressions", {}),
+            all_natal_celestial_positions,
+        )
 
         logger.info("3. PROGRESYON HESAPLAMALARI TAMAMLANDI")
 
@@ -3931,15 +3336,7 @@ def calculate_astro_data(
 
         logger.info("4. RETURN HARITA HESAPLAMALARI TAMAMLANDI")
 
-        #####################################################
-        # 5. HARMONİK ANALİZLER
-        #####################################################
-        logger.info("5. HARMONİK ANALİZLER BAŞLIYOR")
-
-        harmonic_data = calculate_harmonic_data(birth_dt, all_natal_celestial_positions)
-        result.update(harmonic_data)
-
-        logger.info("5. HARMONİK ANALİZLER TAMAMLANDI")
+        # 5. Harmonik analizler natal bölümde (1.15) bir kez hesaplanır.
 
         #####################################################
         # 6. EK HESAPLAMALAR
@@ -4298,7 +3695,11 @@ def calculate_progression_data(
 
 
 def calculate_harmonic_data(birth_dt, natal_celestial_positions):
-    """Harmonik analizler (çoklu harmonik haritalar ve navamsa) eksiksiz döndürülür."""
+    """Harmonik analizler (çoklu harmonik haritalar ve navamsa) eksiksiz döndürülür.
+
+    Tam set bilerek üretilir: deep_harmonic_analysis natal önbelleğe yazılır ve
+    harmonik yorum sekmesinde AI'a gönderilir.
+    """
     try:
         deep_harmonic_analysis = calculate_deep_harmonic_analysis(
             birth_dt, natal_celestial_positions
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Parashari varga (bölünmüş harita) motoru.
+
+Her varga için burç başına bölüm -> varga burcu tablosu modül yüklenirken bir
+kez kurulur (12 × N). Bir noktanın varga burcu, burç indeksi ve bölüm
+numarasıyla tek tablo erişimidir; batı harmoniği (boylam · N) yerine BPHS'teki
+başlangıç burcu kuralları (tek/çift, hareketli/sabit/değişken, element)
+uygulanır. Eşit olmayan bölümlü D30 (Trimsamsa) için tablo 1° çözünürlükle
+tutulur (bölüm sınırları tam derecelerdedir).
+
+Boylamlar haritanın kendi zodyağında (bu projede tropikal) kullanılır.
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from services import zodiac
+
+# Burç indeksleri
+ARIES, TAURUS, GEMINI, CANCER, LEO, VIRGO = range(6)
+LIBRA, SCORPIO, SAGITTARIUS, CAPRICORN, AQUARIUS, PISCES = range(6, 12)
+
+
+def _is_odd(sign: int) -> bool:
+    """Tek burç (Koç, İkizler, ...) = 0 tabanlı çift indeks"""
+    return sign % 2 == 0
+
+
+def _by_modality(cardinal: int, fixed: int, mutable: int) -> Callable[[int], int]:
+    starts = (cardinal, fixed, mutable)
+    return lambda sign: starts[zodiac.SIGNS[sign].modality]
+
+
+def _by_element(fire: int, earth: int, air: int, water: int) -> Callable[[int], int]:
+    starts = (fire, earth, air, water)
+    return lambda sign: starts[zodiac.SIGNS[sign].element]
+
+
+def _by_parity(odd: int, even: int) -> Callable[[int], int]:
+    return lambda sign: odd if _is_odd(sign) else even
+
+
+def _relative(odd_offset: int, even_offset: int) -> Callable[[int], int]:
+    """Burcun kendisinden (veya çift burçta n. burçtan) başla"""
+    return lambda sign: (sign + (odd_offset if _is_odd(sign) else even_offset)) % 12
+
+
+# Varga -> bölüm sayısı, başlangıç kuralı, bölümden bölüme burç adımı
+# (adım 1: ardışık burçlar; D3'te 4 = 1./5./9. burç, D4'te 3 = 1./4./7./10. burç)
+_EQUAL_RULES: Dict[int, Tuple[Callable[[int], int], int]] = {
+    1: (_relative(0, 0), 1),
+    3: (_relative(0, 0), 4),
+    4: (_relative(0, 0), 3),
+    7: (_relative(0, 6), 1),
+    9: (_by_element(ARIES, CAPRICORN, LIBRA, CANCER), 1),
+    10: (_relative(0, 8), 1),
+    12: (_relative(0, 0), 1),
+    16: (_by_modality(ARIES, LEO, SAGITTARIUS), 1),
+    20: (_by_modality(ARIES, SAGITTARIUS, LEO), 1),
+    24: (_by_parity(LEO, CANCER), 1),
+    27: (_by_element(ARIES, CANCER, LIBRA, CAPRICORN), 1),
+    40: (_by_parity(ARIES, LIBRA), 1),
+    45: (_by_modality(ARIES, LEO, SAGITTARIUS), 1),
+    60: (_relative(0, 0), 1),
+}
+
+# Hora: tek burçta 1. yarı Güneş (Aslan), 2. yarı Ay (Yengeç); çift burçta tersi
+_HORA = {True: (LEO, CANCER), False: (CANCER, LEO)}
+
+# Trimsamsa: (bölüm sonu derecesi, burç) - tek ve çift burçlar için
+_TRIMSAMSA = {
+    True: ((5, ARIES), (10, AQUARIUS), (18, SAGITTARIUS), (25, GEMINI), (30, LIBRA)),
+    False: ((5, TAURUS), (12, VIRGO), (20, PISCES), (25, CAPRICORN), (30, SCORPIO)),
+}
+
+
+class _Part(NamedTuple):
+    sign: int  # varga burcu
+    start: float  # bölümün burç içindeki başlangıcı
+    width: float  # bölüm genişliği
+
+
+def _build_tables() -> Dict[int, Tuple[Tuple[_Part, ...], ...]]:
+    """varga -> [burç][bölüm] -> _Part (D30 için bölüm = tam derece)"""
+    tables = {}
+    for division, (start_rule, step) in _EQUAL_RULES.items():
+        width = 30.0 / division
+        tables[division] = tuple(
+            tuple(_Part((start_rule(sign) + part * step) % 12, part * width, width) for part in range(division))
+            for sign in range(12)
+        )
+    tables[2] = tuple(
+        tuple(_Part(_HORA[_is_odd(sign)][part], part * 15.0, 15.0) for part in range(2))
+        for sign in range(12)
+    )
+    trimsamsa = []
+    for sign in range(12):
+        row, start = [], 0
+        for end, varga_sign in _TRIMSAMSA[_is_odd(sign)]:
+            row.extend(_Part(varga_sign, float(start), float(end - start)) for _ in range(start, end))
+            start = end
+        trimsamsa.append(tuple(row))
+    tables[30] = tuple(trimsamsa)
+    return tables
+
+
+VARGA_TABLES = _build_tables()
+VARGAS = tuple(sorted(VARGA_TABLES))
+
+# D30 tablosu derece başına bir satır tutar; diğerleri bölüm başına
+_RESOLUTION = {division: len(rows[0]) for division, rows in VARGA_TABLES.items()}
+
+
+def varga_part(longitude: float, division: int) -> _Part:
+    """Boylamın varga bölümü (tek tablo erişimi)"""
+    sign = int(longitude % 360 // 30) % 12
+    resolution = _RESOLUTION[division]
+    part = min(int(longitude % 30 * resolution / 30.0), resolution - 1)
+    return VARGA_TABLES[division][sign][part]
+
+
+def varga_sign(longitude: float, division: int) -> int:
+    return varga_part(longitude, division).sign
+
+
+def varga_longitude(longitude: float, division: int) -> float:
+    """Varga haritasındaki boylam: varga burcu + bölüm içi konumun 30°'ye ölçeklenmesi"""
+    part = varga_part(longitude, division)
+    return part.sign * 30 + max((longitude % 30 - part.start) * 30.0 / part.width, 0.0)
+
+
+def varga_chart(positions: dict, division: int) -> Dict[str, dict]:
+    """{isim: {degree, sign, degree_in_sign}} - harmonik haritayla aynı biçim"""
+    sign_names = zodiac.SIGN_NAMES[zodiac.DEFAULT_LANG]
+    table = VARGA_TABLES[division]
+    last = _RESOLUTION[division] - 1
+    scale = _RESOLUTION[division] / 30.0
+    chart = {}
+    for name, data in positions.items():
+        if not (isinstance(data, dict) and "degree" in data):
+            continue
+        lon = data["degree"]
+        in_sign = lon % 30
+        part = table[int(lon % 360 // 30) % 12][min(int(in_sign * scale), last)]
+        offset = max((in_sign - part.start) * 30.0 / part.width, 0.0)
+        chart[name] = {
+            "degree": round(part.sign * 30 + offset, 2),
+            "sign": sign_names[part.sign],
+            "degree_in_sign": round(offset, 2),
+        }
+    return chart
+
+
+def calculate_vargas(positions: dict, divisions: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, dict]]:
+    """İstenen (varsayılan: tüm) vargalar için haritalar"""
+    return {division: varga_chart(positions, division) for division in (divisions or VARGAS)}
@@ -32,12 +32,19 @@ def _get_db():
     return None
 
 
+# Natal çıktıların şema sürümü. Natal kayıtlar sonsuza kadar saklandığından
+# NATAL_KEYS altındaki bir alanın formatı/hesabı değiştiğinde artırılır;
+# eski kayıtlar yeni anahtarla eşleşmez ve bir kez yeniden hesaplanır.
+# 2: varga 'method' alanı, sabit yıldız kavuşumları, vimshottari zaman çizelgesi
+NATAL_SCHEMA_VERSION = 2
+
+
 def _make_natal_key(birth_date: str, birth_time: str, lat: float, lon: float) -> str:
     """
     Doğum bilgilerinden benzersiz hash oluştur.
     Aynı kişi = aynı hash → aynı natal chart → tek hesaplama.
     """
-    raw = f"{birth_date}|{birth_time}|{round(float(lat), 4)}|{round(float(lon), 4)}"
+    raw = f"v{NATAL_SCHEMA_VERSION}|{birth_date}|{birth_time}|{round(float(lat), 4)}|{round(float(lon), 4)}"
     return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
@@ -67,6 +74,7 @@ NATAL_KEYS = [
     "natal_aspects",
     "natal_azimuth_altitude",
     "natal_fixed_stars",
+    "natal_fixed_star_conjunctions",
     "natal_antiscia",
     "natal_dignity_scores",
     "natal_part_of_fortune",
@@ -76,7 +84,7 @@ NATAL_KEYS = [
     "natal_midpoint_analysis",
     "deep_harmonic_analysis",
     "navamsa_chart",
-    "vimshottari_dasa",
+    "vimshottari_timeline",
     "firdaria_periods",
     "natal_summary_interpretation",
     "eclipses_nearby_birth",
@@ -92,6 +100,7 @@ TRANSIT_KEYS = [
     "transit_aspects",
     "transit_azimuth_altitude",
     "transit_to_natal_aspects",
+    "transit_to_natal_antiscia",
     "eclipses_nearby_current",
 ]
 
@@ -102,8 +111,10 @@ DYNAMIC_KEYS = [
     "secondary_progressions",
     "progressed_houses",
     "progressed_aspects",
+    "progressed_to_natal_antiscia",
     "progressed_moon_phase",
     "solar_arc_progressions",
+    "vimshottari_dasa",
     "solar_return_chart",
     "lunar_return_chart",
 ]
@@ -173,39 +184,56 @@ def _reassemble_data(stored: dict, keys: list) -> dict:
     return result
 
 
+def _stored_fragments(stored: dict, keys: list) -> list:
+    """
+    Firestore'daki JSON string alanlari cozmeden (anahtar, Fragment) listesine cevir.
+    String olmayan eski kayitlar oldugu gibi birakilir (compose tekrar serilestirir).
+    """
+    from services.json_response import Fragment
+
+    return [
+        (key, Fragment.of(stored[key]) if isinstance(stored[key], str) else stored[key])
+        for key in keys
+        if key in stored
+    ]
+
+
 # ═══════════════════════════════════════════════════════════════
 # ANA FONKSİYONLAR
 # ═══════════════════════════════════════════════════════════════
 
-def get_natal_chart(birth_date: str, birth_time: str, lat: float, lon: float) -> Optional[dict]:
-    """
-    Firestore'dan saklı natal chart verisini getir.
-    
-    Returns:
-        dict veya None (bulunamazsa)
-    """
+def _read_natal_doc(natal_key: str) -> Optional[dict]:
+    """natal_charts/<natal_key> dokumanini ham haliyle (JSON string alanlar) oku"""
     db = _get_db()
     if not db:
         logger.debug("[ChartDB] Firestore bağlantısı yok, natal cache atlanıyor")
         return None
-    
-    natal_key = _make_natal_key(birth_date, birth_time, lat, lon)
-    
+
     try:
         doc = db.collection("natal_charts").document(natal_key).get()
         if doc.exists:
-            stored = doc.to_dict() or {}
-            natal_data = _reassemble_data(stored, NATAL_KEYS)
             logger.info(f"[ChartDB] ✅ Natal chart CACHE HIT: {natal_key}")
-            return natal_data
-        else:
-            logger.debug(f"[ChartDB] Natal chart bulunamadı: {natal_key}")
-            return None
+            return doc.to_dict() or {}
+        logger.debug(f"[ChartDB] Natal chart bulunamadı: {natal_key}")
+        return None
     except Exception as e:
         logger.error(f"[ChartDB] Natal chart okuma hatası: {e}")
         return None
 
 
+def get_natal_chart(birth_date: str, birth_time: str, lat: float, lon: float) -> Optional[dict]:
+    """
+    Firestore'dan saklı natal chart verisini getir.
+    
+    Returns:
+        dict veya None (bulunamazsa)
+    """
+    stored = _read_natal_doc(_make_natal_key(birth_date, birth_time, lat, lon))
+    if stored is None:
+        return None
+    return _reassemble_data(stored, NATAL_KEYS)
+
+
 def save_natal_chart(birth_date: str, birth_time: str, lat: float, lon: float, 
                      astro_data: dict) -> bool:
     """
@@ -250,21 +278,14 @@ def save_natal_chart(birth_date: str, birth_time: str, lat: float, lon: float,
         return False
 
 
-def get_daily_transit(transit_date: str, lat: float, lon: float,
-                      birth_date: str, birth_time: str) -> Optional[dict]:
-    """
-    Günlük transit verisini Firestore'dan getir.
-    Transit + Progresyon + Return verilerini içerir.
-    
-    Key, natal bilgiyi de içerir çünkü transit_to_natal_aspects natal'e bağlıdır.
-    """
+def _read_transit_doc(natal_key: str, transit_date: str) -> Optional[dict]:
+    """daily_transits/<natal_key>_<tarih> dokumanini ham haliyle oku (tarihi tutmuyorsa None)"""
     db = _get_db()
     if not db:
         return None
-    
-    natal_key = _make_natal_key(birth_date, birth_time, lat, lon)
+
     transit_key = f"{natal_key}_{transit_date}"
-    
+
     try:
         doc = db.collection("daily_transits").document(transit_key).get()
         if doc.exists:
@@ -276,10 +297,8 @@ def get_daily_transit(transit_date: str, lat: float, lon: float,
                 logger.debug(f"[ChartDB] Transit verisi eski: {stored_date} != {transit_date}")
                 return None
             
-            all_dynamic_keys = TRANSIT_KEYS + DYNAMIC_KEYS
-            transit_data = _reassemble_data(stored, all_dynamic_keys)
             logger.info(f"[ChartDB] ✅ Transit CACHE HIT: {transit_key}")
-            return transit_data
+            return stored
         else:
             logger.debug(f"[ChartDB] Transit bulunamadı: {transit_key}")
             return None
@@ -288,6 +307,20 @@ def get_daily_transit(transit_date: str, lat: float, lon: float,
         return None
 
 
+def get_daily_transit(transit_date: str, lat: float, lon: float,
+                      birth_date: str, birth_time: str) -> Optional[dict]:
+    """
+    Günlük transit verisini Firestore'dan getir.
+    Transit + Progresyon + Return verilerini içerir.
+    
+    Key, natal bilgiyi de içerir çünkü transit_to_natal_aspects natal'e bağlıdır.
+    """
+    stored = _read_transit_doc(_make_natal_key(birth_date, birth_time, lat, lon), transit_date)
+    if stored is None:
+        return None
+    return _reassemble_data(stored, TRANSIT_KEYS + DYNAMIC_KEYS)
+
+
 def save_daily_transit(transit_date: str, lat: float, lon: float,
                        birth_date: str, birth_time: str, 
                        astro_data: dict) -> bool:
@@ -409,6 +442,38 @@ def smart_calculate(birth_date, birth_time, latitude, longitude,
     return astro_data
 
 
+def get_cached_chart_body(birth_date, birth_time, latitude, longitude,
+                          transit_info=None) -> Optional[Tuple[bytes, str]]:
+    """
+    Tam cache hit'te smart_calculate sonucunun JSON govdesini dondur.
+    
+    Firestore'daki JSON string alanlar cozulmeden govdeye eklenir
+    (json.loads + yeniden serilestirme yok). Ikinci deger, ayni govdenin
+    sikistirilmis kopyasinin anahtaridir. Natal veya gunun transiti eksikse None.
+    """
+    from services.json_response import compose
+
+    if transit_info and transit_info.get("date"):
+        transit_date_str = transit_info["date"]
+    else:
+        transit_date_str = datetime.now().strftime("%Y-%m-%d")
+
+    natal_key = _make_natal_key(str(birth_date), str(birth_time), float(latitude), float(longitude))
+    stored_natal = _read_natal_doc(natal_key)
+    if not stored_natal:
+        return None
+    stored_transit = _read_transit_doc(natal_key, transit_date_str)
+    if not stored_transit:
+        return None
+
+    logger.info(f"[ChartDB] ⚡ FULL CACHE HIT - JSON parçaları çözülmeden yanıtlanıyor")
+    items = dict(_stored_fragments(stored_natal, NATAL_KEYS))
+    items.update(_stored_fragments(stored_transit, TRANSIT_KEYS + DYNAMIC_KEYS))
+    items["_cache_status"] = "full_hit"
+    items["_natal_key"] = natal_key
+    return compose(items.items()), f"chart:{natal_key}_{transit_date_str}"
+
+
 def cleanup_old_transits(days_old: int = 7) -> int:
     """
     Eski transit verilerini temizle (opsiyonel bakım fonksiyonu).
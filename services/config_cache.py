@@ -0,0 +1,145 @@
+"""
+ORBIS Config Cache
+- Firestore config/* dokumanlarini (ai_settings, pricing) process basina bir kez yukler
+- Redis varsa veri + versiyon sayaci worker'lar arasi paylasilir
+- Admin yazinca invalidate() versiyonu arttirir, tum worker'lar ~2sn icinde yeniler
+- Sicak yolda Firestore okumasi yok: sadece arada bir Redis versiyon kontrolu
+"""
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CONFIG_COLLECTION = "config"
+VERSION_CHECK_INTERVAL = 2  # saniye - Redis versiyon sayacini bu siklikta kontrol et
+LOCAL_TTL = 60  # saniye - Redis yoksa diger worker'lar eski davranistaki gibi dakikada bir yeniler
+
+
+class ConfigCache:
+    """config/<name> dokumanlari icin paylasilan cache"""
+
+    DATA_KEY = "config_cache:data:"
+    VERSION_KEY = "config_cache:version:"
+
+    def __init__(self, redis_client=None, use_redis: bool = True):
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self._data: Dict[str, dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def redis(self):
+        if not self._use_redis:
+            return None
+        if self._redis is None:
+            from services.redis_client import get_redis
+            self._redis = get_redis()
+        return self._redis
+
+    # ─── Kaynaklar ──────────────────────────────────────────────
+
+    @staticmethod
+    def _load_from_firestore(name: str) -> Optional[dict]:
+        """Firestore'dan dokumani oku. Dokuman yoksa {} (negatif cache), hata/DB yoksa None."""
+        try:
+            from services.firebase_service import firebase_service
+            db = firebase_service.db
+            if not db:
+                return None
+            doc = db.collection(CONFIG_COLLECTION).document(name).get()
+            data = doc.to_dict() if doc.exists else {}
+            logger.info(f"[ConfigCache] {name} Firestore'dan yuklendi ({'var' if data else 'yok'})")
+            return data or {}
+        except Exception as e:
+            logger.error(f"[ConfigCache] {name} Firestore okuma hatasi: {e}")
+            return None
+
+    def _remote_version(self, name: str) -> int:
+        try:
+            return int(self.redis.get(self.VERSION_KEY + name) or 0)
+        except Exception as e:
+            logger.warning(f"[ConfigCache] Versiyon okunamadi ({name}): {e}")
+            return self._versions.get(name, 0)
+
+    def _load_shared(self, name: str, version: int) -> Optional[dict]:
+        """Redis'teki paylasilan kopyayi oku; yoksa Firestore'dan yukleyip Redis'e yaz.
+
+        Kopya yuklendigi versiyonla birlikte saklanir; invalidate ile yarisan
+        bir worker'in eski veriyi geri yazmasi boylece okuyanlari etkilemez.
+        """
+        try:
+            raw = self.redis.get(self.DATA_KEY + name)
+            if raw is not None:
+                payload = json.loads(raw)
+                if payload.get("v") == version:
+                    return payload.get("data", {})
+        except Exception as e:
+            logger.warning(f"[ConfigCache] Redis okuma hatasi ({name}): {e}")
+
+        data = self._load_from_firestore(name)
+        if data is not None:
+            try:
+                self.redis.set(self.DATA_KEY + name, json.dumps({"v": version, "data": data}, default=str))
+            except Exception as e:
+                logger.warning(f"[ConfigCache] Redis yazma hatasi ({name}): {e}")
+        return data
+
+    # ─── Public API ─────────────────────────────────────────────
+
+    def get(self, name: str) -> dict:
+        """config/<name> verisini dondur (bulunamazsa {})"""
+        now = time.time()
+        cached = self._data.get(name)
+
+        if self.redis is None:
+            if cached is not None and (now - self._loaded_at.get(name, 0)) < LOCAL_TTL:
+                return cached
+            with self._lock:
+                data = self._load_from_firestore(name)
+                if data is None:
+                    return cached or {}
+                self._data[name] = data
+                self._loaded_at[name] = now
+                return data
+
+        if cached is not None and (now - self._checked_at.get(name, 0)) < VERSION_CHECK_INTERVAL:
+            return cached
+
+        with self._lock:
+            version = self._remote_version(name)
+            self._checked_at[name] = now
+            if cached is not None and version == self._versions.get(name):
+                return cached
+            data = self._load_shared(name, version)
+            if data is None:
+                return cached or {}
+            self._data[name] = data
+            self._versions[name] = version
+            self._loaded_at[name] = now
+            return data
+
+    def invalidate(self, name: str):
+        """Admin yazimindan sonra cagrilir: tum worker'larin kopyasini gecersiz kilar"""
+        with self._lock:
+            self._data.pop(name, None)
+            self._checked_at.pop(name, None)
+            self._loaded_at.pop(name, None)
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self.DATA_KEY + name)
+            pipe.incr(self.VERSION_KEY + name)
+            pipe.execute()
+            logger.info(f"[ConfigCache] {name} gecersiz kilindi")
+        except Exception as e:
+            logger.error(f"[ConfigCache] Invalidate hatasi ({name}): {e}")
+
+
+config_cache = ConfigCache()
@@ -0,0 +1,144 @@
+"""
+ORBIS Counter Buffer
+- Istek yolunda Firestore yazimi yok: sayac artislari process icinde biriktirilir
+- Arka plan thread'i birkac saniyede bir birikenleri TEK birlesik yazimla flush eder
+- Flush basarisiz olursa deltalar kaybolmaz, bir sonraki flush'a geri eklenir
+- Worker kapanirken kalanlar flush edilir: atexit ve gunicorn.conf.py'deki
+  worker_exit / worker_abort kancalari shutdown_all() cagirir
+"""
+import os
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = float(os.getenv("STATS_FLUSH_INTERVAL", "5"))  # saniye
+
+# (toplam deltalar, {gun: {field: delta}}, son-yazan-kazanir alanlar)
+Batch = Tuple[Dict[str, int], Dict[str, Dict[str, int]], Dict[str, object]]
+
+
+class CounterBuffer:
+    """Sayac deltalarini biriktirip periyodik olarak flush_fn'e veren tampon.
+
+    flush_fn(totals, daily, fields) tek bir birlesik yazim yapmali; hata
+    firlatirsa batch tampona geri eklenir. Thread ilk kullanimda baslar ve
+    gunicorn fork sonrasi (pid degisince) yeniden kurulur.
+    """
+
+    def __init__(self, flush_fn: Callable[[Dict[str, int], Dict[str, Dict[str, int]], Dict[str, object]], None],
+                 interval: float = FLUSH_INTERVAL):
+        self._flush_fn = flush_fn
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._totals: Dict[str, int] = {}
+        self._daily: Dict[str, Dict[str, int]] = {}
+        self._fields: Dict[str, object] = {}
+        self._pid = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ─── Biriktirme ─────────────────────────────────────────────
+
+    def add(self, field: str, amount: int = 1):
+        with self._lock:
+            self._totals[field] = self._totals.get(field, 0) + amount
+        self._ensure_thread()
+
+    def add_daily(self, field: str, amount: int = 1, day: Optional[str] = None):
+        """Gunluk sayac: delta olustugu gune yazilir (gece yarisi devri flush'a bagli degil)"""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        with self._lock:
+            bucket = self._daily.setdefault(day, {})
+            bucket[field] = bucket.get(field, 0) + amount
+        self._ensure_thread()
+
+    def set_field(self, field: str, value):
+        """Sayac olmayan, son degerin gecerli oldugu alanlar (orn. last_login_*)"""
+        with self._lock:
+            self._fields[field] = value
+        self._ensure_thread()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._totals or self._daily or self._fields)
+
+    # ─── Flush ──────────────────────────────────────────────────
+
+    def _drain(self) -> Batch:
+        with self._lock:
+            batch = (self._totals, self._daily, self._fields)
+            self._totals, self._daily, self._fields = {}, {}, {}
+        return batch
+
+    def _restore(self, batch: Batch):
+        totals, daily, fields = batch
+        with self._lock:
+            for field, amount in totals.items():
+                self._totals[field] = self._totals.get(field, 0) + amount
+            for day, counters in daily.items():
+                bucket = self._daily.setdefault(day, {})
+                for field, amount in counters.items():
+                    bucket[field] = bucket.get(field, 0) + amount
+            for field, value in fields.items():
+                self._fields.setdefault(field, value)  # daha yeni deger varsa o kalir
+
+    def flush(self) -> bool:
+        """Birikenleri yaz. Bos ise yazim yapmaz. Basarisizsa False (deltalar korunur)."""
+        with self._flush_lock:
+            totals, daily, fields = batch = self._drain()
+            totals = {k: v for k, v in totals.items() if v}
+            if not (totals or daily or fields):
+                return True
+            try:
+                self._flush_fn(totals, daily, fields)
+                return True
+            except Exception as e:
+                logger.error(f"[CounterBuffer] Flush hatasi, deltalar sonraki flush'a kaldi: {e}")
+                self._restore(batch)
+                return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="counter-buffer", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        """Worker kapanisi: thread'i durdur ve kalanlari flush et"""
+        self._stop.set()
+        if self._pid == os.getpid():
+            self.flush()
+
+
+_buffers = []
+
+
+def register(buffer: CounterBuffer) -> CounterBuffer:
+    """Kapanista flush edilecek tamponlara ekle"""
+    _buffers.append(buffer)
+    return buffer
+
+
+def shutdown_all():
+    for buffer in _buffers:
+        try:
+            buffer.shutdown()
+        except Exception as e:
+            logger.error(f"[CounterBuffer] Kapanis flush hatasi: {e}")
+
+
+atexit.register(shutdown_all)
@@ -18,6 +18,9 @@ from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Sahibi bilinmeyen tek geçersiz token için taranacak en fazla kullanıcı dokümanı
+INVALID_TOKEN_SCAN_LIMIT = 500
+
 
 class FirebaseService:
     """Firebase Admin SDK wrapper for ORBIS"""
@@ -100,7 +103,8 @@ class FirebaseService:
         title: str,
         body: str,
         data: Optional[Dict[str, str]] = None,
-        image_url: Optional[str] = None
+        image_url: Optional[str] = None,
+        uid: Optional[str] = None
     ) -> Optional[str]:
         """
         Tek bir cihaza push notification gönder
@@ -111,6 +115,7 @@ class FirebaseService:
             body: Bildirim içeriği
             data: Ek veri (opsiyonel)
             image_url: Bildirim görseli (opsiyonel)
+            uid: Token sahibi (biliniyorsa geçersiz token temizliği tek doküman okur)
         
         Returns:
             Message ID veya None (hata durumunda)
@@ -169,7 +174,7 @@ class FirebaseService:
         except messaging.UnregisteredError:
             logger.warning(f"[Firebase] Token geçersiz, siliniyor: {token[:20]}...")
             # Token'ı veritabanından sil
-            self._remove_invalid_token(token)
+            self._remove_invalid_token(token, uid)
             return None
 
         except Exception as e:
@@ -184,39 +189,17 @@ class FirebaseService:
         data: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
-        Birden fazla cihaza push notification gönder
+        Birden fazla cihaza push notification gönder.
+        500'lük parçalar, paralel gönderim, kota retry ve toplu token temizliği
+        services.push_fanout motoruyla yapılır. Sahibi bilinmeyen geçersiz
+        token'lar için tarama INVALID_TOKEN_SCAN_LIMIT dokümanla sınırlıdır.
         
         Returns:
-            {success_count, failure_count, responses}
+            {success_count, failure_count, retries, invalid_tokens, ...}
         """
-        try:
-            message = messaging.MulticastMessage(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
-                data=data or {},
-                tokens=tokens
-            )
-            
-            response = messaging.send_each_for_multicast(message)
-            
-            # Başarısız token'ları temizle
-            if response.failure_count > 0:
-                for idx, resp in enumerate(response.responses):
-                    if not resp.success:
-                        if isinstance(resp.exception, messaging.UnregisteredError):
-                            self._remove_invalid_token(tokens[idx])
-            
-            return {
-                'success_count': response.success_count,
-                'failure_count': response.failure_count,
-                'responses': response.responses
-            }
-            
-        except Exception as e:
-            logger.error(f"[Firebase] Multicast hatası: {e}")
-            return {'success_count': 0, 'failure_count': len(tokens), 'error': str(e)}
+        from services.push_fanout import push_fanout
+        return push_fanout.send(tokens, title, body, data, log=False,
+                                scan_limit=INVALID_TOKEN_SCAN_LIMIT)
     
     def send_push_to_topic(
         self,
@@ -301,49 +284,36 @@ class FirebaseService:
                     'updatedAt': datetime.utcnow().isoformat()
                 }])
             })
+            from services.token_registry import token_registry
+            token_registry.invalidate(user_id)
             return True
         except Exception as e:
             logger.error(f"[Firebase] Token kaydetme hatası: {e}")
             return False
 
     def get_user_tokens(self, user_id: str) -> List[str]:
-        """Kullanıcının tüm FCM token'larını getir"""
+        """Kullanıcının tüm FCM token'larını getir (services.token_registry cache'i üzerinden)"""
         if not self.db:
             return []
 
         try:
-            doc = self.db.collection('users').document(user_id).get()
-            if doc.exists:
-                data = doc.to_dict()
-                tokens = data.get('fcmTokens', [])
-                return [t['token'] for t in tokens if isinstance(t, dict)]
-            return []
+            from services.token_registry import token_registry
+            return token_registry.get(user_id)
         except Exception as e:
             logger.error(f"[Firebase] Token getirme hatası: {e}")
             return []
     
-    def _remove_invalid_token(self, token: str):
+    def _remove_invalid_token(self, token: str, uid: Optional[str] = None):
         """Geçersiz token'ı users koleksiyonundan sil.
-        Firestore `array_contains` obje eşleştirme desteği yok — doc read + filter
-        yaklaşımı kullanılır. ArrayRemove partial obje eşleştirmediği için elle filtrele."""
+        Sahibi (uid veya token_registry cache'i) biliniyorsa sadece o doküman okunur;
+        bilinmiyorsa tarama INVALID_TOKEN_SCAN_LIMIT dokümanla sınırlıdır."""
         if not self.db:
             return
 
         try:
-            # Tüm kullanıcıları tara (N+1 yavaş ama doğru; ölçeklenebilir hale getirmek
-            # için fcmTokens yapısı {token: {...}} map'e taşınmalı — bkz. plan notu).
-            batch = 0
-            for doc in self.db.collection('users').limit(500).stream():
-                data = doc.to_dict() or {}
-                tokens = data.get('fcmTokens', [])
-                if not isinstance(tokens, list) or not tokens:
-                    continue
-                filtered = [t for t in tokens if not (isinstance(t, dict) and t.get('token') == token)]
-                if len(filtered) != len(tokens):
-                    self.db.collection('users').document(doc.id).update({'fcmTokens': filtered})
-                    batch += 1
-            if batch:
-                logger.info(f"[Firebase] {batch} kullanıcıdan stale token silindi: {token[:20]}…")
+            from services.push_fanout import remove_tokens
+            remove_tokens(self.db, [token], owners={token: uid} if uid else None,
+                          scan_limit=INVALID_TOKEN_SCAN_LIMIT)
         except Exception as e:
             logger.error(f"[Firebase] Token silme hatası: {e}")
     
@@ -0,0 +1,99 @@
+"""
+ORBIS Firestore Pagination
+- offset() yerine start_after(snapshot) cursor sayfalama: atlanan dokumanlar
+  okunmaz/faturalanmaz (offset ile 100. sayfa = 5000 read)
+- Sayfa token'i opak (base64url JSON); istemci sadece geri gonderir
+- Bozuk token veya silinmis cursor dokumani InvalidPageToken firlatir: sessizce
+  ilk sayfaya donmek istemciye tekrar eden satirlar verirdi
+- Toplam sayilar count() aggregation ile alinir ve COUNT_TTL boyunca cache'lenir
+"""
+import os
+import json
+import time
+import base64
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COUNT_TTL = int(os.getenv("ADMIN_COUNT_TTL", "300"))  # saniye
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPageToken(ValueError):
+    """Sayfa token'i cozulemedi veya isaret ettigi dokuman artik yok"""
+
+
+def encode_page_token(doc_id: str) -> str:
+    raw = json.dumps({"id": doc_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_page_token(token: Optional[str]) -> Optional[str]:
+    """Token'dan dokuman id'si; bos/bozuk token -> None"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        return json.loads(raw).get("id")
+    except (ValueError, AttributeError):
+        logger.warning("[Pagination] Gecersiz sayfa token'i")
+        return None
+
+
+def paginate(query, collection_ref, limit: int, page_token: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """Sorgunun bir sayfasini dondur: (dokumanlar, sonraki_sayfa_token'i | None).
+
+    Token gecersizse veya cursor dokumani silinmisse InvalidPageToken.
+
+    query: siralamasi belirlenmis Firestore sorgusu (order_by yoksa dokuman id sirasi)
+    collection_ref: token'daki dokumanin snapshot'ini almak icin koleksiyon
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if page_token:
+        cursor_id = decode_page_token(page_token)
+        if not cursor_id:
+            raise InvalidPageToken("Sayfa token'i gecersiz")
+        snapshot = collection_ref.document(cursor_id).get()
+        if not snapshot.exists:
+            raise InvalidPageToken(f"Cursor dokumani bulunamadi: {cursor_id}")
+        query = query.start_after(snapshot)
+    docs = list(query.limit(limit + 1).stream())
+    next_token = encode_page_token(docs[limit - 1].id) if len(docs) > limit else None
+    return docs[:limit], next_token
+
+
+class CountCache:
+    """count() aggregation sonuclari icin TTL cache (anahtar -> (zaman, deger))"""
+
+    def __init__(self, ttl: int = COUNT_TTL):
+        self.ttl = ttl
+        self._values: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, count_fn: Callable[[], int]) -> int:
+        now = time.time()
+        with self._lock:
+            cached = self._values.get(key)
+            if cached and now - cached[0] < self.ttl:
+                return cached[1]
+        value = count_fn()
+        with self._lock:
+            self._values[key] = (now, value)
+        return value
+
+    def invalidate(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+def aggregate_count(query) -> int:
+    """Firestore count() aggregation (dokumanlari okumadan)"""
+    return query.count().get()[0][0].value
+
+
+count_cache = CountCache()
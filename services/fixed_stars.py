@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Sabit yıldız kataloğu.
+
+- sefstars.txt bir kez okunur; yıldız adı -> (Bayer adı, parlaklık) indeksi
+  bellekte tutulur. Swiss Ephemeris'e ad araması yerine ",<Bayer>" anahtarı verilir.
+- Sabit yıldızlar ~72 yılda 1° ilerler: her yıl için tüm yıldızların 1 Ocak ve
+  sonraki 1 Ocak konumları bir kez hesaplanıp tabloya alınır, aradaki anlar
+  doğrusal interpolasyonla bulunur (hata < 0.01°; yıllık aberasyon kaynaklı).
+- Kavuşum araması: yıldız boylamları sıralı dizide tutulur, her natal nokta için
+  orb penceresi ikili arama ile bulunur.
+"""
+
+import os
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import swisseph as swe
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_FILE = "sefstars.txt"
+YEAR_TABLE_CACHE = 128
+DEFAULT_CONJUNCTION_ORB = 1.0
+
+# Haritada raporlanan yıldızlar (tekrarsız; eski listedeki "Formalhaut" = Fomalhaut)
+STAR_NAMES = (
+    "Aldebaran", "Antares", "Regulus", "Spica", "Sirius", "Vega", "Fomalhaut",
+    "Pollux", "Castor", "Procyon", "Algol", "Deneb_Algedi", "Scheat", "Markab",
+    "Capella", "Rigel", "Betelgeuse", "Bellatrix", "Alnilam", "Alnitak", "Saiph",
+    "Polaris", "Kochab", "Alcyone", "Asellus_Borealis", "Asellus_Australis",
+    "Acubens", "Canopus", "Miaplacidus", "Suhail", "Avior", "Wezen", "Aludra",
+    "Alphard", "Alphecca", "Unukalhai", "Rasalhague", "Shaula", "Lesath",
+    "Kaus_Australis", "Nunki", "Ascella", "Deneb_Adige", "Sador", "Albireo",
+    "Altair", "Algedi", "Nashira", "Sadalmelek", "Sadal_Suud",
+)
+
+
+class CatalogueEntry(NamedTuple):
+    name: str
+    nomenclature: str
+    magnitude: Optional[float]
+
+
+class StarPosition(NamedTuple):
+    name: str
+    longitude: float  # 0-360
+    latitude: float
+    magnitude: Optional[float]
+
+
+def normalize_name(name: str) -> str:
+    return name.lower().replace(" ", "").replace("_", "")
+
+
+def parse_catalogue(path: str) -> Dict[str, CatalogueEntry]:
+    """sefstars.txt satırlarını ad -> kayıt indeksine çevir (ilk kayıt geçerli)"""
+    index: Dict[str, CatalogueEntry] = {}
+    with open(path, "r", encoding="latin-1") as f:
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            fields = [field.strip() for field in line.split(",")]
+            if len(fields) < 14 or not fields[0]:
+                continue
+            try:
+                magnitude = float(fields[13])
+            except ValueError:
+                magnitude = None
+            index.setdefault(normalize_name(fields[0]), CatalogueEntry(fields[0], fields[1], magnitude))
+    return index
+
+
+def _interpolate(start: float, end: float, fraction: float) -> float:
+    """360° sarmasını dikkate alarak boylam interpolasyonu"""
+    delta = (end - start + 180) % 360 - 180
+    return (start + delta * fraction) % 360
+
+
+class StarCatalogue:
+    """Yıllık konum tablosu + sıralı boylam dizisi ile yıldız konumları ve kavuşumlar"""
+
+    def __init__(self, names: Tuple[str, ...] = STAR_NAMES, catalogue_path: Optional[str] = None):
+        self.names = names
+        self._catalogue_path = catalogue_path
+        self._stars: Optional[List[Tuple[str, str, Optional[float]]]] = None  # (ad, swe anahtarı, parlaklık)
+        self._lock = threading.Lock()
+        self._year_table = lru_cache(maxsize=YEAR_TABLE_CACHE)(self._build_year_table)
+
+    def _catalogue(self) -> Dict[str, CatalogueEntry]:
+        path = self._catalogue_path
+        if path is None:
+            from services.astro_service import SWISSEPH_DATA_DIR, ensure_ephe_file
+            path = os.path.join(SWISSEPH_DATA_DIR, CATALOGUE_FILE)
+            ensure_ephe_file(CATALOGUE_FILE)
+        try:
+            return parse_catalogue(path)
+        except OSError as e:
+            logger.warning(f"[FixedStars] Katalog okunamadı ({path}): {e}")
+            return {}
+
+    def stars(self) -> List[Tuple[str, str, Optional[float]]]:
+        """Çözümlenmiş yıldız listesi (ilk çağrıda bir kez kurulur)"""
+        if self._stars is None:
+            with self._lock:
+                if self._stars is None:
+                    catalogue = self._catalogue()
+                    stars = []
+                    for name in self.names:
+                        entry = catalogue.get(normalize_name(name))
+                        if entry is not None and entry.nomenclature:
+                            stars.append((name, f",{entry.nomenclature}", entry.magnitude))
+                        else:
+                            stars.append((name, name.lower(), None))
+                    self._stars = stars
+        return self._stars
+
+    def _positions_at(self, jd_ut: float) -> Dict[str, Tuple[float, float]]:
+        positions = {}
+        for name, key, _ in self.stars():
+            try:
+                pos = swe.fixstar_ut(key, jd_ut, swe.FLG_SWIEPH)[0]
+            except swe.Error as e:
+                logger.debug(f"Sabit yıldız {name} hesaplanırken Swisseph hatası: {str(e)}")
+                continue
+            positions[name] = (pos[0] % 360, pos[1])
+        return positions
+
+    def _build_year_table(self, year: int) -> Tuple[Tuple[Tuple[str, float, float, float, float, Optional[float]], ...], float, float]:
+        """Yılın başı ve sonundaki konumlar: ((ad, boy0, enl0, boy1, enl1, parlaklık), ...), jd0, jd1"""
+        jd0 = swe.julday(year, 1, 1, 0.0)
+        jd1 = swe.julday(year + 1, 1, 1, 0.0)
+        start, end = self._positions_at(jd0), self._positions_at(jd1)
+        rows = tuple(
+            (name, *start[name], *end[name], magnitude)
+            for name, _, magnitude in self.stars()
+            if name in start and name in end
+        )
+        return rows, jd0, jd1
+
+    def positions(self, jd_ut: float) -> List[StarPosition]:
+        """Verilen andaki tüm yıldız konumları (yıllık tablodan interpolasyon)"""
+        year = swe.revjul(jd_ut)[0]
+        rows, jd0, jd1 = self._year_table(year)
+        fraction = (jd_ut - jd0) / (jd1 - jd0)
+        return [
+            StarPosition(name, _interpolate(lon0, lon1, fraction), lat0 + (lat1 - lat0) * fraction, magnitude)
+            for name, lon0, lat0, lon1, lat1, magnitude in rows
+        ]
+
+    def conjunctions(self, jd_ut: float, points: Dict[str, float],
+                     orb: float = DEFAULT_CONJUNCTION_ORB) -> List[dict]:
+        """Natal noktalarla orb içindeki yıldız kavuşumları, orb'a göre sıralı"""
+        stars = sorted(self.positions(jd_ut), key=lambda s: s.longitude)
+        if not stars:
+            return []
+        # ±360 kopyalarla sarma: 359° yıldız 0.5° noktayla kavuşabilir
+        ring = [(s.longitude - 360, s) for s in stars] + [(s.longitude, s) for s in stars] + \
+            [(s.longitude + 360, s) for s in stars]
+        ring_degs = [deg for deg, _ in ring]
+
+        hits = []
+        for point, degree in points.items():
+            degree %= 360
+            lo = bisect_left(ring_degs, degree - orb)
+            hi = bisect_right(ring_degs, degree + orb)
+            for star_deg, star in ring[lo:hi]:
+                hits.append({
+                    "star": star.name,
+                    "point": point,
+                    "orb": round(abs(star_deg - degree), 2),
+                    "star_degree": round(star.longitude, 2),
+                    "magnitude": star.magnitude,
+                })
+        hits.sort(key=lambda h: h["orb"])
+        return hits
+
+
+star_catalogue = StarCatalogue()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Ufuk (azimut/yükseklik) koordinat dönüşümleri.
+
+Bir an ve konum için gerçek ekliptik eğikliği ve yerel görünür yıldız zamanı
+bir kez hesaplanır; ekliptik -> ekvator -> ufuk dönüşümleri tek bir 3×3
+rotasyon matrisinde birleştirilir. Her cisim için dönüşüm bir matris-vektör
+çarpımıdır (swe.azalt ile aynı sonuç, cisim başına C çağrısı yok).
+
+Azimut, Swiss Ephemeris kuralındadır: güney noktasından batıya doğru ölçülür.
+
+Yükseklik zaman serileri (doğuş/batış, görünürlük eğrileri) için yıldız zamanı
+sabit hızla, cismin boylam ve enlemi günlük hızlarıyla doğrusal ilerletilir;
+anlık başına Swiss Ephemeris çağrısı gerekmez.
+"""
+
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+# Yıldız zamanının güneş gününe göre ilerleme hızı (derece / gün)
+SIDEREAL_RATE = 360.98564736629
+
+Refraction = Callable[[float], Optional[float]]
+
+
+class HorizonPosition(NamedTuple):
+    azimuth: float  # güneyden batıya (swe.azalt ile aynı)
+    true_altitude: float  # kırılmasız
+    apparent_altitude: float  # kırılma modeli verilmişse düzeltilmiş, yoksa true_altitude
+
+
+def true_obliquity(jd_ut: float) -> float:
+    return swe.calc_ut(jd_ut, swe.ECL_NUT)[0][0]
+
+
+def local_sidereal_degrees(jd_ut: float, longitude: float) -> float:
+    """Yerel görünür yıldız zamanı (derece)"""
+    return (swe.sidtime(jd_ut) * 15.0 + longitude) % 360
+
+
+def _rotation(obliquity: float, sidereal: float, latitude: float) -> Tuple[Tuple[float, float, float], ...]:
+    """Ekliptik birim vektörü -> (yukarı, güney, batı) bileşenleri"""
+    se, ce = math.sin(math.radians(obliquity)), math.cos(math.radians(obliquity))
+    ss, cs = math.sin(math.radians(sidereal)), math.cos(math.radians(sidereal))
+    sp, cp = math.sin(math.radians(latitude)), math.cos(math.radians(latitude))
+    # ufuk = H(yıldız zamanı, enlem) · E(eğiklik); E'nin ilk sütunu (1, 0, 0)
+    return (
+        (cp * cs, cp * ss * ce + sp * se, -cp * ss * se + sp * ce),
+        (sp * cs, sp * ss * ce - cp * se, -sp * ss * se - cp * ce),
+        (ss, -cs * ce, cs * se),
+    )
+
+
+def _apply(matrix, lon: float, lat: float) -> Tuple[float, float]:
+    """(azimut, yükseklik) derece"""
+    lam, beta = math.radians(lon), math.radians(lat)
+    cb = math.cos(beta)
+    x, y, z = cb * math.cos(lam), cb * math.sin(lam), math.sin(beta)
+    up = matrix[0][0] * x + matrix[0][1] * y + matrix[0][2] * z
+    south = matrix[1][0] * x + matrix[1][1] * y + matrix[1][2] * z
+    west = matrix[2][0] * x + matrix[2][1] * y + matrix[2][2] * z
+    altitude = math.degrees(math.asin(max(-1.0, min(1.0, up))))
+    return math.degrees(math.atan2(west, south)) % 360, altitude
+
+
+class HorizonFrame:
+    """Tek an + konum için hazırlanmış ekliptik -> ufuk rotasyonu"""
+
+    def __init__(self, jd_ut: float, latitude: float, longitude: float,
+                 obliquity: Optional[float] = None):
+        self.jd_ut = jd_ut
+        self.obliquity = true_obliquity(jd_ut) if obliquity is None else obliquity
+        self.sidereal = local_sidereal_degrees(jd_ut, longitude)
+        self.matrix = _rotation(self.obliquity, self.sidereal, latitude)
+
+    def transform(self, lon: float, lat: float = 0.0,
+                  refraction: Optional[Refraction] = None) -> HorizonPosition:
+        azimuth, altitude = _apply(self.matrix, lon, lat)
+        apparent = refraction(altitude) if refraction else None
+        return HorizonPosition(azimuth, altitude, altitude if apparent is None else apparent)
+
+    def transform_all(self, bodies: Dict[str, Tuple[float, float]],
+                      refraction: Optional[Refraction] = None) -> Dict[str, HorizonPosition]:
+        """{isim: (ekliptik boylam, enlem)} -> {isim: HorizonPosition}"""
+        return {name: self.transform(lon, lat, refraction) for name, (lon, lat) in bodies.items()}
+
+
+def altitude_series(jds: Sequence[float], latitude: float, longitude: float,
+                    ecl_lon: float, ecl_lat: float = 0.0, speed: float = 0.0,
+                    lat_speed: float = 0.0, epoch: Optional[float] = None,
+                    refraction: Optional[Refraction] = None) -> List[float]:
+    """Verilen anlarda cismin yüksekliği.
+
+    Yıldız zamanı ve eğiklik epoch anında (varsayılan: ilk an) bir kez
+    hesaplanır; boylam ve enlem epoch'tan itibaren günlük hızlarıyla (speed,
+    lat_speed) ilerletilir.
+    Gün ölçeğindeki pencereler için yeterince doğrudur.
+    """
+    if not jds:
+        return []
+    epoch = jds[0] if epoch is None else epoch
+    obliquity = true_obliquity(epoch)
+    sidereal0 = local_sidereal_degrees(epoch, longitude)
+
+    altitudes = []
+    for jd in jds:
+        dt = jd - epoch
+        matrix = _rotation(obliquity, sidereal0 + SIDEREAL_RATE * dt, latitude)
+        altitude = _apply(matrix, ecl_lon + speed * dt, ecl_lat + lat_speed * dt)[1]
+        if refraction:
+            apparent = refraction(altitude)
+            altitude = altitude if apparent is None else apparent
+        altitudes.append(altitude)
+    return altitudes
+
+
+def horizon_crossings(jds: Sequence[float], altitudes: Sequence[float],
+                      threshold: float = 0.0) -> List[Tuple[float, str]]:
+    """Yükseklik serisinin eşik geçişleri: (doğrusal interpolasyonlu JD, "rise"/"set")"""
+    crossings = []
+    for i in range(1, min(len(jds), len(altitudes))):
+        before, after = altitudes[i - 1] - threshold, altitudes[i] - threshold
+        if (before < 0) != (after < 0):
+            fraction = before / (before - after)
+            crossings.append((jds[i - 1] + (jds[i] - jds[i - 1]) * fraction, "rise" if after >= 0 else "set"))
+    return crossings
@@ -0,0 +1,232 @@
+"""
+ORBIS JSON Response
+- orjson kuruluysa hizli encoder (datetime/date/time yerel destekli), yoksa stdlib json
+- Onceden serilestirilmis JSON parcalari (Fragment) cozulmeden govdeye eklenir
+- gzip / brotli (brotli kuruluysa) icerik pazarligi; sikistirilmis kopya
+  govde anahtariyla Redis'te (binary client, yoksa process belleginde) saklanir
+- OrjsonProvider: jsonify ve Jinja |tojson ayni hizli encoder'i kullanir;
+  datetime her yolda ISO 8601 (Firestore DatetimeWithNanoseconds dahil)
+"""
+import gzip
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Any, Iterable, NamedTuple, Optional, Tuple
+
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MIN_COMPRESS_SIZE = 1024  # byte - daha kucuk govdeler sikistirilmaz
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSED_TTL = 86400  # saniye - gunluk transit verisiyle ayni omur
+COMPRESSED_LOCAL_MAX = 128
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Tercih sirasina gore desteklenen Content-Encoding degerleri"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+# ─── Serilestirme ───────────────────────────────────────────────
+
+def _default(obj: Any) -> Any:
+    """Encoder'in tanimadigi tipler (ensure_json_serializable ile ayni kural)"""
+    if isinstance(obj, (datetime, date, dt_time)):
+        return obj.isoformat()
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """obj -> UTF-8 JSON byte dizisi"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except (orjson.JSONEncodeError, TypeError):
+            pass  # 64 bit disi tamsayi vb. - stdlib'e dus
+    return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def loads(data) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """JSON'a donusturulebilir kopya (datetime -> ISO string, bilinmeyen tip -> str)"""
+    return loads(dumps(obj))
+
+
+class Fragment(NamedTuple):
+    """Cozulmeden govdeye eklenecek, zaten JSON olan deger"""
+    raw: bytes
+
+    @classmethod
+    def of(cls, value) -> "Fragment":
+        return cls(value.encode("utf-8") if isinstance(value, str) else value)
+
+
+def compose(items: Iterable[Tuple[str, Any]]) -> bytes:
+    """(anahtar, deger) ciftlerinden JSON nesnesi; Fragment degerler oldugu gibi eklenir"""
+    parts = []
+    for key, value in items:
+        encoded = value.raw if isinstance(value, Fragment) else dumps(value)
+        parts.append(dumps(str(key)) + b":" + encoded)
+    return b"{" + b",".join(parts) + b"}"
+
+
+# ─── Sikistirma ─────────────────────────────────────────────────
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding basligindan desteklenen en iyi kodlama (q=0 olanlar haric)"""
+    accepted = {}
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Desteklenmeyen kodlama: {encoding}")
+
+
+class CompressedStore:
+    """Sikistirilmis govde kopyalari: Redis varsa paylasilan, yoksa process ici LRU"""
+
+    KEY = "json_body:"
+
+    def __init__(self, redis_client=None, use_redis: bool = True,
+                 ttl: int = COMPRESSED_TTL, max_size: int = COMPRESSED_LOCAL_MAX):
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self.ttl = ttl
+        self.max_size = max_size
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def redis(self):
+        if not self._use_redis:
+            return None
+        if self._redis is None:
+            # sikistirilmis veri UTF-8 degil; decode eden get_redis() kullanilamaz
+            from services.redis_client import get_redis_binary
+            self._redis = get_redis_binary()
+        return self._redis
+
+    def get(self, key: str) -> Optional[bytes]:
+        if self.redis is not None:
+            try:
+                return self.redis.get(self.KEY + key)
+            except Exception as e:
+                logger.warning(f"[JSONResponse] Redis okuma hatasi ({key}): {e}")
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[0] < time.time():
+                self._local.pop(key, None)
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.redis is not None:
+            try:
+                self.redis.set(self.KEY + key, data, ex=self.ttl)
+                return
+            except Exception as e:
+                logger.warning(f"[JSONResponse] Redis yazma hatasi ({key}): {e}")
+        with self._lock:
+            self._local[key] = (time.time() + self.ttl, data)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def compressed(self, key: str, body: bytes, encoding: str) -> bytes:
+        """key + kodlama icin saklanan kopya; yoksa sikistirip sakla"""
+        store_key = f"{key}:{encoding}"
+        data = self.get(store_key)
+        if data is None:
+            data = compress(body, encoding)
+            self.put(store_key, data)
+        return data
+
+
+def json_response(body: bytes, status: int = 200, cache_key: Optional[str] = None) -> Response:
+    """JSON govdesini istemcinin kabul ettigi kodlamayla dondur.
+
+    cache_key verilirse sikistirilmis kopya compressed_store'dan okunur/yazilir;
+    anahtar ayni govdeyi tanimlamali (orn. natal + transit tarihi).
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = negotiate(request.headers.get("Accept-Encoding")) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding:
+        body = compressed_store.compressed(cache_key, body, encoding) if cache_key else compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, status=status, mimetype="application/json", headers=headers)
+
+
+# ─── Flask entegrasyonu ─────────────────────────────────────────
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify / |tojson icin orjson; desteklenmeyen secenekte Flask varsayilani.
+
+    orjson datetime alt siniflarini (Firestore DatetimeWithNanoseconds) default'a
+    birakir; Flask'in default'u bunlari RFC 822'ye cevirirdi. Tarihler burada
+    yakalandigindan her yolda ISO 8601 cikar; diger tipler Flask kuralinda kalir.
+    """
+
+    @staticmethod
+    def default(obj: Any) -> Any:
+        if isinstance(obj, (datetime, date, dt_time)):
+            return obj.isoformat()
+        return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs.get("cls") or kwargs.get("indent"):
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except (orjson.JSONEncodeError, TypeError):
+            return super().dumps(obj, **kwargs)
+
+
+compressed_store = CompressedStore()
@@ -0,0 +1,250 @@
+"""
+ORBIS Presence
+- Heartbeat'ler Firestore'a her seferinde yazilmaz; last-seen Redis sorted set'te
+  (skor = unix zamani) tutulur: "son N dakikada online" sorgusu ZRANGEBYSCORE, O(log n + m)
+- Redis yoksa process ici siralı liste (bisect) yedegi kullanilir
+- Firestore stats_heartbeats koleksiyonuna sadece PERSIST_INTERVAL'da bir,
+  degisen kullanicilar icin batch yazimla kalici kopya birakilir
+"""
+import os
+import time
+import atexit
+import bisect
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_COLLECTION = "stats_heartbeats"
+PERSIST_INTERVAL = float(os.getenv("PRESENCE_PERSIST_INTERVAL", "300"))  # saniye
+RETENTION = 24 * 3600  # bundan eski last-seen kayitlari bellekten/Redis'ten atilir
+FIRESTORE_BATCH_LIMIT = 500
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def _heartbeat_key(email: str) -> str:
+    return email.replace("@", "_at_").replace(".", "_dot_")
+
+
+# ═══════════════════════════════════════════════════════════════
+# STORES
+# ═══════════════════════════════════════════════════════════════
+
+class InMemoryPresenceStore:
+    """Tek process icin last-seen deposu (Redis yoksa / gelistirme)"""
+
+    def __init__(self):
+        self._seen: Dict[str, Tuple[float, str]] = {}
+        self._index: List[Tuple[float, str]] = []  # (ts, email) sirali
+        self._lock = threading.Lock()
+
+    def touch(self, email: str, display_name: str, ts: float):
+        with self._lock:
+            old = self._seen.get(email)
+            if old:
+                i = bisect.bisect_left(self._index, (old[0], email))
+                if i < len(self._index) and self._index[i] == (old[0], email):
+                    del self._index[i]
+            self._seen[email] = (ts, display_name)
+            bisect.insort(self._index, (ts, email))
+
+    def since(self, cutoff: float) -> List[dict]:
+        with self._lock:
+            start = bisect.bisect_left(self._index, (cutoff, ""))
+            return [
+                {"email": email, "display_name": self._seen[email][1], "last_seen": _iso(ts)}
+                for ts, email in reversed(self._index[start:])
+            ]
+
+    def count_since(self, cutoff: float) -> int:
+        with self._lock:
+            return len(self._index) - bisect.bisect_left(self._index, (cutoff, ""))
+
+    def prune(self, cutoff: float):
+        with self._lock:
+            end = bisect.bisect_left(self._index, (cutoff, ""))
+            for _, email in self._index[:end]:
+                self._seen.pop(email, None)
+            del self._index[:end]
+
+
+class RedisPresenceStore:
+    """Worker'lar arasi paylasilan last-seen: ZSET (email -> ts) + HASH (email -> ad)"""
+
+    SEEN_KEY = "presence:last_seen"
+    NAMES_KEY = "presence:names"
+
+    def __init__(self, client):
+        self.client = client
+
+    def touch(self, email: str, display_name: str, ts: float):
+        pipe = self.client.pipeline()
+        pipe.zadd(self.SEEN_KEY, {email: ts})
+        pipe.hset(self.NAMES_KEY, email, display_name)
+        pipe.execute()
+
+    def since(self, cutoff: float) -> List[dict]:
+        rows = self.client.zrevrangebyscore(self.SEEN_KEY, "+inf", cutoff, withscores=True)
+        if not rows:
+            return []
+        names = self.client.hmget(self.NAMES_KEY, [email for email, _ in rows])
+        return [
+            {"email": email, "display_name": name or email, "last_seen": _iso(ts)}
+            for (email, ts), name in zip(rows, names)
+        ]
+
+    def count_since(self, cutoff: float) -> int:
+        return self.client.zcount(self.SEEN_KEY, cutoff, "+inf")
+
+    def prune(self, cutoff: float):
+        stale = self.client.zrangebyscore(self.SEEN_KEY, "-inf", f"({cutoff}")
+        if stale:
+            pipe = self.client.pipeline()
+            pipe.zrem(self.SEEN_KEY, *stale)
+            pipe.hdel(self.NAMES_KEY, *stale)
+            pipe.execute()
+
+
+# ═══════════════════════════════════════════════════════════════
+# TRACKER
+# ═══════════════════════════════════════════════════════════════
+
+class PresenceTracker:
+    """Heartbeat -> store; degisen kayitlar periyodik olarak Firestore'a batch yazilir.
+
+    Persist thread'i ilk heartbeat'te baslar, gunicorn fork sonrasi (pid
+    degisince) yeniden kurulur; worker kapanirken kalanlar yazilir.
+    """
+
+    def __init__(self, store=None, db=None, persist_interval: float = PERSIST_INTERVAL):
+        self._store = store
+        self._db = db
+        self.persist_interval = persist_interval
+        self._dirty: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._stop = threading.Event()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from services.redis_client import get_redis
+            client = get_redis()
+            self._store = RedisPresenceStore(client) if client is not None else InMemoryPresenceStore()
+        return self._store
+
+    @property
+    def shared(self) -> bool:
+        """Store tum worker'lari goruyor mu (Redis)"""
+        return isinstance(self.store, RedisPresenceStore)
+
+    @property
+    def db(self):
+        if self._db is None:
+            from services.firebase_service import firebase_service
+            self._db = firebase_service.db
+        return self._db
+
+    def heartbeat(self, email: str, display_name: str, ts: Optional[float] = None):
+        ts = ts or time.time()
+        display_name = display_name or email
+        try:
+            self.store.touch(email, display_name, ts)
+        except Exception as e:
+            logger.error(f"[Presence] store error: {e}")
+        with self._lock:
+            self._dirty[email] = (ts, display_name)
+        self._ensure_thread()
+
+    def online(self, within_minutes: int = 5) -> List[dict]:
+        """Son N dakikada heartbeat atan kullanicilar (en yeni once)"""
+        cutoff = time.time() - within_minutes * 60
+        try:
+            users = self.store.since(cutoff)
+        except Exception as e:
+            logger.error(f"[Presence] store read error: {e}")
+            users = []
+        if self.shared:
+            return users
+        # In-memory store sadece bu worker'i gorur: diger worker'larin
+        # kalici kopyasini (PERSIST_INTERVAL gecikmeli) da ekle
+        merged = {u["email"]: u for u in self._persisted_since(cutoff)}
+        for u in users:
+            current = merged.get(u["email"])
+            if not current or current["last_seen"] < u["last_seen"]:
+                merged[u["email"]] = u
+        return sorted(merged.values(), key=lambda u: u["last_seen"], reverse=True)
+
+    def _persisted_since(self, cutoff: float) -> List[dict]:
+        if not self.db:
+            return []
+        try:
+            from google.cloud.firestore_v1.base_query import FieldFilter
+            docs = (self.db.collection(HEARTBEAT_COLLECTION)
+                    .where(filter=FieldFilter("last_seen", ">=", _iso(cutoff)))
+                    .stream())
+            return [
+                {"email": d.get("email"), "display_name": d.get("display_name"), "last_seen": d.get("last_seen", "")}
+                for d in (doc.to_dict() or {} for doc in docs)
+            ]
+        except Exception as e:
+            logger.error(f"[Presence] Firestore read error: {e}")
+            return []
+
+    # ─── Kalici kopya ───────────────────────────────────────────
+
+    def persist(self) -> int:
+        """Degisen kayitlari Firestore'a batch'ler halinde yaz; yazilan kayit sayisi"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        if not dirty or not self.db:
+            return 0
+        items = list(dirty.items())
+        written = 0
+        try:
+            for i in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+                batch = self.db.batch()
+                for email, (ts, name) in items[i:i + FIRESTORE_BATCH_LIMIT]:
+                    ref = self.db.collection(HEARTBEAT_COLLECTION).document(_heartbeat_key(email))
+                    # ⚠️ SERVER_TIMESTAMP kullanma - last_seen ISO string ile filtreleniyor
+                    batch.set(ref, {"email": email, "display_name": name, "last_seen": _iso(ts)})
+                batch.commit()
+                written += len(items[i:i + FIRESTORE_BATCH_LIMIT])
+        except Exception as e:
+            logger.error(f"[Presence] persist error: {e}")
+            with self._lock:
+                for email, value in items[written:]:
+                    self._dirty.setdefault(email, value)
+        try:
+            self.store.prune(time.time() - RETENTION)
+        except Exception as e:
+            logger.warning(f"[Presence] prune error: {e}")
+        return written
+
+    def _run(self):
+        while not self._stop.wait(self.persist_interval):
+            self.persist()
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            threading.Thread(target=self._run, name="presence-persist", daemon=True).start()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._pid == os.getpid():
+            self.persist()
+
+
+presence_tracker = PresenceTracker()
+atexit.register(presence_tracker.shutdown)
@@ -0,0 +1,301 @@
+"""
+ORBIS Daily Push Campaign
+- Gunluk kisisel push mesajlari icin toplu AI uretimi
+- Kullanicilar ortak harita ozelligine (gunes burcu) gore gruplanir,
+  her grup icin TEK AI yorumu uretilir (kullanici basina degil)
+- Uretim provider'lar arasi sinirli eszamanlilikla yapilir
+- Ilerleme Firestore push_campaigns/{id} dokumanina yazilir: yarida kalan
+  kampanya ayni id ile tekrar baslatilinca uretilmis/gonderilmis gruplari atlar
+- Her grup gondermeden once update_time on kosuluyla sahiplenilir: ayni id ile
+  eszamanli iki calistirma ayni grubu iki kez gonderemez
+- Sonunda throughput raporu (kullanici/sn, sureler) admin_logs'a yazilir
+"""
+import os
+import time
+import uuid
+import asyncio
+import logging
+from datetime import datetime, date
+from typing import Dict, List, Optional
+
+from utils import Constants
+from services.token_registry import extract_tokens
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_COLLECTION = "push_campaigns"
+GENERATION_CONCURRENCY = int(os.getenv("CAMPAIGN_AI_CONCURRENCY", "6"))
+GENERAL_GROUP = "general"
+CLAIM_TTL = 900  # saniye - cokmus calistirmanin sahiplendigi grup bu sureden sonra devralinir
+CLAIM_ATTEMPTS = 5
+
+# Gokyuzu verisi icin referans konum (Istanbul) - sadece burc/derece kullanilir
+SKY_LATITUDE = 41.0082
+SKY_LONGITUDE = 28.9784
+
+# Tropikal gunes burcu baslangiclari (ay, gun) - sinir gunlerinde ±1 gun sapabilir
+_SUN_SIGN_STARTS = (
+    (1, 20, 10), (2, 19, 11), (3, 21, 0), (4, 20, 1), (5, 21, 2), (6, 21, 3),
+    (7, 23, 4), (8, 23, 5), (9, 23, 6), (10, 23, 7), (11, 22, 8), (12, 22, 9),
+)
+
+
+def sun_sign_index_from_date(value) -> Optional[int]:
+    """Dogum tarihinden (date veya 'YYYY-MM-DD') gunes burcu indeksini bul (0=Koc)"""
+    try:
+        if isinstance(value, str):
+            value = datetime.strptime(value[:10], "%Y-%m-%d").date()
+        if not isinstance(value, date):
+            return None
+    except ValueError:
+        return None
+    index = 9  # 1-19 Ocak: Oglak
+    for month, day, sign_index in _SUN_SIGN_STARTS:
+        if (value.month, value.day) >= (month, day):
+            index = sign_index
+    return index
+
+
+def group_key_for_user(data: dict) -> str:
+    """Kullanici dokumanindan grup anahtari: sign_<0-11> veya general.
+
+    Dogum verisi istemcide (localStorage) tutuldugu icin cogu kullanicida
+    yoktur; sunSign / birthDate alanini kaydetmis kullanicilar burc grubuna,
+    digerleri genel gruba duser.
+    """
+    sun_sign = data.get("sunSign")
+    if isinstance(sun_sign, int) and 0 <= sun_sign < 12:
+        return f"sign_{sun_sign}"
+    if isinstance(sun_sign, str) and sun_sign in Constants.ZODIAC_SIGNS:
+        return f"sign_{Constants.ZODIAC_SIGNS.index(sun_sign)}"
+    index = sun_sign_index_from_date(data.get("birthDate"))
+    if index is not None:
+        return f"sign_{index}"
+    return GENERAL_GROUP
+
+
+def group_label(group_key: str) -> Optional[str]:
+    if group_key.startswith("sign_"):
+        return Constants.ZODIAC_SIGNS[int(group_key[5:])]
+    return None
+
+
+class DailyPushCampaign:
+    """Gunluk AI push kampanyasi (resumable)"""
+
+    def __init__(self, campaign_id: Optional[str] = None, title: str = "Günün Mesajı",
+                 admin_email: Optional[str] = None, db=None, concurrency: int = GENERATION_CONCURRENCY):
+        self.today = date.today().isoformat()
+        self.campaign_id = campaign_id or f"daily_{self.today}"
+        self.title = title
+        self.admin_email = admin_email
+        self.concurrency = max(1, concurrency)
+        self.run_id = uuid.uuid4().hex
+        self.owners: Dict[str, str] = {}  # token -> uid (collect_groups doldurur)
+        if db is None:
+            from services.firebase_service import firebase_service
+            db = firebase_service.db
+        self.db = db
+
+    @property
+    def _doc(self):
+        return self.db.collection(CAMPAIGN_COLLECTION).document(self.campaign_id)
+
+    def _load_state(self) -> dict:
+        doc = self._doc.get()
+        return (doc.to_dict() or {}) if doc.exists else {}
+
+    def _save_group(self, group_key: str, **fields):
+        self._doc.set({"groups": {group_key: fields}}, merge=True)
+
+    def _claim_group(self, group_key: str) -> bool:
+        """Grubu bu calistirma adina sahiplen; gonderilmis veya baskasinda ise False.
+
+        Okunan dokuman surumu (update_time) on kosuluyla yazilir; araya baska
+        bir yazma girerse yeniden okunup tekrar denenir.
+        """
+        for _ in range(CLAIM_ATTEMPTS):
+            snap = self._doc.get()
+            data = (snap.to_dict() or {}) if snap.exists else {}
+            group = (data.get("groups") or {}).get(group_key) or {}
+            if group.get("sent"):
+                return False
+            owner = group.get("claimed_by")
+            if owner and owner != self.run_id and (group.get("claimed_at") or 0) > time.time() - CLAIM_TTL:
+                return False
+            try:
+                self._doc.update(
+                    {f"groups.{group_key}.claimed_by": self.run_id,
+                     f"groups.{group_key}.claimed_at": time.time()},
+                    option=self.db.write_option(last_update_time=snap.update_time),
+                )
+                return True
+            except Exception as e:
+                logger.debug(f"[Campaign] {group_key} sahiplenme tekrar deneniyor: {e}")
+        logger.warning(f"[Campaign] {group_key} sahiplenilemedi, atlaniyor")
+        return False
+
+    # ─── Adimlar ────────────────────────────────────────────────
+
+    def collect_groups(self) -> Dict[str, List[str]]:
+        """Token'i olan kullanicilari grup anahtarina gore topla (projection ile tek tarama).
+
+        Token -> uid eslemesi self.owners'a yazilir; gecersiz token temizligi
+        users koleksiyonunu yeniden taramadan sadece sahipleri okur.
+        """
+        groups: Dict[str, List[str]] = {}
+        users = self.db.collection("users").select(["fcmTokens", "sunSign", "birthDate"]).stream()
+        for doc in users:
+            data = doc.to_dict() or {}
+            tokens = extract_tokens(data)
+            if tokens:
+                groups.setdefault(group_key_for_user(data), []).extend(tokens)
+                for token in tokens:
+                    self.owners.setdefault(token, doc.id)
+        return groups
+
+    def _sky_snapshot(self) -> dict:
+        """Bugunun gezegen konumlari - tum gruplar icin bir kez hesaplanir"""
+        try:
+            from services.astro_service import get_transit_positions
+            positions, _ = get_transit_positions(datetime.now(), SKY_LATITUDE, SKY_LONGITUDE)
+            return {
+                name: {"sign": p.get("sign"), "degree": p.get("degree"), "retrograde": p.get("retrograde")}
+                for name, p in positions.items()
+            }
+        except Exception as e:
+            logger.error(f"[Campaign] Gokyuzu verisi hesaplanamadi: {e}")
+            return {}
+
+    async def _generate(self, group_keys: List[str], sky: dict) -> Dict[str, str]:
+        """Eksik gruplarin metinlerini sinirli eszamanlilikla uret"""
+        from services.ai_service import ai_service
+        from services.ai_jobs import ProviderLimiter
+
+        limiter = ProviderLimiter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        texts: Dict[str, str] = {}
+
+        async def one(group_key: str):
+            label = group_label(group_key)
+            astro_data = {"date": self.today, "sky": sky}
+            if label:
+                astro_data["sun_sign"] = label
+            async with semaphore:
+                result = await ai_service.get_ai_interpretation_async(
+                    astro_data, "daily_push", f"{label} burcu" if label else "Değerli Kullanıcı",
+                    limiter=limiter, rules=ai_service.PUSH_RULES,
+                )
+            if result.get("success"):
+                texts[group_key] = result["interpretation"]
+                self._save_group(group_key, text=result["interpretation"], provider=result.get("provider"))
+            else:
+                logger.warning(f"[Campaign] {group_key} uretilemedi: {result.get('error')}")
+
+        await asyncio.gather(*(one(k) for k in group_keys))
+        return texts
+
+    def _send_group(self, group_key: str, tokens: List[str], body: str) -> dict:
+        from services.push_fanout import push_fanout
+
+        # 500'luk parcalar + paralel gonderim + kota retry fan-out motorunda
+        result = push_fanout.send(
+            tokens, self.title, body,
+            {"type": "daily_campaign", "campaign_id": self.campaign_id},
+            owners={t: self.owners[t] for t in tokens if t in self.owners},
+            log=False,
+        )
+        success, failure = result["success_count"], result["failure_count"]
+        self._save_group(group_key, sent=True, tokens=len(tokens), success=success, failure=failure)
+        return {"success": success, "failure": failure}
+
+    # ─── Calistir ───────────────────────────────────────────────
+
+    def run(self) -> dict:
+        """Kampanyayi calistir (veya yarida kaldigi yerden devam et) ve rapor dondur"""
+        if not self.db:
+            return {"success": False, "error": "DATABASE_UNAVAILABLE"}
+
+        started = time.time()
+        state = self._load_state()
+        done_groups = state.get("groups", {}) or {}
+        self._doc.set({
+            "status": "running",
+            "title": self.title,
+            "date": self.today,
+            "started_at": datetime.utcnow().isoformat(),
+        }, merge=True)
+
+        groups = self.collect_groups()
+        collect_seconds = time.time() - started
+
+        texts = {k: v["text"] for k, v in done_groups.items() if isinstance(v, dict) and v.get("text")}
+        missing = [k for k in groups if k not in texts]
+        t0 = time.time()
+        if missing:
+            sky = self._sky_snapshot()
+            texts.update(asyncio.run(self._generate(missing, sky)))
+        generation_seconds = time.time() - t0
+
+        t0 = time.time()
+        success = failure = skipped = 0
+        for group_key, tokens in groups.items():
+            body = texts.get(group_key)
+            if not body:
+                continue
+            if not self._claim_group(group_key):
+                skipped += 1  # gonderilmis veya eszamanli calistirmada
+                continue
+            sent = self._send_group(group_key, tokens, body)
+            success += sent["success"]
+            failure += sent["failure"]
+        send_seconds = time.time() - t0
+
+        elapsed = time.time() - started
+        total_tokens = sum(len(t) for t in groups.values())
+        failed_groups = [k for k in groups if k not in texts]
+        report = {
+            "campaign_id": self.campaign_id,
+            "groups": len(groups),
+            "generated": len([k for k in missing if k in texts]),
+            "reused": len(groups) - len(missing),
+            "failed_groups": failed_groups,
+            "skipped_sent_groups": skipped,
+            "tokens": total_tokens,
+            "success_count": success,
+            "failure_count": failure,
+            "collect_seconds": round(collect_seconds, 2),
+            "generation_seconds": round(generation_seconds, 2),
+            "send_seconds": round(send_seconds, 2),
+            "elapsed_seconds": round(elapsed, 2),
+            "tokens_per_second": round(total_tokens / elapsed, 1) if elapsed else 0,
+        }
+        status = "partial" if failed_groups else "completed"
+        self._doc.set({"status": status, "report": report,
+                       "finished_at": datetime.utcnow().isoformat()}, merge=True)
+        self._log(report)
+        logger.info(f"[Campaign] {self.campaign_id} {status}: {report}")
+        return {"success": True, "status": status, "report": report}
+
+    def _log(self, report: dict):
+        try:
+            from firebase_admin import firestore
+            self.db.collection("admin_logs").add({
+                "action": "push_campaign",
+                "adminEmail": self.admin_email,
+                "details": report,
+                "timestamp": firestore.SERVER_TIMESTAMP,
+            })
+        except Exception as e:
+            logger.error(f"[Campaign] Admin log yazilamadi: {e}")
+
+
+def get_campaign(campaign_id: str, db=None) -> Optional[dict]:
+    """Kampanya durum dokumanini oku (admin polling)"""
+    if db is None:
+        from services.firebase_service import firebase_service
+        db = firebase_service.db
+    if not db:
+        return None
+    doc = db.collection(CAMPAIGN_COLLECTION).document(campaign_id).get()
+    return doc.to_dict() if doc.exists else None
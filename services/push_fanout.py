@@ -0,0 +1,228 @@
+"""
+ORBIS Push Fan-out Engine
+- Token listesi FCM multicast limitine (500) gore parcalanir, parcalar sinirli
+  bir thread havuzuyla paralel gonderilir
+- Kota / gecici hatalarda (tum parca veya tek tek token'lar) ustel geri cekilme
+  + jitter ile yeniden denenir
+- Gecersiz token'lar sonda tek seferde, Firestore batch yazimlariyla temizlenir
+- Teslimat istatistikleri (basari, hata, retry, temizlenen token, sure) admin_logs'a yazilir
+"""
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from firebase_admin import exceptions, messaging
+
+logger = logging.getLogger(__name__)
+
+FCM_MULTICAST_LIMIT = 500
+FIRESTORE_BATCH_LIMIT = 500
+FANOUT_CONCURRENCY = int(os.getenv("PUSH_FANOUT_CONCURRENCY", "4"))
+MAX_RETRIES = int(os.getenv("PUSH_FANOUT_RETRIES", "4"))
+RETRY_BASE_DELAY = float(os.getenv("PUSH_FANOUT_RETRY_DELAY", "1.0"))  # saniye
+RETRY_MAX_DELAY = 30.0
+
+# Yeniden denenebilir (kota / gecici) ve kalici gecersiz token hatalari
+RETRYABLE_ERRORS = (messaging.QuotaExceededError, exceptions.ResourceExhaustedError,
+                    exceptions.UnavailableError, exceptions.InternalError)
+INVALID_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
+
+def chunk(tokens: List[str], size: int = FCM_MULTICAST_LIMIT) -> List[List[str]]:
+    return [tokens[i:i + size] for i in range(0, len(tokens), size)]
+
+
+def build_message(tokens: List[str], title: str, body: str, data: Optional[Dict[str, str]] = None):
+    return messaging.MulticastMessage(
+        notification=messaging.Notification(title=title, body=body),
+        data=data or {},
+        tokens=tokens,
+    )
+
+
+def remove_tokens(db, tokens: Iterable[str], owners: Optional[Dict[str, str]] = None,
+                  scan_limit: Optional[int] = None) -> int:
+    """Gecersiz token'lari users.fcmTokens dizilerinden batch yazimlarla sil.
+
+    Sahipler (token -> uid) verilen owners ve token_registry cache'inden bulunur;
+    hepsi biliniyorsa sadece o kullanicilar get_all ile okunur. Yoksa users
+    koleksiyonu tek projection taramasiyla gezilir (scan_limit verilirse en
+    fazla o kadar dokuman). Degisen kullanici sayisi doner.
+    """
+    from services.token_registry import token_registry
+
+    invalid = set(tokens)
+    if not db or not invalid:
+        return 0
+
+    owners = {**token_registry.owners_of(invalid), **(owners or {})}
+    users = db.collection("users")
+    if all(t in owners for t in invalid):
+        refs = [users.document(uid) for uid in sorted({owners[t] for t in invalid})]
+        snapshots = db.get_all(refs, field_paths=["fcmTokens"])
+    else:
+        query = users.select(["fcmTokens"])
+        snapshots = (query.limit(scan_limit) if scan_limit else query).stream()
+
+    batch, pending, updated = db.batch(), 0, 0
+    for snap in snapshots:
+        if not getattr(snap, "exists", True):
+            continue
+        current = (snap.to_dict() or {}).get("fcmTokens") or []
+        if not isinstance(current, list):
+            continue
+        filtered = [t for t in current if not (isinstance(t, dict) and t.get("token") in invalid)]
+        if len(filtered) == len(current):
+            continue
+        batch.update(snap.reference, {"fcmTokens": filtered})
+        pending += 1
+        updated += 1
+        if pending >= FIRESTORE_BATCH_LIMIT:
+            batch.commit()
+            batch, pending = db.batch(), 0
+    if pending:
+        batch.commit()
+    if updated:
+        logger.info(f"[PushFanout] {len(invalid)} gecersiz token {updated} kullanicidan silindi")
+    token_registry.invalidate_tokens(invalid)
+    return updated
+
+
+class PushFanout:
+    """send(tokens, title, body) -> teslimat istatistikleri"""
+
+    def __init__(self, db=None, send_fn: Optional[Callable] = None, concurrency: int = FANOUT_CONCURRENCY,
+                 max_retries: int = MAX_RETRIES, base_delay: float = RETRY_BASE_DELAY,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._db = db
+        self.send_fn = send_fn or messaging.send_each_for_multicast
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.sleep = sleep
+
+    @property
+    def db(self):
+        if self._db is None:
+            from services.firebase_service import firebase_service
+            self._db = firebase_service.db
+        return self._db
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(RETRY_MAX_DELAY, self.base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _send_chunk(self, tokens: List[str], title: str, body: str, data: Optional[Dict[str, str]],
+                    stats: dict, lock: threading.Lock) -> List[str]:
+        """Tek parcayi gonder; kota hatalarinda kalan token'larla tekrar dene. Gecersiz token'lari dondur."""
+        pending, invalid = tokens, []
+        success = failure = retries = 0
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.send_fn(build_message(pending, title, body, data))
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(f"[PushFanout] Parca kota/gecici hata ile vazgecildi: {e}")
+                    failure += len(pending)
+                    break
+                retries += 1
+                self.sleep(self._backoff(attempt))
+                continue
+            except Exception as e:
+                logger.error(f"[PushFanout] Multicast hatasi: {e}")
+                failure += len(pending)
+                break
+
+            retry = []
+            for token, resp in zip(pending, response.responses):
+                if resp.success:
+                    success += 1
+                elif isinstance(resp.exception, INVALID_TOKEN_ERRORS):
+                    invalid.append(token)
+                    failure += 1
+                elif isinstance(resp.exception, RETRYABLE_ERRORS) and attempt < self.max_retries:
+                    retry.append(token)
+                else:
+                    failure += 1
+            if not retry:
+                break
+            retries += 1
+            pending = retry
+            self.sleep(self._backoff(attempt))
+
+        with lock:
+            stats["success_count"] += success
+            stats["failure_count"] += failure
+            stats["retries"] += retries
+        return invalid
+
+    def send(self, tokens: List[str], title: str, body: str, data: Optional[Dict[str, str]] = None,
+             owners: Optional[Dict[str, str]] = None, admin_email: Optional[str] = None,
+             label: str = "push_fanout", log: bool = True, scan_limit: Optional[int] = None) -> dict:
+        """Token'lara paralel gonder, gecersizleri temizle, istatistikleri dondur (log=True ise admin_logs'a yaz)
+
+        scan_limit: sahibi bilinmeyen gecersiz token'lar icin users taramasinin
+        ust siniri (remove_tokens'a aynen iletilir).
+        """
+        started = time.time()
+        tokens = list(dict.fromkeys(t for t in tokens if t))
+        batches = chunk(tokens)
+        stats = {"tokens": len(tokens), "batches": len(batches), "success_count": 0,
+                 "failure_count": 0, "retries": 0, "invalid_tokens": 0, "users_cleaned": 0}
+        lock = threading.Lock()
+
+        invalid: List[str] = []
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches)),
+                                    thread_name_prefix="push-fanout") as pool:
+                for found in pool.map(lambda b: self._send_chunk(b, title, body, data, stats, lock), batches):
+                    invalid.extend(found)
+
+        stats["invalid_tokens"] = len(invalid)
+        if invalid:
+            try:
+                stats["users_cleaned"] = remove_tokens(self.db, invalid, owners, scan_limit)
+            except Exception as e:
+                logger.error(f"[PushFanout] Token temizleme hatasi: {e}")
+
+        elapsed = time.time() - started
+        stats["elapsed_seconds"] = round(elapsed, 2)
+        stats["tokens_per_second"] = round(len(tokens) / elapsed, 1) if elapsed else 0
+        if log:
+            self._log(label, title, stats, admin_email)
+        logger.info(f"[PushFanout] {label}: {stats}")
+        return stats
+
+    def send_to_users(self, uids: Iterable[str], title: str, body: str, data: Optional[Dict[str, str]] = None,
+                      **kwargs) -> dict:
+        """Kullanici listesine gonder: token'lar token_registry.resolve ile toplu cozulur"""
+        from services.token_registry import token_registry
+
+        owners = {}
+        for uid, tokens in token_registry.resolve(uids).items():
+            for token in tokens:
+                owners.setdefault(token, uid)
+        stats = self.send(list(owners), title, body, data, owners=owners, **kwargs)
+        stats["users"] = len({uid for uid in owners.values()})
+        return stats
+
+    def _log(self, label: str, title: str, stats: dict, admin_email: Optional[str]):
+        if not self.db:
+            return
+        try:
+            from firebase_admin import firestore
+            self.db.collection("admin_logs").add({
+                "action": label,
+                "adminEmail": admin_email,
+                "details": {"title": title, **stats},
+                "timestamp": firestore.SERVER_TIMESTAMP,
+            })
+        except Exception as e:
+            logger.error(f"[PushFanout] Admin log yazilamadi: {e}")
+
+
+push_fanout = PushFanout()
@@ -0,0 +1,98 @@
+"""
+ORBIS Redis Client
+- Worker'lar arasi paylasilan durum icin tek bir Redis baglantisi
+- REDIS_URL (docker-compose) veya REDIS_HOST/PORT/DB/PASSWORD ile yapilandirilir
+- Redis yoksa None doner; cagiran servis in-memory yedege gecer
+- get_redis() str dondurur (decode_responses=True); sikistirilmis govde gibi
+  ikili veriler icin ayri, decode etmeyen get_redis_binary() kullanilir
+"""
+import os
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_resolved = False
+_binary_client = None
+_binary_resolved = False
+_lock = threading.Lock()
+
+
+def _build_url() -> Optional[str]:
+    """Ortam degiskenlerinden Redis URL'i olustur (cache_config ile ayni degiskenler)"""
+    url = os.getenv("REDIS_URL", "").strip()
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST", "").strip()
+    if not host:
+        return None
+    port = os.getenv("REDIS_PORT", "6379")
+    db = os.getenv("REDIS_DB", "0")
+    password = os.getenv("REDIS_PASSWORD", "")
+    if password:
+        return f"redis://:{password}@{host}:{port}/{db}"
+    return f"redis://{host}:{port}/{db}"
+
+
+def _connect(decode_responses: bool):
+    """URL tanimliysa baglan ve ping at; olmazsa None"""
+    url = _build_url()
+    if not url:
+        return None
+    try:
+        import redis
+        client = redis.Redis.from_url(
+            url, socket_timeout=2, socket_connect_timeout=2, decode_responses=decode_responses
+        )
+        client.ping()
+        logger.info("[Redis] Baglanti kuruldu" + ("" if decode_responses else " (binary)"))
+        return client
+    except Exception as e:
+        logger.warning(f"[Redis] Baglanti kurulamadi, in-memory yedek kullanilacak: {e}")
+        return None
+
+
+def get_redis():
+    """Paylasilan Redis client'ini dondur (lazy, process basina bir kez).
+
+    Baglanti kurulamazsa None dondurur ve bir daha denemez; boylece
+    Redis'siz gelistirme ortaminda her istekte timeout beklenmez.
+    """
+    global _client, _resolved
+    if _resolved:
+        return _client
+    with _lock:
+        if _resolved:
+            return _client
+        _client = _connect(decode_responses=True)
+        _resolved = True
+    return _client
+
+
+def get_redis_binary():
+    """get_redis() ile ayni sunucu, ama yanitlar bytes olarak doner.
+
+    gzip/brotli gibi UTF-8 olmayan degerler icin; decode eden client bunlari
+    okurken UnicodeDecodeError verir.
+    """
+    global _binary_client, _binary_resolved
+    if _binary_resolved:
+        return _binary_client
+    with _lock:
+        if _binary_resolved:
+            return _binary_client
+        _binary_client = _connect(decode_responses=False)
+        _binary_resolved = True
+    return _binary_client
+
+
+def reset_redis_client():
+    """Client'lari unut (testler ve fork sonrasi yeniden baglanma icin)"""
+    global _client, _resolved, _binary_client, _binary_resolved
+    with _lock:
+        _client = None
+        _resolved = False
+        _binary_client = None
+        _binary_resolved = False
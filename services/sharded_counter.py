@@ -0,0 +1,103 @@
+"""
+ORBIS Sharded Counter
+- Bir sayac = ana dokuman altinda N shard dokumani (<doc>/shards/{0..N-1})
+- Artislar rastgele bir shard'a Increment ile yazilir: dokuman basina ~1 yazim/sn
+  limiti N katina cikar
+- Okuma tum shard'lari toplar; sonuc kisa sure (AGGREGATE_TTL) process icinde cache'lenir
+- Gunluk sayaclar tarih anahtarli ayri sayaclardir (stats_daily/<tarih>): gun devri
+  icin okuma/sifirlama gerekmez, yeni gun yeni dokuman demektir
+"""
+import os
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARD_COLLECTION = "shards"
+SHARD_COUNT = int(os.getenv("STATS_SHARD_COUNT", "10"))
+AGGREGATE_TTL = float(os.getenv("STATS_AGGREGATE_TTL", "10"))  # saniye
+DAILY_COLLECTION = "stats_daily"
+
+
+class ShardedCounter:
+    """Firestore'da N shard'a dagitilmis sayac grubu (birden fazla field tasiyabilir)"""
+
+    def __init__(self, db, collection: str, document: str, num_shards: int = SHARD_COUNT,
+                 ttl: float = AGGREGATE_TTL):
+        self.db = db
+        self.collection = collection
+        self.document = document
+        self.num_shards = max(1, num_shards)
+        self.ttl = ttl
+        self._cache: Optional[Tuple[float, Dict[str, float]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ref(self):
+        return self.db.collection(self.collection).document(self.document)
+
+    def _shard(self, index: int):
+        return self.ref.collection(SHARD_COLLECTION).document(str(index))
+
+    # ─── Yazma ──────────────────────────────────────────────────
+
+    def increment(self, deltas: Dict[str, int], batch=None):
+        """Deltalari rastgele bir shard'a yaz. batch verilirse commit cagirana kalir."""
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return
+        from firebase_admin import firestore
+        payload = {field: firestore.Increment(amount) for field, amount in deltas.items()}
+        shard = self._shard(random.randrange(self.num_shards))
+        if batch is not None:
+            batch.set(shard, payload, merge=True)
+        else:
+            shard.set(payload, merge=True)
+        with self._lock:
+            self._cache = None
+
+    # ─── Okuma ──────────────────────────────────────────────────
+
+    def read(self, use_cache: bool = True) -> Dict[str, float]:
+        """Tum shard'larin toplami (N read). TTL icinde tekrar okumaz."""
+        now = time.time()
+        with self._lock:
+            if use_cache and self._cache and now - self._cache[0] < self.ttl:
+                return dict(self._cache[1])
+
+        totals: Dict[str, float] = {}
+        for shard in self.ref.collection(SHARD_COLLECTION).stream():
+            for field, value in (shard.to_dict() or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[field] = totals.get(field, 0) + value
+
+        with self._lock:
+            self._cache = (now, totals)
+        return dict(totals)
+
+
+class DailyCounters:
+    """Tarih anahtarli sharded sayaclar: stats_daily/<YYYY-MM-DD>/shards/{n}"""
+
+    def __init__(self, db, collection: str = DAILY_COLLECTION, num_shards: int = SHARD_COUNT,
+                 ttl: float = AGGREGATE_TTL, keep: int = 3):
+        self.db = db
+        self.collection = collection
+        self.num_shards = num_shards
+        self.ttl = ttl
+        self.keep = keep  # bellekte tutulan gun sayisi (gece yarisi etrafindaki flush'lar icin)
+        self._counters: Dict[str, ShardedCounter] = {}
+        self._lock = threading.Lock()
+
+    def for_day(self, day: str) -> ShardedCounter:
+        with self._lock:
+            counter = self._counters.get(day)
+            if counter is None:
+                counter = ShardedCounter(self.db, self.collection, day, self.num_shards, self.ttl)
+                self._counters[day] = counter
+                for old in sorted(self._counters)[:-self.keep]:
+                    self._counters.pop(old, None)
+            return counter
@@ -1,10 +1,12 @@
 """
 ORBIS Stats Counter Service
 - Firestore stats/dashboard dokumanini yonetir
-- Her kullanici isleminde counter'lari gunceller
+- Her kullanici isleminde counter'lari gunceller (CounterBuffer ile toplu,
+  stats/dashboard/shards/{n} ve stats_daily/<tarih>/shards/{n} sharded sayaclarina)
 - Admin dashboard sayfalama icin optimize edilmistir
 - PREMIUM YOK: Uygulama tamamen ucretsiz, sadece reklam destekli
 """
+import time
 import logging
 from datetime import datetime
 from typing import Optional
@@ -12,6 +14,9 @@ from typing import Optional
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
 
+from services.counter_buffer import CounterBuffer, register
+from services.sharded_counter import AGGREGATE_TTL, DailyCounters, ShardedCounter
+
 logger = logging.getLogger(__name__)
 
 # Field yollari (premium kaldirildi)
@@ -20,6 +25,7 @@ FIELD_TOTAL_ANALYSES = "total_analyses"
 FIELD_ACTIVE_TODAY = "active_today"
 FIELD_TOTAL_ADS_WATCHED = "total_ads_watched"
 FIELD_TOTAL_REWARDED_ADS = "total_rewarded_ads"
+DAILY_FIELDS = ("analyses_today", "rewarded_ads_today")
 
 
 class StatsCounter:
@@ -28,6 +34,10 @@ class StatsCounter:
     def __init__(self):
         self.db = None
         self._init_db()
+        self._totals = ShardedCounter(self.db, "stats", "dashboard")
+        self._daily = DailyCounters(self.db)
+        self._buffer = register(CounterBuffer(self._flush))
+        self._overview_cache = None  # (zaman, veri)
 
     def _init_db(self):
         try:
@@ -43,15 +53,27 @@ class StatsCounter:
             return None
         return self.db.collection("stats").document("dashboard")
 
+    def _flush(self, totals: dict, daily: dict, fields: dict):
+        """Biriken deltalari tek batch commit ile yaz (CounterBuffer callback'i).
+
+        Toplamlar stats/dashboard shard'larindan birine, gunluk sayaclar
+        stats_daily/<tarih> shard'larindan birine gider.
+        """
+        if not self.db:
+            return
+        batch = self.db.batch()
+        self._totals.increment(totals, batch=batch)
+        for day, counters in daily.items():
+            self._daily.for_day(day).increment(counters, batch=batch)
+        if fields:
+            batch.set(self._doc, fields, merge=True)
+        batch.commit()
+
     def _increment(self, field: str, amount: int = 1):
-        """Bir counter field'ini Increment ile guncelle"""
+        """Counter deltasini tampona ekle (Firestore'a birkac saniyede bir toplu yazilir)"""
         if not self.db:
             return
-        try:
-            from firebase_admin import firestore
-            self._doc.update({field: firestore.Increment(amount)})
-        except Exception as e:
-            logger.error(f"[Stats] Increment error ({field}): {e}")
+        self._buffer.add(field, amount)
 
     def _set_active_today(self, count: int):
         """active_today degerini dogrudan set et (gu sonu sifirlanir)"""
@@ -63,28 +85,25 @@ class StatsCounter:
             logger.error(f"[Stats] set_active_today error: {e}")
 
     def _increment_today_counter(self, field: str):
-        """Bugünlük counter: gün değiştiyse sıfırla, sonra Increment.
+        """Bugünlük counter: stats_daily/<tarih> sayacına yazılır.
 
-        Her çağrıda doc'tan _today_date kontrol edilir, farklıysa 0'a set edilir.
-        Aynı gün içinde Increment yapılır.
+        Gün devri için okuma/sıfırlama gerekmez; yeni gün yeni doküman demektir.
         """
         if not self.db:
             return
-        try:
-            from datetime import datetime
-            from firebase_admin import firestore
-            today = datetime.now().strftime("%Y-%m-%d")
-            doc = self._doc.get()
-            data = doc.to_dict() or {}
-            cur_date = data.get(f'{field}_date')
-            doc_ref = self._doc
-            if cur_date != today:
-                # Gün değişti — sıfırla ve yeni tarihi yaz
-                doc_ref.update({field: 0, f'{field}_date': today, field: firestore.Increment(1)})
-            else:
-                doc_ref.update({field: firestore.Increment(1)})
-        except Exception as e:
-            logger.error(f"[Stats] today counter error ({field}): {e}")
+        self._buffer.add_daily(field)
+
+    def _aggregate(self, data: dict) -> dict:
+        """Ana dokuman + toplam shard'lari + bugunun gunluk shard'lari"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        for field in DAILY_FIELDS:
+            # Eski tek-dokuman gunluk sayaci sadece bugune aitse gecerli
+            if data.get(f"{field}_date") != today:
+                data[field] = 0
+        for counters in (self._totals.read(), self._daily.for_day(today).read()):
+            for field, value in counters.items():
+                data[field] = (data.get(field) or 0) + value
+        return data
 
     # ═══════════════════════════════════════════════════════════════
     # PUBLIC API - Kullanici islemleri (Premium'suz)
@@ -144,73 +163,48 @@ class StatsCounter:
             return
         try:
             now = datetime.now()
-            self._doc.update({
-                "last_login_email": email,
-                "last_login_name": display_name or email,
-                "last_login_time": now.isoformat(),
-            })
+            self._buffer.set_field("last_login_email", email)
+            self._buffer.set_field("last_login_name", display_name or email)
+            self._buffer.set_field("last_login_time", now.isoformat())
         except Exception as e:
             logger.error(f"[Stats] login tracking error: {e}")
 
     def on_heartbeat(self, email: str, display_name: str):
-        """Aktif kullanici kalp atisi - heartbeat dokumanina yaz"""
-        if not self.db:
-            return
-        try:
-            from firebase_admin import firestore
-            from datetime import datetime, timezone
-            # ⚠️ SERVER_TIMESTAMP kullanma - filtrelemede sorun cikarir
-            # Gercek timestamp ile yaz, boylece sorgu calisir
-            now = datetime.now(timezone.utc).isoformat()
-            key = email.replace("@", "_at_").replace(".", "_dot_")
-            self.db.collection("stats_heartbeats").document(key).set({
-                "email": email,
-                "display_name": display_name or email,
-                "last_seen": now,
-            })
-        except Exception as e:
-            logger.error(f"[Stats] heartbeat error: {e}")
+        """Aktif kullanici kalp atisi - presence store'a yazilir (Firestore'a periyodik batch)"""
+        from services.presence import presence_tracker
+        presence_tracker.heartbeat(email, display_name)
 
     def get_online_users(self, within_minutes: int = 5) -> list:
         """Son N dakikada heartbeat atan kullanicilar"""
-        if not self.db:
-            return []
-        try:
-            from datetime import datetime, timedelta, timezone
-            cutoff = (datetime.now(timezone.utc) - timedelta(minutes=within_minutes)).isoformat()
-            docs = list(self.db.collection("stats_heartbeats")
-                        .where(filter=FieldFilter("last_seen", ">=", cutoff))
-                        .stream())
-            users = []
-            for d in docs:
-                data = d.to_dict()
-                users.append({
-                    "email": data.get("email"),
-                    "display_name": data.get("display_name"),
-                    "last_seen": data.get("last_seen", ""),
-                })
-            return users
-        except Exception as e:
-            logger.error(f"[Stats] online error: {e}")
-            return []
+        from services.presence import presence_tracker
+        return presence_tracker.online(within_minutes)
 
     # ═══════════════════════════════════════════════════════════════
-    # ADMIN DASHBOARD - Hizli okuma (tek dokuman, 1 read)
+    # ADMIN DASHBOARD - Hizli okuma (ana dokuman + shard'lar)
     # ═══════════════════════════════════════════════════════════════
 
     def get_overview(self) -> Optional[dict]:
-        """Dashboard icin tum istatistikleri tek dokumandan oku (SADECE 1 READ)"""
+        """Dashboard istatistikleri: ana dokuman + shard toplamlari.
+
+        Sonuc AGGREGATE_TTL saniye cache'lenir; dashboard yenilemeleri her
+        seferinde 1 + 2*SHARD_COUNT okuma yapmaz.
+        """
         if not self.db:
             return None
 
+        cached = self._overview_cache
+        if cached and time.time() - cached[0] < AGGREGATE_TTL:
+            return dict(cached[1])
+
         # ONCE counter dokumanindan oku
         try:
             doc = self._doc.get()
             if doc.exists:
-                data = doc.to_dict()
+                data = self._aggregate(doc.to_dict() or {})
                 # Gunluk aktif sayisini guncelle (arka planda)
                 self.on_daily_activity(datetime.now().strftime("%Y-%m-%d"))
-                return data
+                self._overview_cache = (time.time(), data)
+                return dict(data)
         except Exception as e:
             logger.error(f"[Stats] Overview read error: {e}")
 
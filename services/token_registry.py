@@ -0,0 +1,151 @@
+"""
+ORBIS FCM Token Registry
+- uid -> FCM token listesi icin process ici, boyutu sinirli LRU + TTL cache
+- save_fcm_token (uid) ve gecersiz token temizligi (token) cache'i gecersiz kilar
+- Sahiplik kontrolu: cache'te olan token hemen onaylanir; olmayan token icin
+  (baska worker yeni kaydetmis olabilir) dokuman bir kez taze okunur
+- resolve(uids): uid listesini batched get_all (sadece fcmTokens alani) ile token'lara cevirir
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_MAX = int(os.getenv("TOKEN_CACHE_MAX", "10000"))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", "300"))  # saniye
+GET_ALL_CHUNK = 300
+
+
+def extract_tokens(data: dict) -> List[str]:
+    """users dokumanindaki fcmTokens dizisinden token string'leri"""
+    tokens = (data or {}).get("fcmTokens", [])
+    if not isinstance(tokens, list):
+        return []
+    return [t["token"] for t in tokens if isinstance(t, dict) and t.get("token")]
+
+
+class TokenRegistry:
+    """uid -> token listesi (LRU, TTL)"""
+
+    def __init__(self, db=None, max_size: int = TOKEN_CACHE_MAX, ttl: int = TOKEN_CACHE_TTL):
+        self._db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # uid -> (zaman, token listesi)
+        self._owners: Dict[str, Set[str]] = {}  # token -> uid'ler (sadece cache'teki kayitlar)
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from services.firebase_service import firebase_service
+            self._db = firebase_service.db
+        return self._db
+
+    # ─── Cache ──────────────────────────────────────────────────
+
+    def _cached(self, uid: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._cache.get(uid)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl:
+                self._drop(uid)
+                return None
+            self._cache.move_to_end(uid)
+            return entry[1]
+
+    def _put(self, uid: str, tokens: List[str]):
+        with self._lock:
+            self._drop(uid)
+            self._cache[uid] = (time.time(), tokens)
+            for token in tokens:
+                self._owners.setdefault(token, set()).add(uid)
+            while len(self._cache) > self.max_size:
+                self._drop(next(iter(self._cache)))
+
+    def _drop(self, uid: str):
+        entry = self._cache.pop(uid, None)
+        if entry:
+            for token in entry[1]:
+                owners = self._owners.get(token)
+                if owners is not None:
+                    owners.discard(uid)
+                    if not owners:
+                        del self._owners[token]
+
+    def invalidate(self, uid: Optional[str] = None):
+        """uid'nin kaydini (uid yoksa tum cache'i) dusur"""
+        with self._lock:
+            if uid is None:
+                self._cache.clear()
+                self._owners.clear()
+            else:
+                self._drop(uid)
+
+    def invalidate_tokens(self, tokens: Iterable[str]):
+        """Token'lari iceren kayitlari dusur (gecersiz token temizligi)"""
+        with self._lock:
+            for token in tokens:
+                for uid in list(self._owners.get(token, ())):
+                    self._drop(uid)
+
+    def owners_of(self, tokens: Iterable[str]) -> Dict[str, str]:
+        """Cache'teki kayitlardan token -> uid (bilinmeyen token'lar dahil edilmez)"""
+        with self._lock:
+            return {token: min(self._owners[token]) for token in tokens if self._owners.get(token)}
+
+    # ─── Okuma ──────────────────────────────────────────────────
+
+    def _load(self, uid: str) -> List[str]:
+        doc = self.db.collection("users").document(uid).get()
+        tokens = extract_tokens(doc.to_dict()) if doc.exists else []
+        self._put(uid, tokens)
+        return tokens
+
+    def get(self, uid: str) -> List[str]:
+        """Kullanicinin FCM token'lari (cache'ten veya tek dokuman okumasiyla)"""
+        if not uid or not self.db:
+            return []
+        cached = self._cached(uid)
+        if cached is not None:
+            return list(cached)
+        return list(self._load(uid))
+
+    def owns(self, uid: str, token: str) -> bool:
+        """Token bu kullaniciya mi ait? Negatif sonuc cache'e guvenmeden dogrulanir."""
+        if not uid or not token or not self.db:
+            return False
+        cached = self._cached(uid)
+        if cached is not None and token in cached:
+            return True
+        return token in self._load(uid)
+
+    def resolve(self, uids: Iterable[str]) -> Dict[str, List[str]]:
+        """uid listesi -> {uid: token'lar}; cache disindakiler batched get_all ile okunur"""
+        result: Dict[str, List[str]] = {}
+        missing = []
+        for uid in dict.fromkeys(u for u in uids if u):
+            cached = self._cached(uid)
+            if cached is not None:
+                result[uid] = list(cached)
+            else:
+                missing.append(uid)
+        if not missing or not self.db:
+            return result
+
+        users = self.db.collection("users")
+        for i in range(0, len(missing), GET_ALL_CHUNK):
+            refs = [users.document(uid) for uid in missing[i:i + GET_ALL_CHUNK]]
+            for snap in self.db.get_all(refs, field_paths=["fcmTokens"]):
+                tokens = extract_tokens(snap.to_dict()) if snap.exists else []
+                self._put(snap.id, tokens)
+                result[snap.id] = list(tokens)
+        return result
+
+
+token_registry = TokenRegistry()
@@ -0,0 +1,252 @@
+"""
+ORBIS Admin User Search Index
+- Admin kullanici aramasi icin email / displayName prefix indeksi
+- Token'lar: tam email, email parcalari (@ . _ - + ile bolunmus), tam ad, ad kelimeleri
+- Redis varsa ZSET (ZRANGEBYLEX ile O(log n + m) prefix sorgusu) worker'lar arasi paylasilir,
+  yoksa process ici sirali liste (bisect) kullanilir
+- Ilk aramada users koleksiyonundan tek projection taramasiyla kurulur (snapshot),
+  REBUILD_INTERVAL'da bir yeniden kurulur; arada user-created / user-login ile artimli guncellenir
+  (kullanici dokumani sunucuda okunur, istemci verisi indekse yazilmaz)
+- Kurulum / Redis hatasinda search None doner, admin eski tam taramaya duser
+"""
+import os
+import re
+import json
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REBUILD_INTERVAL = int(os.getenv("USER_SEARCH_REBUILD_INTERVAL", str(6 * 3600)))  # saniye
+SEP = "\x00"
+_EMAIL_SPLIT = re.compile(r"[@._+\-]+")
+
+
+def index_tokens(email: Optional[str], display_name: Optional[str]) -> List[str]:
+    """Bir kullanici icin aranabilir (kucuk harf) token'lar"""
+    tokens = set()
+    email = (email or "").strip().lower()
+    name = (display_name or "").strip().lower()
+    if email:
+        tokens.add(email)
+        tokens.update(t for t in _EMAIL_SPLIT.split(email) if t)
+    if name:
+        tokens.add(name)
+        tokens.update(name.split())
+    return sorted(tokens)
+
+
+def _members(uid: str, email: Optional[str], display_name: Optional[str]) -> List[str]:
+    # token \0 email \0 uid: prefix sorgusu token'a, siralama email'e gore yapilir
+    sort_key = (email or display_name or "").lower()
+    return [f"{token}{SEP}{sort_key}{SEP}{uid}" for token in index_tokens(email, display_name)]
+
+
+# ═══════════════════════════════════════════════════════════════
+# BACKENDS
+# ═══════════════════════════════════════════════════════════════
+
+class InMemorySearchBackend:
+    """Sirali member listesi + uid -> member'lar"""
+
+    def __init__(self):
+        self._entries: List[str] = []
+        self._by_uid: Dict[str, List[str]] = {}
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        return bool(self._built_at) and time.time() - self._built_at < REBUILD_INTERVAL
+
+    def try_lock_rebuild(self) -> bool:
+        return True
+
+    def release_rebuild(self):
+        pass
+
+    def replace_all(self, docs: Iterable[Tuple[str, List[str]]]):
+        by_uid = dict(docs)
+        entries = sorted(m for members in by_uid.values() for m in members)
+        with self._lock:
+            self._entries, self._by_uid = entries, by_uid
+            self._built_at = time.time()
+
+    def upsert(self, uid: str, members: List[str]):
+        with self._lock:
+            for member in self._by_uid.get(uid, []):
+                i = bisect.bisect_left(self._entries, member)
+                if i < len(self._entries) and self._entries[i] == member:
+                    del self._entries[i]
+            for member in members:
+                bisect.insort(self._entries, member)
+            self._by_uid[uid] = members
+
+    def prefix(self, query: str) -> List[str]:
+        with self._lock:
+            start = bisect.bisect_left(self._entries, query)
+            end = bisect.bisect_left(self._entries, query + "\U0010ffff")
+            return self._entries[start:end]
+
+
+class RedisSearchBackend:
+    """ZSET (hepsi skor 0, lex sirali) + uid -> member listesi HASH"""
+
+    INDEX_KEY = "user_search:index"
+    MEMBERS_KEY = "user_search:members"
+    BUILT_KEY = "user_search:built"
+    LOCK_KEY = "user_search:building"
+
+    def __init__(self, client):
+        self.client = client
+
+    def is_fresh(self) -> bool:
+        return bool(self.client.exists(self.BUILT_KEY))
+
+    def try_lock_rebuild(self) -> bool:
+        """Ayni anda tek worker kursun; digerleri mevcut (eski) indeksi kullanir"""
+        return bool(self.client.set(self.LOCK_KEY, os.getpid(), nx=True, ex=300))
+
+    def release_rebuild(self):
+        self.client.delete(self.LOCK_KEY)
+
+    def replace_all(self, docs: Iterable[Tuple[str, List[str]]]):
+        # Gecici anahtarlara kur, RENAME ile atomik degistir (arama sirasinda bos indeks yok)
+        tmp_index, tmp_members = self.INDEX_KEY + ":tmp", self.MEMBERS_KEY + ":tmp"
+        self.client.delete(tmp_index, tmp_members)
+        pipe = self.client.pipeline(transaction=False)
+        for n, (uid, members) in enumerate(docs, 1):
+            if members:
+                pipe.zadd(tmp_index, {m: 0 for m in members})
+            pipe.hset(tmp_members, uid, json.dumps(members))
+            if n % 1000 == 0:
+                pipe.execute()
+        pipe.execute()
+        pipe = self.client.pipeline()
+        if self.client.exists(tmp_index):
+            pipe.rename(tmp_index, self.INDEX_KEY)
+        if self.client.exists(tmp_members):
+            pipe.rename(tmp_members, self.MEMBERS_KEY)
+        pipe.set(self.BUILT_KEY, int(time.time()), ex=REBUILD_INTERVAL)
+        pipe.delete(self.LOCK_KEY)
+        pipe.execute()
+
+    def upsert(self, uid: str, members: List[str]):
+        old = self.client.hget(self.MEMBERS_KEY, uid)
+        pipe = self.client.pipeline()
+        if old:
+            stale = json.loads(old)
+            if stale:
+                pipe.zrem(self.INDEX_KEY, *stale)
+        if members:
+            pipe.zadd(self.INDEX_KEY, {m: 0 for m in members})
+        pipe.hset(self.MEMBERS_KEY, uid, json.dumps(members))
+        pipe.execute()
+
+    def prefix(self, query: str) -> List[str]:
+        return self.client.zrangebylex(self.INDEX_KEY, f"[{query}", f"[{query}\U0010ffff")
+
+
+# ═══════════════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════════════
+
+class UserSearchIndex:
+    """Admin kullanici aramasi: search(query, offset, limit) -> (toplam, uid listesi)"""
+
+    def __init__(self, backend=None, db=None):
+        self._backend = backend
+        self._db = db
+        self._build_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from services.redis_client import get_redis
+            client = get_redis()
+            self._backend = RedisSearchBackend(client) if client is not None else InMemorySearchBackend()
+        return self._backend
+
+    @property
+    def db(self):
+        if self._db is None:
+            from services.firebase_service import firebase_service
+            self._db = firebase_service.db
+        return self._db
+
+    def rebuild(self) -> int:
+        """users koleksiyonundan tek projection taramasiyla indeksi yeniden kur"""
+        started = time.time()
+        docs = []
+        for doc in self.db.collection("users").select(["email", "displayName"]).stream():
+            data = doc.to_dict() or {}
+            docs.append((doc.id, _members(doc.id, data.get("email"), data.get("displayName"))))
+        self.backend.replace_all(docs)
+        logger.info(f"[UserSearch] Indeks kuruldu: {len(docs)} kullanici, {time.time() - started:.2f}sn")
+        return len(docs)
+
+    def ensure_built(self) -> bool:
+        """Indeks kullanilabilir mi? Kurulum hatasinda False (cagiran eski taramaya duser)"""
+        try:
+            if self.backend.is_fresh():
+                return True
+            if not self.db:
+                return False
+            with self._build_lock:
+                if not self.backend.is_fresh() and self.backend.try_lock_rebuild():
+                    try:
+                        self.rebuild()
+                    finally:
+                        self.backend.release_rebuild()
+            return True
+        except Exception as e:
+            logger.warning(f"[UserSearch] Indeks kurulamadi, tam taramaya dusuluyor: {e}")
+            return False
+
+    def upsert(self, uid: str, email: Optional[str], display_name: Optional[str]):
+        """Artimli guncelleme (rebuild / sunucu tarafinda dogrulanmis veri icin)"""
+        if not uid:
+            return
+        try:
+            self.backend.upsert(uid, _members(uid, email, display_name))
+        except Exception as e:
+            logger.warning(f"[UserSearch] upsert error: {e}")
+
+    def refresh_user(self, uid: Optional[str]):
+        """users/{uid} dokumanini sunucuda okuyup indekse yaz (user-created / user-login).
+
+        Istemcinin gonderdigi email/ad kullanilmaz: dokumani olmayan uid
+        indekse eklenmez, baskasinin kaydi istemci verisiyle ezilemez.
+        """
+        if not uid or not isinstance(uid, str) or not self.db:
+            return
+        try:
+            snap = self.db.collection("users").document(uid).get(["email", "displayName"])
+            if not snap.exists:
+                return
+            data = snap.to_dict() or {}
+            self.backend.upsert(uid, _members(uid, data.get("email"), data.get("displayName")))
+        except Exception as e:
+            logger.warning(f"[UserSearch] refresh error ({uid}): {e}")
+
+    def search(self, query: str, offset: int = 0, limit: int = 50) -> Optional[Tuple[int, List[str]]]:
+        """Prefix eslesen kullanicilar (email'e gore sirali). Indeks kurulamazsa None."""
+        query = (query or "").strip().lower()
+        if not self.ensure_built():
+            return None
+        try:
+            members = self.backend.prefix(query)
+        except Exception as e:
+            logger.warning(f"[UserSearch] prefix sorgusu basarisiz: {e}")
+            return None
+        matches: Dict[str, str] = {}
+        for member in members:
+            _, sort_key, uid = member.split(SEP, 2)
+            matches[uid] = sort_key
+        ordered = sorted(matches, key=lambda uid: (matches[uid], uid))
+        return len(ordered), ordered[offset:offset + limit]
+
+
+user_search_index = UserSearchIndex()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Vimshottari dasa zaman çizelgesi.
+
+Doğuma bağlı Maha Dasa sınırları Julian gün (JD) float dizisi olarak bir
+kez hesaplanır; bu statik kısım natal haritayla birlikte saklanabilir
+(to_dict / from_dict). Belirli bir anın Maha/Antar/Pratyantar dasası her
+seviyede sınır dizisinde ikili arama ile bulunur. Alt seviyeler sadece
+istendiğinde (locate veya periods çağrısında) açılır ve önbelleğe alınır.
+
+İlk Maha Dasa, doğumdan önceki teorik başlangıcıyla tutulur (Ay'ın
+nakshatrada kat ettiği oran kadar geriye); alt periyotlar böylece tam
+dasa süresi üzerinden dağılır.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+# Dasa Periyotları (Yıl cinsinden) - Toplam 120 yıl
+DASA_YEARS = {
+    "Ketu": 7,
+    "Venus": 20,
+    "Sun": 6,
+    "Moon": 10,
+    "Mars": 7,
+    "Rahu": 18,
+    "Jupiter": 16,
+    "Saturn": 19,
+    "Mercury": 17,
+}
+
+# Dasa Sırası (Ketu'dan başlar)
+DASA_ORDER = [
+    "Ketu",
+    "Venus",
+    "Sun",
+    "Moon",
+    "Mars",
+    "Rahu",
+    "Jupiter",
+    "Saturn",
+    "Mercury",
+]
+
+# Toplam Dasa döngüsü (yıl)
+TOTAL_DASA_CYCLE = 120.0
+YEAR_DAYS = 365.25
+NAKSHATRA_SPAN = 360.0 / 27.0
+DEFAULT_CYCLES = 2
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+_UNIX_EPOCH_JD = 2440587.5
+
+
+def datetime_to_jd(dt: datetime) -> float:
+    """Naif datetime -> JD (saat dilimi dönüşümü yapılmaz; gidiş-dönüş tutarlıdır)"""
+    return _UNIX_EPOCH_JD + (dt - _UNIX_EPOCH).total_seconds() / 86400.0
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    return _UNIX_EPOCH + timedelta(days=jd - _UNIX_EPOCH_JD)
+
+
+def sequence_from(lord: str) -> List[str]:
+    """Belirli bir lord'dan başlayan Dasa sırası"""
+    start = DASA_ORDER.index(lord)
+    return DASA_ORDER[start:] + DASA_ORDER[:start]
+
+
+class Period(NamedTuple):
+    level: int  # 0 = Maha, 1 = Antar, 2 = Pratyantar ...
+    index: int  # seviyedeki sıra
+    lord: str
+    start: float  # JD
+    end: float  # JD
+
+
+class DasaTimeline:
+    """Maha Dasa sınırları + talep üzerine açılan alt seviyeler"""
+
+    def __init__(self, lords: Sequence[str], bounds: Sequence[float]):
+        if len(bounds) != len(lords) + 1:
+            raise ValueError("Dasa sınır sayısı lord sayısından bir fazla olmalıdır.")
+        self.lords = tuple(lords)
+        self.bounds = tuple(bounds)
+        # yol (üst seviye indeksleri) -> (lordlar, sınırlar)
+        self._levels: Dict[Tuple[int, ...], Tuple[Tuple[str, ...], Tuple[float, ...]]] = {
+            (): (self.lords, self.bounds)
+        }
+
+    @classmethod
+    def from_birth(cls, birth_jd: float, moon_degree: float, cycles: int = DEFAULT_CYCLES) -> "DasaTimeline":
+        """Doğum JD'si ve natal Ay boylamından zaman çizelgesi"""
+        degree = moon_degree % 360
+        index = min(int(degree / NAKSHATRA_SPAN), 26)
+        start_lord = DASA_ORDER[index % 9]  # nakshatra lordları Ketu'dan başlayarak 9'lu döner
+        elapsed = (degree - index * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+        lords = sequence_from(start_lord) * cycles
+        start = birth_jd - elapsed * DASA_YEARS[start_lord] * YEAR_DAYS
+        bounds = [start]
+        for lord in lords:
+            start += DASA_YEARS[lord] * YEAR_DAYS
+            bounds.append(start)
+        return cls(lords, bounds)
+
+    # ─── Serileştirme (statik kısım) ───────────────────────────
+
+    def to_dict(self) -> dict:
+        return {"lords": list(self.lords), "bounds": list(self.bounds)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DasaTimeline":
+        return cls(data["lords"], data["bounds"])
+
+    # ─── Seviyeler ─────────────────────────────────────────────
+
+    def periods(self, path: Tuple[int, ...] = ()) -> List[Period]:
+        """path ile seçilen periyodun alt periyotları (path=() -> Maha Dasalar)"""
+        lords, bounds = self._level(tuple(path))
+        level = len(path)
+        return [Period(level, i, lord, bounds[i], bounds[i + 1]) for i, lord in enumerate(lords)]
+
+    def _level(self, path: Tuple[int, ...]):
+        cached = self._levels.get(path)
+        if cached is None:
+            parent_lords, parent_bounds = self._level(path[:-1])
+            i = path[-1]
+            lord, start, end = parent_lords[i], parent_bounds[i], parent_bounds[i + 1]
+            lords = tuple(sequence_from(lord))
+            span = end - start
+            bounds = [start]
+            for sub_lord in lords:
+                start += span * DASA_YEARS[sub_lord] / TOTAL_DASA_CYCLE
+                bounds.append(start)
+            bounds[-1] = end  # kayan nokta birikimini üst sınıra sabitle
+            cached = self._levels[path] = (lords, tuple(bounds))
+        return cached
+
+    def locate(self, jd: float, depth: int = 3) -> List[Period]:
+        """jd anında aktif periyotlar, Maha'dan başlayarak depth seviye"""
+        found: List[Period] = []
+        path: Tuple[int, ...] = ()
+        for level in range(depth):
+            lords, bounds = self._level(path)
+            i = bisect_right(bounds, jd) - 1
+            if i < 0 or i >= len(lords):
+                break
+            found.append(Period(level, i, lords[i], bounds[i], bounds[i + 1]))
+            path += (i,)
+        return found
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Burç (zodyak) meta verisi - tek kaynak.
+
+Tüm tablolar modül yüklenirken bir kez kurulan değiştirilemez tuple'lardır ve
+0 (Koç) - 11 (Balık) burç indeksiyle erişilir. SignInfo kaydı element,
+nitelik ve polariteyi tamsayı kodu olarak tutar; yerelleştirilmiş adlar
+(Türkçe/İngilizce) sadece serileştirme anında çözülür.
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# ─── Kodlar ─────────────────────────────────────────────────────
+
+FIRE, EARTH, AIR, WATER = range(4)
+CARDINAL, FIXED, MUTABLE = range(3)
+MASCULINE, FEMININE = range(2)
+
+ELEMENT_KEYS = ("fire", "earth", "air", "water")
+MODALITY_KEYS = ("cardinal", "fixed", "mutable")
+POLARITY_KEYS = ("masculine", "feminine")
+
+DEFAULT_LANG = "tr"
+UNKNOWN = {"tr": "Bilinmiyor", "en": "Unknown"}
+
+SIGN_NAMES: Dict[str, Tuple[str, ...]] = {
+    "tr": ("Koç", "Boğa", "İkizler", "Yengeç", "Aslan", "Başak",
+           "Terazi", "Akrep", "Yay", "Oğlak", "Kova", "Balık"),
+    "en": ("Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+           "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"),
+}
+ELEMENT_NAMES = {
+    "tr": ("Ateş", "Toprak", "Hava", "Su"),
+    "en": ("Fire", "Earth", "Air", "Water"),
+}
+MODALITY_NAMES = {
+    "tr": ("Kardinal", "Sabit", "Değişken"),
+    "en": ("Cardinal", "Fixed", "Mutable"),
+}
+POLARITY_NAMES = {
+    "tr": ("Erkek", "Dişi"),
+    "en": ("Masculine", "Feminine"),
+}
+
+# Geleneksel yöneticiler ve yücelim gezegenleri (calculate_dignity_scores ile aynı tablo)
+_RULERS = ("Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+           "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter")
+_EXALTATIONS = ("Sun", "Moon", None, "Jupiter", None, None,
+                "Saturn", None, None, "Mars", "Mercury", "Venus")
+
+
+class SignInfo(NamedTuple):
+    index: int  # 0 = Koç ... 11 = Balık
+    element: int  # FIRE / EARTH / AIR / WATER
+    modality: int  # CARDINAL / FIXED / MUTABLE
+    polarity: int  # MASCULINE / FEMININE
+    ruler: str  # geleneksel yönetici gezegen
+    exaltation: Optional[str]  # bu burçta yücelen gezegen
+
+    def to_dict(self, lang: str = DEFAULT_LANG) -> dict:
+        """Yerelleştirilmiş adlarla serileştir"""
+        return {
+            "sign": SIGN_NAMES[lang][self.index],
+            "element": ELEMENT_NAMES[lang][self.element],
+            "modality": MODALITY_NAMES[lang][self.modality],
+            "polarity": POLARITY_NAMES[lang][self.polarity],
+            "ruler": self.ruler,
+            "exaltation": self.exaltation,
+        }
+
+
+SIGNS: Tuple[SignInfo, ...] = tuple(
+    SignInfo(i, i % 4, i % 3, i % 2, _RULERS[i], _EXALTATIONS[i]) for i in range(12)
+)
+
+# Ad (Türkçe/İngilizce, büyük-küçük harf duyarsız) -> indeks
+_INDEX_BY_NAME: Dict[str, int] = {}
+for _names in SIGN_NAMES.values():
+    for _i, _name in enumerate(_names):
+        _INDEX_BY_NAME[_name] = _i
+        _INDEX_BY_NAME[_name.lower()] = _i
+
+
+# ─── Erişim ─────────────────────────────────────────────────────
+
+def sign_index(degree: float) -> int:
+    """Ekliptik boylamdan burç indeksi (0-11)"""
+    return int(degree % 360 // 30) % 12
+
+
+def sign_info(degree: float) -> SignInfo:
+    return SIGNS[sign_index(degree)]
+
+
+def index_of(name: Optional[str]) -> Optional[int]:
+    """Burç adından (Türkçe veya İngilizce) indeks; bilinmeyen ad -> None"""
+    if not name:
+        return None
+    index = _INDEX_BY_NAME.get(name)
+    if index is None:
+        index = _INDEX_BY_NAME.get(name.lower())
+    return index
+
+
+def info_for_name(name: Optional[str]) -> Optional[SignInfo]:
+    index = index_of(name)
+    return SIGNS[index] if index is not None else None
+
+
+def sign_name(degree: float, lang: str = DEFAULT_LANG) -> str:
+    """Boylamın burç adı"""
+    return SIGN_NAMES[lang][sign_index(degree)]
+
+
+def element_name(sign: Optional[str], lang: str = DEFAULT_LANG) -> str:
+    info = info_for_name(sign)
+    return ELEMENT_NAMES[lang][info.element] if info else UNKNOWN[lang]
+
+
+def modality_name(sign: Optional[str], lang: str = DEFAULT_LANG) -> str:
+    info = info_for_name(sign)
+    return MODALITY_NAMES[lang][info.modality] if info else UNKNOWN[lang]
+
+
+def polarity_name(sign: Optional[str], lang: str = DEFAULT_LANG) -> str:
+    info = info_for_name(sign)
+    return POLARITY_NAMES[lang][info.polarity] if info else UNKNOWN[lang]
@@ -336,7 +336,7 @@ const OrbisFirebase = {
       fetch("/api/stats/user-login", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ email: user.email, display_name: user.displayName || user.email }),
+        body: JSON.stringify({ uid: user.uid, email: user.email, display_name: user.displayName || user.email }),
       }).catch(() => {});
 
       // Heartbeat başlat (her 60sn)
@@ -448,7 +448,12 @@ const OrbisFirebase = {
         await fetch("/api/stats/user-created", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ is_premium: false })
+          body: JSON.stringify({
+            is_premium: false,
+            uid: this.user.uid,
+            email: this.user.email,
+            display_name: this.user.displayName,
+          })
         });
       } catch (e) {
         console.log("[Stats] user-created notification failed", e);
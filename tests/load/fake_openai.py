@@ -0,0 +1,182 @@
+"""
+Local OpenAI-compatible /chat/completions stand-in for AIService load tests.
+
+- Normal and streaming (SSE, `"stream": true`) responses
+- Configurable latency (time to first token), error rate and token rate
+- Counts TCP connections vs requests so connection reuse can be measured
+
+Standalone:  python tests/load/fake_openai.py --port 8089 --latency 0.2 --error-rate 0.1
+then point an ai_settings provider at base_url http://127.0.0.1:8089/v1
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+
+from aiohttp import web
+
+DEFAULT_TEXT = (
+    "Bu dönem kariyer alanında yeni fırsatlar belirginleşiyor. "
+    "İlişkilerde sabırlı ve açık iletişim ön planda. "
+) * 8
+
+
+class FakeOpenAIServer:
+    """aiohttp based fake provider, runs its own loop in a daemon thread."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, tokens_per_second: float = 0.0,
+                 text: str = DEFAULT_TEXT, error_status: int = 500, seed: int = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.tokens_per_second = tokens_per_second
+        self.text = text
+        self.error_status = error_status
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    # ─── Stats ──────────────────────────────────────────────────
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.streams = 0
+            self._transports = set()
+
+    @property
+    def connections(self) -> int:
+        return len(self._transports)
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests, connections = self.requests, len(self._transports)
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "streams": self.streams,
+            "connections": connections,
+            # 1.0 -> one connection served every request, 0.0 -> a new connection per request
+            "connection_reuse": round(1 - connections / requests, 3) if requests else 0.0,
+        }
+
+    # ─── Handler ────────────────────────────────────────────────
+
+    def _tokens(self):
+        return [w + " " for w in self.text.split(" ") if w]
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        with self._lock:
+            self.requests += 1
+            self._transports.add(request.transport)  # keep a reference: id() of a closed transport can be recycled
+            fail = self._random.random() < self.error_rate
+        payload = await request.json()
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            return web.json_response({"error": {"message": "fake provider error"}}, status=self.error_status)
+
+        tokens = self._tokens()
+        model = payload.get("model", "fake-model")
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+
+        if payload.get("stream"):
+            with self._lock:
+                self.streams += 1
+            resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await resp.prepare(request)
+            for token in tokens:
+                if delay:
+                    await asyncio.sleep(delay)
+                chunk = {"object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                await resp.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            done = {"object": "chat.completion.chunk", "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            await resp.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode())
+            await resp.write_eof()
+            return resp
+
+        if delay:
+            await asyncio.sleep(delay * len(tokens))
+        return web.json_response({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+        })
+
+    # ─── Lifecycle ──────────────────────────────────────────────
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            app = web.Application()
+            app.router.add_post("/v1/chat/completions", self._handle)
+            app.router.add_post("/chat/completions", self._handle)
+            self._runner = web.AppRunner(app, access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.port)
+            self._loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True, name="fake-openai")
+        self._thread.start()
+        ready.wait(5)
+        return self
+
+    def stop(self):
+        if not self._loop:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible provider")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before first token")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="0 = instant")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.latency, args.error_rate, args.tokens_per_second, port=args.port).start()
+    print(f"Fake provider: {server.base_url}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(5)
+            print(server.stats())
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,140 @@
+"""
+Load tests: /api/get_ai_interpretation -> AIService -> fake provider.
+
+Defaults are small so the suite stays fast; scale with env vars, e.g.
+    AI_LOAD_REQUESTS=500 AI_LOAD_CONCURRENCY=16 AI_LOAD_LATENCY=0.2 \
+        python -m pytest tests/load -q -s
+The report (req/s, p50/p95 latency, connection reuse) is printed with -s.
+"""
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import aiohttp
+import asyncio
+import pytest
+
+from fake_openai import FakeOpenAIServer
+from services.config_cache import config_cache
+
+REQUESTS = int(os.getenv("AI_LOAD_REQUESTS", "40"))
+CONCURRENCY = int(os.getenv("AI_LOAD_CONCURRENCY", "8"))
+LATENCY = float(os.getenv("AI_LOAD_LATENCY", "0.01"))
+ERROR_RATE = float(os.getenv("AI_LOAD_ERROR_RATE", "0.0"))
+TOKENS_PER_SECOND = float(os.getenv("AI_LOAD_TOKENS_PER_SECOND", "0"))
+
+PAYLOAD = {
+    "interpretation_type": "daily",
+    "astro_data": {"Sun": {"sign": "Koç", "degree": 12.5}},
+    "user_name": "Load Test",
+}
+
+
+def _ai_settings(*servers):
+    """ai_settings document pointing the fallback chain at the given servers."""
+    providers = [
+        {"name": f"fake-{i}", "base_url": s.base_url, "api_key": "test", "model": "fake-model"}
+        for i, s in enumerate(servers)
+    ]
+    keys = ["active_provider", "backup_1", "backup_2", "backup_3"]
+    settings = {"providers": providers}
+    settings.update({keys[i]: p["name"] for i, p in enumerate(providers)})
+    return settings
+
+
+def _use_providers(*servers):
+    settings = _ai_settings(*servers)
+    return patch.object(config_cache, "get", lambda name: settings if name == "ai_settings" else {})
+
+
+def run_load(app, total: int, concurrency: int) -> dict:
+    """Fire `total` requests from `concurrency` threads, return latency/throughput stats."""
+    latencies, failures = [], []
+    lock = threading.Lock()
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        started = time.perf_counter()
+        resp = local.client.post("/api/get_ai_interpretation", json=PAYLOAD)
+        elapsed = time.perf_counter() - started
+        body = resp.get_json() or {}
+        with lock:
+            latencies.append(elapsed)
+            if resp.status_code != 200 or not body.get("success"):
+                failures.append(body.get("error") or resp.status_code)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "failures": len(failures),
+        "req_per_sec": round(total / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+    }
+
+
+def _report(title: str, stats: dict, *servers):
+    provider = [s.stats() for s in servers]
+    print(f"\n[{title}] {json.dumps(stats)}")
+    for i, s in enumerate(provider):
+        print(f"  provider fake-{i}: {json.dumps(s)}")
+    return provider
+
+
+def test_fake_provider_streams_sse():
+    async def read_stream(url):
+        parts = []
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json={"model": "m", "messages": [], "stream": True}) as resp:
+                assert resp.headers["Content-Type"].startswith("text/event-stream")
+                async for line in resp.content:
+                    line = line.decode().strip()
+                    if not line.startswith("data: ") or line == "data: [DONE]":
+                        continue
+                    parts.append(json.loads(line[6:])["choices"][0]["delta"].get("content", ""))
+        return "".join(parts)
+
+    with FakeOpenAIServer(text="bir iki üç", tokens_per_second=1000) as server:
+        text = asyncio.run(read_stream(server.base_url + "/chat/completions"))
+        assert text.split() == ["bir", "iki", "üç"]
+        assert server.stats()["streams"] == 1
+
+
+def test_fallback_chain_moves_to_backup_under_errors(app):
+    with FakeOpenAIServer(error_rate=1.0) as primary, FakeOpenAIServer() as backup:
+        with _use_providers(primary, backup):
+            stats = run_load(app, total=10, concurrency=2)
+        _report("fallback", stats, primary, backup)
+
+    assert stats["failures"] == 0
+    assert primary.stats()["errors"] == 10
+    assert backup.stats()["requests"] == 10
+
+
+def test_ai_interpretation_throughput(app):
+    with FakeOpenAIServer(latency=LATENCY, error_rate=ERROR_RATE,
+                          tokens_per_second=TOKENS_PER_SECOND, seed=1) as primary, \
+            FakeOpenAIServer(latency=LATENCY, tokens_per_second=TOKENS_PER_SECOND) as backup:
+        with _use_providers(primary, backup):
+            stats = run_load(app, total=REQUESTS, concurrency=CONCURRENCY)
+        provider = _report("throughput", stats, primary, backup)
+
+    assert stats["failures"] == 0
+    assert provider[0]["requests"] == REQUESTS
+    assert stats["p95_ms"] >= LATENCY * 1000
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,87 @@
+import time
+
+from services.admin_overview import OverviewAggregator
+
+
+def make(interval=60):
+    return OverviewAggregator(use_redis=False, interval=interval)
+
+
+def test_sources_run_concurrently():
+    agg = make()
+    for name in ("a", "b", "c"):
+        agg.register(name, lambda r, n=name: (time.sleep(0.3), {n: r})[1], timeout=2)
+
+    started = time.time()
+    snapshot = agg.build("7d")
+
+    assert time.time() - started < 0.8
+    assert snapshot["parts"] == {"a": {"a": "7d"}, "b": {"b": "7d"}, "c": {"c": "7d"}}
+    assert all(s["ok"] for s in snapshot["sources"].values())
+    assert snapshot["generated_at"]
+
+
+def test_timed_out_source_keeps_previous_value():
+    agg = make()
+    slow = {"delay": 0}
+    agg.register("stats", lambda r: {"total_users": 5}, required=True)
+    agg.register("ga", lambda r: (time.sleep(slow["delay"]), {"gaPageViews": 10 + slow["delay"]})[1],
+                 timeout=0.2)
+
+    first = agg.build("7d")
+    assert first["parts"]["ga"] == {"gaPageViews": 10}
+
+    slow["delay"] = 1
+    started = time.time()
+    second = agg.build("7d")
+
+    assert time.time() - started < 0.6
+    assert second["parts"]["ga"] == {"gaPageViews": 10}
+    assert second["sources"]["ga"] == {"ok": False, "error": "timeout", "stale": True}
+
+
+def test_empty_result_does_not_overwrite_previous_value():
+    agg = make()
+    values = [{"adRevenue": 3}, {}]
+    agg.register("admob", lambda r: values.pop(0))
+
+    agg.build("7d")
+    snapshot = agg.build("7d")
+
+    assert snapshot["parts"]["admob"] == {"adRevenue": 3}
+    assert snapshot["sources"]["admob"]["stale"] is True
+
+
+def test_missing_required_source_yields_no_snapshot():
+    agg = make()
+    agg.register("stats", lambda r: None, required=True)
+    agg.register("ga", lambda r: {"gaPageViews": 1})
+
+    assert agg.build("7d") is None
+
+
+def test_get_serves_last_snapshot_without_recomputing():
+    agg = make(interval=60)
+    calls = []
+    agg.register("stats", lambda r: calls.append(r) or {"total_users": len(calls)}, required=True)
+
+    first = agg.get("30d")
+    second = agg.get("30d")
+
+    assert calls == ["30d"]
+    assert second is first
+
+
+def test_range_independent_sources_are_built_once_for_all_ranges():
+    agg = make(interval=60)
+    stats_calls, ga_calls = [], []
+    agg.register("stats", lambda r: stats_calls.append(r) or {"total_users": 3}, required=True, per_range=False)
+    agg.register("ga", lambda r: ga_calls.append(r) or {"range": r})
+
+    week, month = agg.get("7d"), agg.get("30d")
+
+    assert len(stats_calls) == 1
+    assert ga_calls == ["7d", "30d"]
+    assert week["parts"] == {"stats": {"total_users": 3}, "ga": {"range": "7d"}}
+    assert month["parts"]["ga"] == {"range": "30d"}
+    assert set(month["sources"]) == {"stats", "ga"}
@@ -0,0 +1,177 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from redis.exceptions import WatchError
+
+from services.ai_jobs import AIJobQueue, InMemoryJobStore, RedisJobStore, STATUS_DONE, STATUS_FAILED
+
+
+class FakeRedis:
+    """Hash commands plus WATCH/MULTI; `interfere` simulates a concurrent writer."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.interfere = None
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.hashes)
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.ops, self.watched = redis, [], None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self.watched = (key, dict(self.redis.hashes.get(key, {})))
+
+    def unwatch(self):
+        self.watched = None
+
+    def exists(self, key):
+        return self.redis.exists(key)
+
+    def multi(self):
+        interfere, self.redis.interfere = self.redis.interfere, None
+        if interfere:
+            interfere()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+    def execute(self):
+        if self.watched and self.redis.hashes.get(self.watched[0], {}) != self.watched[1]:
+            self.ops, self.watched = [], None
+            raise WatchError()
+        for name, args, kwargs in self.ops:
+            getattr(self.redis, name)(*args, **kwargs)
+        self.ops, self.watched = [], None
+
+
+def _wait_for(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job and job["status"] in (STATUS_DONE, STATUS_FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish in time")
+
+
+def test_job_runs_in_background_and_stores_result():
+    """Submit returns an id immediately; the result is available by polling."""
+    async def fake_interpretation(self, astro_data, interpretation_type, user_name, limiter=None, **kwargs):
+        assert limiter is not None
+        return {"success": True, "interpretation": f"{interpretation_type} for {user_name}"}
+
+    queue = AIJobQueue(store=InMemoryJobStore())
+    seen = []
+    with patch("services.ai_service.AIService.get_ai_interpretation_async", fake_interpretation):
+        job_id = queue.submit({}, "natal", "John Doe", on_success=seen.append)
+        job = _wait_for(queue, job_id)
+
+    assert job["status"] == STATUS_DONE
+    assert job["result"]["interpretation"] == "natal for John Doe"
+    assert len(seen) == 1
+    assert queue.pending == 0
+
+
+def test_failed_job_is_marked_failed():
+    async def failing(self, *args, **kwargs):
+        return {"success": False, "error": "all providers failed"}
+
+    queue = AIJobQueue(store=InMemoryJobStore())
+    with patch("services.ai_service.AIService.get_ai_interpretation_async", failing):
+        job = _wait_for(queue, queue.submit({}, "natal", "John Doe"))
+
+    assert job["status"] == STATUS_FAILED
+    assert job["result"]["error"] == "all providers failed"
+
+
+def test_submit_rejects_when_queue_full():
+    queue = AIJobQueue(store=InMemoryJobStore(), max_pending=1)
+    queue._pending = 1
+    assert queue.submit({}, "natal", "John Doe") is None
+
+
+class BrokenStore(InMemoryJobStore):
+    def save(self, job):
+        raise ConnectionError("redis down")
+
+
+def test_failed_save_releases_queue_slot():
+    queue = AIJobQueue(store=BrokenStore(), max_pending=1)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            queue.submit({}, "natal", "John Doe")
+    assert queue.pending == 0
+
+
+def test_route_refunds_usage_when_submit_fails(client):
+    from services.ai_jobs import ai_job_queue
+
+    client.application.config["PROPAGATE_EXCEPTIONS"] = False  # respond 500 as in production
+    refunded = []
+    with patch.object(ai_job_queue, "_store", BrokenStore()), \
+            patch("routes.main._requires_ad_response", return_value=None), \
+            patch("routes.main._record_ai_usage", return_value={}), \
+            patch("monetization.usage_tracker.UsageTracker.refund_usage",
+                  lambda self, device_id, day=None: refunded.append(device_id)):
+        response = client.post("/api/ai/jobs", json={"device_id": "dev-1", "astro_data": {}},
+                               headers={"X-Client-Platform": "android"})
+
+    assert response.status_code == 500
+    assert refunded == ["dev-1"]
+    assert ai_job_queue.pending == 0
+
+
+def test_failure_callback_runs_instead_of_success():
+    async def failing(self, *args, **kwargs):
+        raise RuntimeError("boom")
+
+    queue = AIJobQueue(store=InMemoryJobStore())
+    succeeded, failed = [], []
+    with patch("services.ai_service.AIService.get_ai_interpretation_async", failing):
+        job = _wait_for(queue, queue.submit({}, "natal", "John Doe",
+                                            on_success=succeeded.append, on_failure=failed.append))
+
+    assert job["status"] == STATUS_FAILED
+    assert succeeded == [] and failed[0]["error"] == "boom"
+
+
+def test_redis_store_updates_fields_without_overwriting_each_other():
+    redis = FakeRedis()
+    store = RedisJobStore(redis)
+    store.save({"id": "j1", "status": "queued", "created_at": 1.0})
+
+    # a concurrent writer touches the hash between WATCH and EXEC -> retried
+    redis.interfere = lambda: redis.hset("ai_job:j1", mapping={"started_at": "2.0"})
+    store.update("j1", status="done", result={"success": True})
+
+    assert store.get("j1") == {
+        "id": "j1", "status": "done", "created_at": 1.0, "started_at": 2.0, "result": {"success": True},
+    }
+    store.update("missing", status="done")
+    assert store.get("missing") is None
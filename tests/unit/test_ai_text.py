@@ -0,0 +1,46 @@
+import random
+import re
+
+from services.ai_text import StreamingTextCleaner, clean_ai_text
+
+
+def legacy_remove_emojis(text):
+    """The original AIService.remove_emojis, kept as the reference behaviour."""
+    emoji_pattern = re.compile(
+        "[\U0001f600-\U0001f64f\U0001f300-\U0001f5ff\U0001f680-\U0001f6ff\U0001f700-\U0001f77f"
+        "\U0001f780-\U0001f7ff\U0001f800-\U0001f8ff\U0001f900-\U0001f9ff\U0001fa00-\U0001fa6f"
+        "\U0001fa70-\U0001faff\U00002702-\U000027b0\U000024c2-\U0001f251\U0001f1e0-\U0001f1ff"
+        "\U00002600-\U000026ff\U00002700-\U000027bf\U0000fe00-\U0000fe0f\U0001f000-\U0001f02f"
+        "\U0001f0a0-\U0001f0ff]+",
+        flags=re.UNICODE,
+    )
+    cleaned = emoji_pattern.sub("", text)
+    cleaned = re.sub(r" +", " ", cleaned)
+    return "\n".join(line.strip() for line in cleaned.split("\n")).strip()
+
+
+ALPHABET = ["a", "ş", "İ", "ğ", ".", " ", " ", " ", "\n", "\t", "\r", "✨", "🚀", "☀", "️", "—", "ü"]
+
+
+def _random_texts(count=300, seed=42):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 80)))
+
+
+def test_clean_ai_text_matches_legacy():
+    for text in _random_texts():
+        assert clean_ai_text(text) == legacy_remove_emojis(text), repr(text)
+
+
+def test_streaming_cleaner_matches_full_text():
+    rng = random.Random(7)
+    for text in _random_texts():
+        cleaner = StreamingTextCleaner()
+        out, pos = [], 0
+        while pos < len(text):
+            step = rng.randint(1, 6)
+            out.append(cleaner.feed(text[pos:pos + step]))
+            pos += step
+        out.append(cleaner.flush())
+        assert "".join(out) == legacy_remove_emojis(text), repr(text)
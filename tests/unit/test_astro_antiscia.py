@@ -0,0 +1,64 @@
+import random
+
+from services.astro_antiscia import ANTISCIA, CONTRA_ANTISCIA, antiscion, contra_antiscion, find_contacts
+from services.astro_service import calculate_antiscia, calculate_antiscia_contacts, get_zodiac_sign
+
+
+def _reference(positions, orb=1.0):
+    """The previous quadratic implementation, kept for equivalence checks."""
+    degrees = {p: d["degree"] % 360 for p, d in positions.items() if isinstance(d, dict) and "degree" in d}
+    results = {}
+    for planet1, deg1 in degrees.items():
+        entry = {"original_degree": round(deg1, 2), "original_sign": get_zodiac_sign(deg1)}
+        for key, point in (("antiscia", (180 - deg1) % 360), ("contra_antiscia", (360 - deg1) % 360)):
+            connections = []
+            for planet2, deg2 in degrees.items():
+                if planet1 == planet2:
+                    continue
+                diff = abs(deg2 - point)
+                value = min(diff, 360 - diff)
+                if value <= orb:
+                    connections.append({"planet": planet2, "degree": round(deg2, 2),
+                                        "sign": get_zodiac_sign(deg2), "orb": round(value, 2)})
+            entry[key] = {"degree": round(point, 2), "sign": get_zodiac_sign(point),
+                          "connections": sorted(connections, key=lambda x: x["orb"])}
+        results[planet1] = entry
+    return results
+
+
+def test_reflections():
+    assert antiscion(10) == 170
+    assert antiscion(200) == 340
+    assert contra_antiscion(10) == 350
+    assert contra_antiscion(0) == 0
+
+
+def test_matches_previous_implementation_on_random_charts():
+    rng = random.Random(45)
+    for _ in range(200):
+        positions = {f"P{i}": {"degree": rng.uniform(-10, 370)} for i in range(rng.randint(0, 25))}
+        positions["Angle"] = {"sign": "Koç"}  # no degree -> ignored
+        orb = rng.choice((0.5, 1.0, 3.0))
+        assert calculate_antiscia(positions, orb=orb) == _reference(positions, orb=orb)
+
+
+def test_contacts_wrap_around_aries_point():
+    # antiscion of 179.5 is 0.5, contra-antiscion of 0.3 is 359.7
+    contacts = find_contacts([179.5, 0.3], [359.8, 100.0])
+    assert [(c.source, c.target, c.kind, round(c.orb, 2)) for c in contacts] == [
+        (0, 0, ANTISCIA, 0.7),
+        (1, 0, CONTRA_ANTISCIA, 0.1),
+    ]
+
+
+def test_transit_to_natal_contacts():
+    transit = {"Mars": {"degree": 45.0}, "Venus": {"degree": 300.0}}
+    natal = {"Sun": {"degree": 135.4}, "Moon": {"degree": 314.2}, "Asc": {"sign": "Koç"}}
+    contacts = calculate_antiscia_contacts(transit, natal)
+
+    assert [(c["planet"], c["natal_planet"], c["type"], c["orb"]) for c in contacts] == [
+        ("Mars", "Sun", "antiscia", 0.4),
+        ("Mars", "Moon", "contra_antiscia", 0.8),
+    ]
+    assert contacts[0]["degree"] == 135.0
+    assert contacts[0]["natal_degree"] == 135.4
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from services.astro_aspects import AspectEngine, get_engine
+from services.astro_service import calculate_aspects
+
+ANGLES = {"Conjunction": 0.0, "Sextile": 60.0, "Square": 90.0, "Trine": 120.0, "Opposition": 180.0}
+DEFAULT = {"Conjunction": 8.0, "Opposition": 8.0, "Trine": 8.0, "Square": 8.0, "Sextile": 6.0}
+
+
+def reference(positions1, positions2=None, orbs=DEFAULT):
+    """The previous nested loop, kept here to pin results for the default set."""
+    second = positions2 if positions2 is not None else positions1
+    found = []
+    for p1, v1 in positions1.items():
+        d1 = v1["degree"] % 360
+        for p2, v2 in second.items():
+            d2 = v2["degree"] % 360
+            if positions2 is None and p1 >= p2:
+                continue
+            diff = abs(d1 - d2)
+            aspect_diff = min(diff, 360 - diff)
+            best, best_orb = None, float("inf")
+            for name, ideal in ANGLES.items():
+                limit = orbs.get(name, 0.0)
+                if limit <= 0:
+                    continue
+                value = abs(aspect_diff - ideal)
+                if name == "Conjunction":
+                    value = min(abs(d1 - d2), 360 - abs(d1 - d2))
+                elif name == "Opposition":
+                    value = min(abs(d1 - d2 - 180) % 360, abs(d1 - d2 + 180) % 360)
+                if value <= limit and value < best_orb:
+                    best_orb = value
+                    best = {"planet1": p1, "planet2": p2, "aspect_type": name,
+                            "orb": round(value, 2), "exact_difference_0_180": round(aspect_diff, 2)}
+            if best:
+                found.append(best)
+    return sorted(found, key=lambda x: x["orb"])
+
+
+def chart(rng, n):
+    # mix exact multiples of 30 (ties, boundaries) with random longitudes, some outside 0-360
+    return {f"P{k}": {"degree": rng.choice([rng.randint(0, 12) * 30.0, rng.uniform(-10, 370)])}
+            for k in range(n)}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_default_set_matches_previous_loop(seed):
+    rng = random.Random(seed)
+    natal, transit = chart(rng, 31), chart(rng, 15)
+
+    assert calculate_aspects(natal) == reference(natal)
+    assert calculate_aspects(transit, natal) == reference(transit, natal)
+
+
+def test_custom_orbs_with_overlapping_windows_match_previous_loop():
+    rng = random.Random(7)
+    natal = chart(rng, 25)
+    orbs = {"Square": 20, "Trine": 20, "Opposition": 1, "Sextile": 0}
+
+    assert calculate_aspects(natal, orb=orbs) == reference(natal, orbs=orbs)
+
+
+def test_minor_aspects_are_opt_in():
+    positions = {"Sun": {"degree": 10.0}, "Moon": {"degree": 160.5}, "Venus": {"degree": 82.0}}
+
+    assert calculate_aspects(positions) == []
+    found = {(a["planet1"], a["planet2"]): (a["aspect_type"], a["orb"])
+             for a in calculate_aspects(positions, include_minor=True)}
+    assert found == {("Moon", "Sun"): ("Quincunx", 0.5), ("Sun", "Venus"): ("Quintile", 0.0)}
+
+
+def test_planet_orbs_narrow_the_pair_orb():
+    positions = {"Sun": {"degree": 0.0}, "Pluto": {"degree": 94.0}, "Mars": {"degree": 175.0}}
+
+    assert len(calculate_aspects(positions)) == 2
+    narrow = calculate_aspects(positions, planet_orbs={"Pluto": 2.0, "Sun": 4.0})
+    # Sun/Pluto limit is (4 + 2) / 2 = 3 < 4 orb; Mars keeps the 8 degree default -> (4 + 8) / 2 = 6
+    assert [(a["planet1"], a["planet2"]) for a in narrow] == [("Mars", "Sun")]
+
+
+def test_engine_is_reused_for_the_same_orb_set():
+    assert get_engine() is get_engine()
+    assert get_engine(include_minor=True) is not get_engine()
+    assert [a[0] for a in AspectEngine({"Trine": 5, "Square": 0}).aspects] == ["Trine"]
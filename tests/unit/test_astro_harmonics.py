@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from services import chart_db_service
+from services.astro_harmonics import HARMONICS, HarmonicMatrix
+from services.astro_vargas import VARGA_TABLES, varga_chart
+from services.astro_service import calculate_deep_harmonic_analysis, get_degree_in_sign, get_harmonic_chart, get_zodiac_sign
+
+
+def _reference_chart(harmonic, positions):
+    """The previous per-harmonic implementation, kept for equivalence checks."""
+    chart = {}
+    for name, data in positions.items():
+        if "degree" not in data:
+            continue
+        degree = (data["degree"] * harmonic) % 360
+        chart[name] = {"degree": round(degree, 2), "sign": get_zodiac_sign(degree),
+                       "degree_in_sign": round(get_degree_in_sign(degree), 2)}
+    return chart
+
+
+def test_matrix_matches_previous_implementation():
+    rng = random.Random(46)
+    positions = {f"P{i}": {"degree": rng.uniform(-20, 380)} for i in range(31)}
+    positions["Ascendant"] = {"degree": 359.99999999}
+    positions["Broken"] = {"sign": "Koç"}
+
+    analysis = calculate_deep_harmonic_analysis(None, positions)
+
+    assert list(analysis) == [f"H{h}" for h in HARMONICS]
+    for harmonic in HARMONICS:
+        entry = analysis[f"H{harmonic}"]
+        if harmonic in VARGA_TABLES:
+            assert entry["method"] == "parashari"
+            assert entry["planet_positions"] == varga_chart(positions, harmonic)
+        else:
+            assert entry["method"] == "harmonic"
+            assert entry["planet_positions"] == _reference_chart(harmonic, positions)
+        assert entry["name"] == HARMONICS[harmonic]["name"]
+
+    harmonic_only = HarmonicMatrix(positions).analysis(vargas=False)
+    for harmonic in HARMONICS:
+        assert harmonic_only[f"H{harmonic}"]["planet_positions"] == _reference_chart(harmonic, positions)
+    assert get_harmonic_chart(None, 5, positions) == _reference_chart(5, positions)
+
+
+def test_charts_materialize_lazily_and_once():
+    matrix = HarmonicMatrix({"Sun": {"degree": 100.0}, "Moon": {"degree": 215.5}})
+    assert matrix._charts == {}
+
+    analysis = matrix.analysis([9, 13])
+    assert list(analysis) == ["H9", "H13"]
+    assert set(matrix._charts) == {13}
+    assert set(matrix._vargas) == {9}
+    assert analysis["H9"]["planet_positions"]["Sun"] == {"degree": 180.0, "sign": "Terazi", "degree_in_sign": 0.0}
+    assert matrix.varga(9) is analysis["H9"]["planet_positions"]
+    assert matrix.chart(13) is analysis["H13"]["planet_positions"]
+    assert matrix.signs(2) == [6, 2]
+    assert set(matrix.rows) == {2, 13}
+
+
+def test_varga_backed_harmonics_skip_rows():
+    matrix = HarmonicMatrix({"Sun": {"degree": 100.0}, "Moon": {"degree": 215.5}})
+    matrix.analysis()
+    assert set(matrix.rows) == set(HARMONICS) - set(VARGA_TABLES)
+
+
+def test_natal_key_changes_with_schema_version(monkeypatch):
+    key = chart_db_service._make_natal_key("1990-05-17", "14:30:00", 41.0, 29.0)
+    monkeypatch.setattr(chart_db_service, "NATAL_SCHEMA_VERSION", chart_db_service.NATAL_SCHEMA_VERSION + 1)
+    assert chart_db_service._make_natal_key("1990-05-17", "14:30:00", 41.0, 29.0) != key
+
+
+def test_invalid_harmonic_is_rejected():
+    with pytest.raises(ValueError):
+        HarmonicMatrix({}, (0,))
+    assert get_harmonic_chart(None, 0, {"Sun": {"degree": 1.0}}) == {}
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from services.astro_midpoints import MidpointEngine, analyze_midpoints, midpoint
+from services.astro_service import get_midpoint_aspects
+
+WEIGHTS = {"Conjunction/Opposition": 5, "Square": 4, "Sesquiquadrate": 3, "Semisquare": 2}
+
+
+def reference(positions, orb=2.0):
+    """The previous O(n^3) loop, kept here to pin the default-dial output.
+
+    Only change: the separation is folded to 0-180 (the old `% 180` labelled a
+    225 degree separation as a semisquare instead of a sesquiquadrate)."""
+    keys = list(positions)
+    results = {}
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            d1, d2 = positions[keys[i]] % 360, positions[keys[j]] % 360
+            mid = ((d1 + d2 + 360) / 2.0 if abs(d1 - d2) > 180 else (d1 + d2) / 2.0) % 360
+            aspects = []
+            for k in keys:
+                if k in (keys[i], keys[j]):
+                    continue
+                diff = abs(mid - positions[k] % 360) % 360
+                diff = min(diff, 360 - diff)
+                kind = None
+                if abs(diff) <= orb or abs(diff - 180) <= orb:
+                    kind, found = "Conjunction/Opposition", min(abs(diff), abs(diff - 180)) % 180
+                elif abs(diff - 90) <= orb:
+                    kind, found = "Square", abs(diff - 90)
+                elif abs(diff - 45) <= orb:
+                    kind, found = "Semisquare", abs(diff - 45)
+                elif abs(diff - 135) <= orb:
+                    kind, found = "Sesquiquadrate", abs(diff - 135)
+                if kind:
+                    aspects.append({"celestial_body": k, "aspect_type": kind,
+                                    "weight": WEIGHTS[kind], "orb": round(found, 2)})
+            aspects = [a for a in aspects if a["weight"] >= 4 or (a["weight"] == 3 and a["orb"] <= 0.7)]
+            if aspects:
+                results[f"{keys[i]}/{keys[j]}"] = (round(mid, 2), sorted(aspects, key=lambda a: a["orb"]))
+    return results
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_default_dial_matches_previous_algorithm(seed):
+    rng = random.Random(seed)
+    positions = {f"P{n}": rng.uniform(0, 360) for n in range(31)}
+    chart = {name: {"degree": deg} for name, deg in positions.items()}
+    chart["Broken"] = {"error": "no degree"}
+
+    result = get_midpoint_aspects(chart)
+    expected = reference(positions)
+
+    assert list(result) == list(expected)
+    for key, (degree, aspects) in expected.items():
+        assert result[key]["degree"] == degree
+        assert result[key]["aspects"] == aspects
+
+
+def test_midpoint_uses_short_arc():
+    assert midpoint(350, 10) == 0
+    assert midpoint(10, 350) == 0
+    assert midpoint(100, 200) == 150
+
+
+def test_dial_sizes_select_harmonic():
+    def pair_hits(dial, degrees):
+        return [(h.point, h.aspect_type) for h in MidpointEngine(dial=dial).find(degrees) if (h.first, h.second) == (0, 1)]
+
+    # midpoint of 0/30 is 15; a point at 37.5 is 22.5 away (16th harmonic only)
+    assert pair_hits(45.0, [0, 30, 37.5]) == []
+    assert pair_hits(22.5, [0, 30, 37.5]) == [(2, "Semioctile")]
+
+    # a point at 60 is 45 away: visible on the 45 dial but not on the 90 dial
+    assert pair_hits(45.0, [0, 30, 60]) == [(2, "Semisquare")]
+    assert pair_hits(90.0, [0, 30, 60]) == []
+    assert pair_hits(90.0, [0, 30, 105]) == [(2, "Square")]
+
+
+def test_orb_and_significance_filter():
+    positions = {"A": 0, "B": 30, "C": 195.5, "D": 105.0}
+    result = analyze_midpoints(positions, orb=1.0)
+    # C is 0.5 from the opposition of A/B, D is exactly square to it
+    assert [a["celestial_body"] for a in result[("A", "B")][1]] == ["D", "C"]
+    tight = analyze_midpoints(positions, orb=0.25)
+    assert [a["celestial_body"] for a in tight[("A", "B")][1]] == ["D"]
+
+
+def test_invalid_dial_rejected():
+    with pytest.raises(ValueError):
+        MidpointEngine(dial=30.0)
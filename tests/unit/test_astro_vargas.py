@@ -0,0 +1,54 @@
+import random
+
+from services.astro_vargas import (
+    ARIES, AQUARIUS, CANCER, CAPRICORN, GEMINI, LEO, LIBRA, PISCES, SAGITTARIUS, SCORPIO, TAURUS, VARGAS, VIRGO,
+    varga_chart, varga_longitude, varga_sign,
+)
+
+
+def test_all_parashari_vargas_are_tabulated():
+    assert set(VARGAS) >= {1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60}
+
+
+def test_hora_follows_odd_even_rule():
+    assert varga_sign(10, 2) == LEO  # Aries, first half -> Sun
+    assert varga_sign(20, 2) == CANCER
+    assert varga_sign(40, 2) == CANCER  # Taurus, first half -> Moon
+    assert varga_sign(50, 2) == LEO
+
+
+def test_drekkana_and_dasamsa_offsets():
+    assert [varga_sign(30 + d, 3) for d in (1, 11, 21)] == [TAURUS, VIRGO, CAPRICORN]
+    assert varga_sign(30.5, 10) == CAPRICORN  # even sign counts from the 9th
+    assert varga_sign(0.5, 10) == ARIES
+
+
+def test_navamsa_equals_ninth_harmonic_sign():
+    rng = random.Random(47)
+    for _ in range(1000):
+        lon = rng.uniform(0, 360)
+        assert varga_sign(lon, 9) == int(lon * 9 % 360 // 30)
+        assert abs(varga_longitude(lon, 9) - lon * 9 % 360) < 1e-6
+
+
+def test_modality_and_element_starts():
+    assert varga_sign(30.1, 16) == LEO  # fixed sign starts from Leo
+    assert varga_sign(60.1, 20) == LEO  # mutable sign starts from Leo in D20
+    assert varga_sign(30.1, 27) == CANCER  # earth sign starts from Cancer
+    assert varga_sign(30.1, 24) == CANCER
+    assert varga_sign(30.1, 40) == LIBRA
+    assert varga_sign(60.1, 45) == SAGITTARIUS
+
+
+def test_trimsamsa_uses_unequal_parts():
+    odd = [varga_sign(d, 30) for d in (2, 7, 15, 20, 29.9)]
+    even = [varga_sign(30 + d, 30) for d in (2, 7, 15, 22, 29.9)]
+    assert odd == [ARIES, AQUARIUS, SAGITTARIUS, GEMINI, LIBRA]
+    assert even == [TAURUS, VIRGO, PISCES, CAPRICORN, SCORPIO]
+    # 10°-18° Sagittarius part scaled to a full sign
+    assert varga_longitude(14, 30) == SAGITTARIUS * 30 + 15
+
+
+def test_chart_shape():
+    chart = varga_chart({"Sun": {"degree": 725.0}, "Asc": {"sign": "Koç"}}, 60)
+    assert chart == {"Sun": {"degree": 300.0, "sign": "Kova", "degree_in_sign": 0.0}}
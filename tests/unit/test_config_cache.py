@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from services.config_cache import ConfigCache
+
+
+class FakeRedis:
+    """Minimal dict-backed stand-in for the redis commands ConfigCache uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+
+    def execute(self):
+        for name, args in self.ops:
+            getattr(self.redis, name)(*args)
+
+
+def test_workers_share_one_firestore_read():
+    redis = FakeRedis()
+    worker_a = ConfigCache(redis_client=redis)
+    worker_b = ConfigCache(redis_client=redis)
+
+    with patch.object(ConfigCache, "_load_from_firestore", return_value={"daily": 30}) as load:
+        assert worker_a.get("pricing") == {"daily": 30}
+        assert worker_b.get("pricing") == {"daily": 30}
+        assert worker_a.get("pricing") == {"daily": 30}
+
+    assert load.call_count == 1
+
+
+def test_invalidate_propagates_to_other_workers():
+    redis = FakeRedis()
+    worker_a = ConfigCache(redis_client=redis)
+    worker_b = ConfigCache(redis_client=redis)
+
+    with patch.object(ConfigCache, "_load_from_firestore", return_value={"daily": 30}):
+        worker_b.get("pricing")
+
+    worker_a.invalidate("pricing")
+    worker_b._checked_at.clear()  # skip the version check interval
+
+    with patch.object(ConfigCache, "_load_from_firestore", return_value={"daily": 45}) as load:
+        assert worker_b.get("pricing") == {"daily": 45}
+        assert worker_a.get("pricing") == {"daily": 45}
+
+    assert load.call_count == 1
+
+
+def test_without_redis_falls_back_to_process_cache():
+    cache = ConfigCache(use_redis=False)
+    with patch.object(ConfigCache, "_load_from_firestore", return_value={"providers": []}) as load:
+        cache.get("ai_settings")
+        cache.get("ai_settings")
+    assert load.call_count == 1
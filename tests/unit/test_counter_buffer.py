@@ -0,0 +1,73 @@
+import importlib.util
+import logging
+import os
+from types import SimpleNamespace
+
+from services import counter_buffer
+from services.counter_buffer import CounterBuffer
+
+
+def test_deltas_are_coalesced_into_one_flush():
+    writes = []
+    buffer = CounterBuffer(lambda *batch: writes.append(batch), interval=3600)
+
+    for _ in range(5):
+        buffer.add("total_analyses")
+        buffer.add_daily("analyses_today", day="2026-01-01")
+    buffer.add("total_users", 2)
+    buffer.add("total_users", -2)
+    buffer.set_field("last_login_email", "a@b.c")
+    buffer.set_field("last_login_email", "d@e.f")
+
+    assert buffer.flush()
+    assert writes == [(
+        {"total_analyses": 5},
+        {"2026-01-01": {"analyses_today": 5}},
+        {"last_login_email": "d@e.f"},
+    )]
+    assert buffer.flush()  # nothing pending -> no write
+    assert len(writes) == 1
+
+
+def test_failed_flush_keeps_deltas_for_next_flush():
+    writes = []
+    fail = [True]
+
+    def flush(*batch):
+        if fail[0]:
+            raise RuntimeError("firestore unavailable")
+        writes.append(batch)
+
+    buffer = CounterBuffer(flush, interval=3600)
+    buffer.add("total_ads_watched", 3)
+    assert not buffer.flush()
+
+    buffer.add("total_ads_watched", 1)
+    fail[0] = False
+    assert buffer.flush()
+    assert writes == [({"total_ads_watched": 4}, {}, {})]
+
+
+def test_shutdown_flushes_pending():
+    writes = []
+    buffer = CounterBuffer(lambda *batch: writes.append(batch), interval=3600)
+    buffer.add("total_users")
+    buffer.shutdown()
+    assert writes == [({"total_users": 1}, {}, {})]
+
+
+def test_gunicorn_worker_exit_flushes_registered_buffers():
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "gunicorn.conf.py")
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", path)
+    gunicorn_conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gunicorn_conf)
+
+    writes = []
+    buffer = counter_buffer.register(CounterBuffer(lambda *batch: writes.append(batch), interval=3600))
+    try:
+        buffer.add("total_analyses")
+        gunicorn_conf.worker_exit(SimpleNamespace(log=logging.getLogger("gunicorn")), None)
+    finally:
+        counter_buffer._buffers.remove(buffer)
+
+    assert writes == [({"total_analyses": 1}, {}, {})]
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.firestore_pagination import (
+    CountCache, InvalidPageToken, decode_page_token, encode_page_token, paginate,
+)
+
+IDS = [f"user{i:02d}" for i in range(7)]
+
+
+class FakeQuery:
+    def __init__(self, after=None, limit=None):
+        self.after, self._limit = after, limit
+
+    def start_after(self, snapshot):
+        return FakeQuery(snapshot.id, self._limit)
+
+    def limit(self, n):
+        return FakeQuery(self.after, n)
+
+    def stream(self):
+        start = IDS.index(self.after) + 1 if self.after else 0
+        return [SimpleNamespace(id=i) for i in IDS[start:start + self._limit]]
+
+
+class FakeCollection:
+    def __init__(self):
+        self.reads = 0
+
+    def document(self, doc_id):
+        def get():
+            self.reads += 1
+            return SimpleNamespace(id=doc_id, exists=doc_id in IDS)
+        return SimpleNamespace(get=get)
+
+
+def test_page_token_roundtrip_and_garbage():
+    assert decode_page_token(encode_page_token("abc/ç")) == "abc/ç"
+    assert decode_page_token("not-a-token!") is None
+    assert decode_page_token(None) is None
+
+
+def test_paginate_walks_all_pages_with_one_cursor_read_each():
+    collection, seen, token = FakeCollection(), [], None
+    while True:
+        docs, token = paginate(FakeQuery(), collection, 3, token)
+        seen.extend(d.id for d in docs)
+        if not token:
+            break
+    assert seen == IDS
+    assert collection.reads == 2
+
+
+def test_deleted_cursor_or_garbage_token_is_rejected():
+    with pytest.raises(InvalidPageToken):
+        paginate(FakeQuery(), FakeCollection(), 3, encode_page_token("deleted-user"))
+    with pytest.raises(InvalidPageToken):
+        paginate(FakeQuery(), FakeCollection(), 3, "not-a-token!")
+
+
+def test_count_cache_reuses_value_within_ttl():
+    calls = []
+    cache = CountCache(ttl=60)
+    assert cache.get("users", lambda: calls.append(1) or 42) == 42
+    assert cache.get("users", lambda: calls.append(1) or 43) == 42
+    cache.invalidate("users")
+    assert cache.get("users", lambda: calls.append(1) or 44) == 44
+    assert len(calls) == 2
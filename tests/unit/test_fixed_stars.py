@@ -0,0 +1,58 @@
+import swisseph as swe
+
+from services.fixed_stars import STAR_NAMES, StarCatalogue, StarPosition, _interpolate, parse_catalogue
+
+
+def test_star_list_has_no_duplicates():
+    assert len(STAR_NAMES) == len(set(STAR_NAMES))
+    assert "Formalhaut" not in STAR_NAMES
+
+
+def test_parse_catalogue(tmp_path):
+    path = tmp_path / "sefstars.txt"
+    path.write_text(
+        "# comment\n"
+        "Aldebaran,alTau,ICRS,04,35,55.23907,+16,30,33.4885,63.45,-188.94,54.398,48.94,0.86,  0, 0\n"
+        "Deneb Algedi,deCap,ICRS,21,47,02.44424,-16,07,38.2335,261.67,-296.23,-6.4,84.27,2.85,  0, 0\n"
+        "broken line\n"
+    )
+    index = parse_catalogue(str(path))
+
+    assert index["aldebaran"].nomenclature == "alTau"
+    assert index["denebalgedi"].magnitude == 2.85
+
+    catalogue = StarCatalogue(names=("Aldebaran", "Deneb_Algedi", "Unknown"), catalogue_path=str(path))
+    assert catalogue.stars() == [("Aldebaran", ",alTau", 0.86), ("Deneb_Algedi", ",deCap", 2.85),
+                                 ("Unknown", "unknown", None)]
+
+
+def test_interpolated_position_matches_swisseph():
+    catalogue = StarCatalogue(names=("Spica",), catalogue_path="/nonexistent/sefstars.txt")
+    for jd in (2433282.5, 2447893.1, 2451545.0, 2460000.75):
+        star = catalogue.positions(jd)[0]
+        exact = swe.fixstar_ut("spica", jd, swe.FLG_SWIEPH)[0]
+        assert abs(star.longitude - exact[0]) < 0.01
+        assert abs(star.latitude - exact[1]) < 0.01
+
+
+def test_interpolation_wraps_at_aries_point():
+    assert abs(_interpolate(359.9, 0.1, 0.5)) < 1e-9
+    assert _interpolate(10.0, 12.0, 0.25) == 10.5
+
+
+class FixedCatalogue(StarCatalogue):
+    def __init__(self, stars):
+        super().__init__(names=())
+        self._fixed = [StarPosition(name, lon, 0.0, 1.0) for name, lon in stars]
+
+    def positions(self, jd_ut):
+        return self._fixed
+
+
+def test_conjunctions_use_orb_window_and_wrap():
+    catalogue = FixedCatalogue([("A", 359.6), ("B", 120.0), ("C", 121.5)])
+    hits = catalogue.conjunctions(0, {"Sun": 0.2, "Moon": 120.7, "Mars": 200.0}, orb=1.0)
+
+    assert [(h["star"], h["point"], h["orb"]) for h in hits] == [
+        ("A", "Sun", 0.6), ("B", "Moon", 0.7), ("C", "Moon", 0.8),
+    ]
@@ -0,0 +1,73 @@
+import swisseph as swe
+
+from datetime import datetime
+
+from services.astro_service import calculate_azimuth_altitude_for_bodies
+from services.horizon import HorizonFrame, altitude_series, horizon_crossings
+
+JD = 2460000.3
+LAT, LON = 41.0, 29.0
+
+
+def test_frame_matches_swe_azalt():
+    frame = HorizonFrame(JD, LAT, LON)
+    for body in range(10):
+        lon, lat, dist = swe.calc_ut(JD, body)[0][:3]
+        expected = swe.azalt(JD, swe.ECL2HOR, [LON, LAT, 0], 1013.25, 15.0, [lon, lat, dist])
+        position = frame.transform(lon, lat, refraction=lambda alt: swe.refrac(alt, 1013.25, 15.0, swe.TRUE_TO_APP))
+
+        assert abs(position.azimuth - expected[0]) < 1e-6
+        assert abs(position.true_altitude - expected[1]) < 1e-6
+        assert abs(position.apparent_altitude - expected[2]) < 1e-3
+
+
+def test_bodies_output_shape_and_refraction_switch():
+    positions = {
+        "Sun": {"degree": 150.0, "latitude": 0.0, "distance": 1.0},
+        "Mars": {"degree": 40.0, "latitude": 1.2, "distance": 1.5},
+        "Ascendant": {"degree": 12.0},  # no latitude/distance -> skipped
+    }
+    dt = datetime(2023, 2, 24, 22, 0)
+    result = calculate_azimuth_altitude_for_bodies(dt, LAT, LON, 0, positions)
+    plain = calculate_azimuth_altitude_for_bodies(dt, LAT, LON, 0, positions, refraction=False)
+
+    assert set(result) == {"Sun", "Mars"}
+    assert set(result["Sun"]) == {"azimuth", "true_altitude", "apparent_altitude", "is_above_horizon"}
+    assert plain["Mars"]["apparent_altitude"] == plain["Mars"]["true_altitude"]
+    assert result["Mars"]["azimuth"] == plain["Mars"]["azimuth"]
+
+
+def test_bodies_refraction_uses_observer_elevation():
+    dt = datetime(2023, 2, 24, 22, 0)
+    jd = swe.julday(2023, 2, 24, 19.0)
+    frame = HorizonFrame(jd, LAT, LON)
+    # bodies just below the geometric horizon, where the dip at altitude matters
+    positions = {}
+    for tenth in range(3600):
+        lon = tenth / 10
+        if -1.0 < frame.transform(lon).true_altitude < -0.3:
+            positions[f"P{tenth}"] = {"degree": lon, "latitude": 0.0, "distance": 1.0}
+    assert positions
+
+    for elevation in (0, 1500):
+        result = calculate_azimuth_altitude_for_bodies(dt, LAT, LON, elevation, positions)
+        for name, data in positions.items():
+            expected = swe.azalt(jd, swe.ECL2HOR, [LON, LAT, elevation], 1013.25, 15.0,
+                                 [data["degree"], 0.0, 1.0])
+            assert abs(result[name]["apparent_altitude"] - round(expected[2], 2)) <= 0.01
+
+
+def test_altitude_series_tracks_exact_positions_and_finds_crossings():
+    jds = [JD + i / 96 for i in range(97)]  # 24 hours, 15 minute steps
+    lon, lat, _, speed, lat_speed = swe.calc_ut(JD, swe.MOON, swe.FLG_SWIEPH | swe.FLG_SPEED)[0][:5]
+    series = altitude_series(jds, LAT, LON, lon, lat, speed, lat_speed)
+
+    for jd, altitude in list(zip(jds, series))[::12]:
+        exact = swe.calc_ut(jd, swe.MOON)[0]
+        expected = swe.azalt(jd, swe.ECL2HOR, [LON, LAT, 0], 0, 0, [exact[0], exact[1], exact[2]])[1]
+        assert abs(altitude - expected) < 0.3  # linear Moon motion over a day
+
+    events = horizon_crossings(jds, series)
+    assert {kind for _, kind in events} <= {"rise", "set"}
+    assert all(jds[0] <= jd <= jds[-1] for jd, _ in events)
+    assert horizon_crossings([0.0, 1.0], [-1.0, 3.0]) == [(0.25, "rise")]
@@ -0,0 +1,141 @@
+import gzip
+import json
+from datetime import date, datetime, time
+
+import redis
+
+from services import chart_db_service, redis_client
+from services.json_response import (
+    CompressedStore,
+    Fragment,
+    compose,
+    dumps,
+    json_response,
+    negotiate,
+)
+
+
+def test_dumps_handles_datetimes_and_non_string_keys():
+    payload = {"when": datetime(2024, 3, 1, 12, 30), "day": date(2024, 3, 1), "at": time(9, 5), 1: "x"}
+    assert json.loads(dumps(payload)) == {
+        "when": "2024-03-01T12:30:00", "day": "2024-03-01", "at": "09:05:00", "1": "x",
+    }
+    assert json.loads(dumps({"b": 1, "a": 2}, sort_keys=True).decode()) == {"a": 2, "b": 1}
+    assert list(json.loads(dumps({"b": 1, "a": 2}, sort_keys=True))) == ["a", "b"]
+
+
+def test_compose_splices_fragments_verbatim():
+    body = compose([("planets", Fragment.of('{"Sun": 1.5}')), ("status", "full_hit")])
+    assert body == b'{"planets":{"Sun": 1.5},"status":"full_hit"}'
+    assert json.loads(body) == {"planets": {"Sun": 1.5}, "status": "full_hit"}
+
+
+def test_negotiate_respects_quality_values():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, deflate") is None
+    assert negotiate("*") in ("br", "gzip")
+    assert negotiate(None) is None
+
+
+def test_compressed_store_keeps_one_copy_per_key():
+    store = CompressedStore(use_redis=False, max_size=2)
+    body = b'{"a":' + b"1" * 2000 + b"}"
+    first = store.compressed("chart:x", body, "gzip")
+    assert gzip.decompress(first) == body
+    assert store.compressed("chart:x", b"ignored", "gzip") is first
+
+    store.put("k1", b"1")
+    store.put("k2", b"2")
+    assert store.get("chart:x:gzip") is None  # evicted (LRU)
+    assert store.get("k2") == b"2"
+
+
+class FakeRedis:
+    """Stores bytes like a server; decodes replies the way redis-py does."""
+
+    data = {}
+
+    def __init__(self, decode_responses):
+        self.decode_responses = decode_responses
+
+    def ping(self):
+        return True
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value if isinstance(value, bytes) else value.encode()
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value.decode() if value is not None and self.decode_responses else value
+
+
+def test_compressed_store_reads_binary_from_redis(monkeypatch):
+    FakeRedis.data = {}
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(redis.Redis, "from_url",
+                        classmethod(lambda cls, url, decode_responses=False, **kw: FakeRedis(decode_responses)))
+    redis_client.reset_redis_client()
+    try:
+        body = b'{"a":' + b"1" * 2000 + b"}"
+        stored = CompressedStore().compressed("chart:x", body, "gzip")
+        assert FakeRedis.data["json_body:chart:x:gzip"] == stored
+
+        fresh = CompressedStore()
+        assert fresh.get("chart:x:gzip") == stored
+        assert gzip.decompress(fresh.compressed("chart:x", b"ignored", "gzip")) == body
+
+        # the shared str client cannot read compressed bodies back
+        assert redis_client.get_redis().decode_responses
+        assert CompressedStore(redis_client=redis_client.get_redis()).get("chart:x:gzip") is None
+    finally:
+        redis_client.reset_redis_client()
+
+
+def test_json_response_compresses_large_bodies_only(app):
+    large = dumps({"data": "x" * 4000})
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = json_response(large)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.get_data()) == large
+
+        small = json_response(b'{"ok":true}')
+        assert "Content-Encoding" not in small.headers
+        assert small.mimetype == "application/json"
+
+
+def test_flask_json_provider_serializes_datetimes(app):
+    assert json.loads(app.json.dumps({"b": datetime(2024, 1, 2), "a": 1})) == {"a": 1, "b": "2024-01-02T00:00:00"}
+    assert app.json.dumps({"b": 1, "a": 2}).startswith('{"a"')
+
+    class DatetimeWithNanoseconds(datetime):  # Firestore timestamps subclass datetime
+        pass
+
+    stamp = DatetimeWithNanoseconds(2024, 1, 2, 3, 4, 5)
+    assert json.loads(app.json.dumps({"t": stamp})) == {"t": "2024-01-02T03:04:05"}
+    assert json.loads(app.json.dumps({"t": stamp}, indent=2)) == {"t": "2024-01-02T03:04:05"}
+    rendered = app.jinja_env.from_string("{{ data|tojson }}").render(data={"k": "<b>"})
+    assert "<b>" not in rendered
+
+
+def test_cached_chart_body_is_spliced_from_stored_strings(monkeypatch):
+    natal = {"natal_planet_positions": '{"Sun": {"degree": 10.5}}', "_created_at": "2026-01-01"}
+    transit = {"transit_positions": '{"Sun": {"degree": 200.0}}', "_transit_date": "2026-10-19"}
+    monkeypatch.setattr(chart_db_service, "_read_natal_doc", lambda key: natal)
+    monkeypatch.setattr(chart_db_service, "_read_transit_doc", lambda key, day: transit)
+    monkeypatch.setattr(json, "loads", None)  # must not decode the stored fragments
+
+    body, cache_key = chart_db_service.get_cached_chart_body(
+        "1990-05-17", "14:30:00", 41.0, 29.0, {"date": "2026-10-19"}
+    )
+    monkeypatch.undo()
+
+    result = json.loads(body)
+    assert result["natal_planet_positions"] == {"Sun": {"degree": 10.5}}
+    assert result["transit_positions"] == {"Sun": {"degree": 200.0}}
+    assert result["_cache_status"] == "full_hit"
+    assert "_created_at" not in result
+    assert cache_key == f"chart:{result['_natal_key']}_2026-10-19"
+
+    monkeypatch.setattr(chart_db_service, "_read_natal_doc", lambda key: None)
+    assert chart_db_service.get_cached_chart_body("1990-05-17", "14:30:00", 41.0, 29.0) is None
@@ -0,0 +1,53 @@
+from services.presence import InMemoryPresenceStore, PresenceTracker
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db, self.ops = db, []
+
+    def set(self, ref, data):
+        self.ops.append((ref, data))
+
+    def commit(self):
+        self.db.commits.append(self.ops)
+
+
+class FakeDB:
+    def __init__(self):
+        self.commits = []
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def collection(self, name):
+        return self
+
+    def document(self, key):
+        return key
+
+
+def test_store_range_query_returns_latest_first_without_duplicates():
+    store = InMemoryPresenceStore()
+    store.touch("a@x.com", "A", 100)
+    store.touch("b@x.com", "B", 200)
+    store.touch("a@x.com", "A", 300)
+
+    assert [u["email"] for u in store.since(150)] == ["a@x.com", "b@x.com"]
+    assert store.count_since(250) == 1
+
+    store.prune(250)
+    assert [u["email"] for u in store.since(0)] == ["a@x.com"]
+
+
+def test_heartbeats_are_persisted_in_one_batch_per_interval():
+    db = FakeDB()
+    tracker = PresenceTracker(store=InMemoryPresenceStore(), db=db, persist_interval=3600)
+    for _ in range(3):
+        tracker.heartbeat("a@x.com", "A")
+    tracker.heartbeat("b@x.com", "B")
+
+    assert db.commits == []
+    assert tracker.persist() == 2
+    assert len(db.commits) == 1
+    assert sorted(ref for ref, _ in db.commits[0]) == ["a_at_x_dot_com", "b_at_x_dot_com"]
+    assert tracker.persist() == 0
@@ -0,0 +1,114 @@
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from services.push_campaign import (
+    GENERAL_GROUP, DailyPushCampaign, group_key_for_user, group_label, sun_sign_index_from_date,
+)
+
+
+class PreconditionFailed(Exception):
+    pass
+
+
+class FakeCampaignDoc:
+    def __init__(self):
+        self.data, self.version = None, 0
+
+    def get(self):
+        data = self.data
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: data, update_time=self.version)
+
+    def set(self, data, merge=False):
+        self.data = self.data or {}
+        _merge(self.data, data)
+        self.version += 1
+
+    def update(self, fields, option=None):
+        if option is not None and option != self.version:
+            raise PreconditionFailed()
+        for path, value in fields.items():
+            node = self.data
+            *parents, leaf = path.split(".")
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[leaf] = value
+        self.version += 1
+
+
+def _merge(target, data):
+    for key, value in data.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class FakeCampaignDB:
+    def __init__(self, users):
+        self.campaign = FakeCampaignDoc()
+        self.users = users
+        self.logs = []
+
+    def collection(self, name):
+        return SimpleNamespace(
+            document=lambda key: self.campaign,
+            select=lambda fields: SimpleNamespace(
+                stream=lambda: [SimpleNamespace(id=uid, to_dict=lambda d=d: d) for uid, d in self.users.items()]
+            ),
+            add=self.logs.append,
+        )
+
+    @staticmethod
+    def write_option(last_update_time):
+        return last_update_time
+
+
+def test_sun_sign_from_birth_date():
+    assert sun_sign_index_from_date("1990-03-21") == 0  # Koç
+    assert sun_sign_index_from_date("1990-01-05") == 9  # Oğlak
+    assert sun_sign_index_from_date(date(1990, 12, 25)) == 9
+    assert sun_sign_index_from_date("1990-02-19") == 11  # Balık
+    assert sun_sign_index_from_date("not-a-date") is None
+    assert sun_sign_index_from_date(None) is None
+
+
+def test_group_key_prefers_saved_sign_then_birth_date():
+    assert group_key_for_user({"sunSign": "Aslan", "birthDate": "1990-03-21"}) == "sign_4"
+    assert group_key_for_user({"birthDate": "1990-03-21"}) == "sign_0"
+    assert group_key_for_user({"email": "a@b.c"}) == GENERAL_GROUP
+    assert group_label("sign_4") == "Aslan"
+    assert group_label(GENERAL_GROUP) is None
+
+
+def _campaign_db():
+    db = FakeCampaignDB({
+        "u1": {"fcmTokens": [{"token": "t1"}], "sunSign": 0},
+        "u2": {"fcmTokens": [{"token": "t2"}], "sunSign": 1},
+    })
+    db.campaign.set({"groups": {
+        "sign_0": {"text": "Koç metni", "sent": True},
+        "sign_1": {"text": "Boğa metni"},
+    }})
+    return db
+
+
+def test_resumed_campaign_skips_groups_already_sent():
+    db = _campaign_db()
+    with patch("services.push_fanout.push_fanout.send") as send:
+        send.return_value = {"success_count": 1, "failure_count": 0}
+        result = DailyPushCampaign("c1", db=db).run()
+
+    assert [c.args[0] for c in send.call_args_list] == [["t2"]]
+    assert send.call_args.kwargs["owners"] == {"t2": "u2"}
+    assert result["report"]["skipped_sent_groups"] == 1
+    assert db.campaign.data["groups"]["sign_1"]["sent"] is True
+
+
+def test_concurrent_run_cannot_claim_a_group_claimed_by_another():
+    db = _campaign_db()
+    first, second = DailyPushCampaign("c1", db=db), DailyPushCampaign("c1", db=db)
+
+    assert first._claim_group("sign_1")
+    assert not second._claim_group("sign_1")
+    assert not first._claim_group("sign_0")  # already sent
@@ -0,0 +1,165 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from firebase_admin import messaging
+
+from services.push_fanout import PushFanout, remove_tokens
+
+
+def ok():
+    return SimpleNamespace(success=True, exception=None)
+
+
+def failed(exc):
+    return SimpleNamespace(success=False, exception=exc)
+
+
+class FakeSender:
+    """Records batch sizes; tokens starting with 'bad' are unregistered, 'quota' fail once."""
+
+    def __init__(self, raise_quota_times=0):
+        self.batches = []
+        self.raise_quota_times = raise_quota_times
+        self.seen_quota = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, message):
+        with self.lock:
+            self.batches.append(list(message.tokens))
+            if self.raise_quota_times:
+                self.raise_quota_times -= 1
+                raise messaging.QuotaExceededError("quota")
+        responses = []
+        for token in message.tokens:
+            if token.startswith("bad"):
+                responses.append(failed(messaging.UnregisteredError("gone")))
+            elif token.startswith("quota") and token not in self.seen_quota:
+                self.seen_quota.add(token)
+                responses.append(failed(messaging.QuotaExceededError("quota")))
+            else:
+                responses.append(ok())
+        return SimpleNamespace(responses=responses)
+
+
+class FakeSnap:
+    def __init__(self, uid, data):
+        self.id, self.reference, self._data, self.exists = uid, uid, data, True
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db, self.ops = db, []
+
+    def update(self, ref, data):
+        self.ops.append((ref, data))
+
+    def commit(self):
+        self.db.commits.append(self.ops)
+
+
+class FakeDB:
+    def __init__(self, users):
+        self.users, self.commits, self.get_all_calls, self.streams = users, [], [], 0
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def collection(self, name):
+        return self
+
+    def document(self, uid):
+        return uid
+
+    def select(self, fields):
+        return self
+
+    def limit(self, n):
+        self.scan_limit = n
+        return self
+
+    def stream(self):
+        self.streams += 1
+        return [FakeSnap(uid, data) for uid, data in self.users.items()]
+
+    def get_all(self, refs, field_paths=None):
+        self.get_all_calls.append(list(refs))
+        return [FakeSnap(uid, self.users[uid]) for uid in refs]
+
+
+def engine(sender, db=None):
+    return PushFanout(db=db or FakeDB({}), send_fn=sender, concurrency=3, sleep=lambda s: None)
+
+
+def test_tokens_are_chunked_into_multicast_batches():
+    sender = FakeSender()
+    stats = engine(sender).send([f"t{i}" for i in range(1201)], "T", "B", log=False)
+
+    assert sorted(len(b) for b in sender.batches) == [201, 500, 500]
+    assert stats["batches"] == 3
+    assert stats["success_count"] == 1201
+    assert stats["failure_count"] == 0
+
+
+def test_quota_errors_are_retried_with_backoff():
+    sender = FakeSender(raise_quota_times=1)
+    stats = engine(sender).send(["a", "quota1", "b"], "T", "B", log=False)
+
+    # whole batch retried after the raised quota error, then only quota1 again
+    assert sender.batches == [["a", "quota1", "b"], ["a", "quota1", "b"], ["quota1"]]
+    assert stats["success_count"] == 3
+    assert stats["retries"] == 2
+
+
+def test_invalid_tokens_are_removed_in_one_batched_pass():
+    db = FakeDB({
+        "u1": {"fcmTokens": [{"token": "bad1"}, {"token": "good1"}]},
+        "u2": {"fcmTokens": [{"token": "bad2"}]},
+        "u3": {"fcmTokens": [{"token": "good2"}]},
+    })
+    stats = engine(FakeSender(), db).send(["bad1", "good1", "bad2", "good2"], "T", "B", log=False)
+
+    assert stats["invalid_tokens"] == 2
+    assert stats["users_cleaned"] == 2
+    assert db.streams == 1
+    assert db.commits == [[("u1", {"fcmTokens": [{"token": "good1"}]}), ("u2", {"fcmTokens": []})]]
+
+
+def test_multi_device_push_bounds_the_owner_scan():
+    from services.firebase_service import INVALID_TOKEN_SCAN_LIMIT, FirebaseService
+    from services.push_fanout import push_fanout
+
+    db = FakeDB({"u1": {"fcmTokens": [{"token": "bad1"}]}})
+    fanout = engine(FakeSender(), db)
+    with patch.object(push_fanout, "send", fanout.send):
+        service = FirebaseService.__new__(FirebaseService)  # no Firebase app needed
+        stats = service.send_push_to_multiple(["bad1", "good1"], "T", "B")
+
+    assert stats["users_cleaned"] == 1
+    assert db.scan_limit == INVALID_TOKEN_SCAN_LIMIT
+
+
+def test_remove_tokens_reads_only_known_owners():
+    db = FakeDB({"u1": {"fcmTokens": [{"token": "x"}, {"token": "y"}]}, "u2": {"fcmTokens": []}})
+
+    assert remove_tokens(db, ["x"], owners={"x": "u1"}) == 1
+    assert db.get_all_calls == [["u1"]]
+    assert db.streams == 0
+
+
+def test_single_token_cleanup_uses_registry_owner_or_bounded_scan():
+    from services.token_registry import token_registry
+
+    db = FakeDB({"u1": {"fcmTokens": [{"token": "x"}]}, "u2": {"fcmTokens": [{"token": "y"}]}})
+    token_registry._put("u2", ["y"])
+    try:
+        assert remove_tokens(db, ["y"], scan_limit=500) == 1
+        assert db.get_all_calls == [["u2"]] and db.streams == 0
+
+        assert remove_tokens(db, ["x"], scan_limit=500) == 1
+        assert db.streams == 1 and db.scan_limit == 500
+    finally:
+        token_registry.invalidate()
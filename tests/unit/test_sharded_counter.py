@@ -0,0 +1,73 @@
+from google.cloud.firestore_v1.transforms import Increment
+
+from services.sharded_counter import DailyCounters, ShardedCounter
+
+
+class FakeDoc:
+    def __init__(self, store, path):
+        self.store, self.path = store, path
+
+    def collection(self, name):
+        return FakeCollection(self.store, f"{self.path}/{name}")
+
+    def set(self, data, merge=False):
+        doc = self.store.setdefault(self.path, {})
+        for key, value in data.items():
+            doc[key] = doc.get(key, 0) + value.value if isinstance(value, Increment) else value
+
+    def to_dict(self):
+        return dict(self.store[self.path])
+
+
+class FakeCollection:
+    def __init__(self, store, path):
+        self.store, self.path = store, path
+
+    def document(self, name):
+        return FakeDoc(self.store, f"{self.path}/{name}")
+
+    def stream(self):
+        prefix = self.path + "/"
+        return [FakeDoc(self.store, p) for p in self.store
+                if p.startswith(prefix) and "/" not in p[len(prefix):]]
+
+
+class FakeDB:
+    def __init__(self):
+        self.store = {}
+
+    def collection(self, name):
+        return FakeCollection(self.store, name)
+
+
+def test_increments_spread_over_shards_and_read_aggregates():
+    db = FakeDB()
+    counter = ShardedCounter(db, "stats", "dashboard", num_shards=4, ttl=0)
+    for _ in range(40):
+        counter.increment({"total_analyses": 1, "total_users": 0})
+
+    shards = [p for p in db.store if p.startswith("stats/dashboard/shards/")]
+    assert len(shards) > 1
+    assert counter.read() == {"total_analyses": 40}
+
+
+def test_read_is_cached_until_next_local_write():
+    db = FakeDB()
+    counter = ShardedCounter(db, "stats", "dashboard", num_shards=2, ttl=60)
+    counter.increment({"total_users": 2})
+    assert counter.read() == {"total_users": 2}
+
+    db.collection("stats").document("dashboard").collection("shards").document("0").set(
+        {"total_users": Increment(5)}, merge=True)
+    assert counter.read() == {"total_users": 2}  # cached
+    assert counter.read(use_cache=False) == {"total_users": 7}
+
+
+def test_daily_counters_are_partitioned_by_date():
+    db = FakeDB()
+    daily = DailyCounters(db, num_shards=2, ttl=0)
+    daily.for_day("2026-01-01").increment({"analyses_today": 3})
+    daily.for_day("2026-01-02").increment({"analyses_today": 1})
+
+    assert daily.for_day("2026-01-01").read() == {"analyses_today": 3}
+    assert daily.for_day("2026-01-02").read() == {"analyses_today": 1}
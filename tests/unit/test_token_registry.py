@@ -0,0 +1,107 @@
+from services.token_registry import TokenRegistry
+
+
+class FakeSnap:
+    def __init__(self, uid, data):
+        self.id = uid
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeDoc:
+    def __init__(self, db, uid):
+        self.db, self.id = db, uid
+
+    def get(self):
+        self.db.reads.append(self.id)
+        return FakeSnap(self.id, self.db.users.get(self.id))
+
+
+class FakeDB:
+    def __init__(self, users):
+        self.users, self.reads, self.get_all_calls = users, [], []
+
+    def collection(self, name):
+        return self
+
+    def document(self, uid):
+        return FakeDoc(self, uid)
+
+    def get_all(self, refs, field_paths=None):
+        refs = list(refs)
+        self.get_all_calls.append([r.id for r in refs])
+        return [FakeSnap(r.id, self.users.get(r.id)) for r in refs]
+
+
+def tokens(*values):
+    return {"fcmTokens": [{"token": v, "platform": "web"} for v in values]}
+
+
+def test_get_is_cached_until_invalidated():
+    db = FakeDB({"u1": tokens("a", "b")})
+    registry = TokenRegistry(db=db)
+
+    assert registry.get("u1") == ["a", "b"]
+    assert registry.get("u1") == ["a", "b"]
+    assert db.reads == ["u1"]
+
+    db.users["u1"] = tokens("a", "b", "c")
+    registry.invalidate("u1")
+    assert registry.get("u1") == ["a", "b", "c"]
+    assert db.reads == ["u1", "u1"]
+
+
+def test_owns_rechecks_unknown_tokens_only():
+    db = FakeDB({"u1": tokens("a")})
+    registry = TokenRegistry(db=db)
+
+    assert registry.owns("u1", "a") is True
+    assert registry.owns("u1", "a") is True
+    assert len(db.reads) == 1
+
+    # registered by another worker: negative answer is verified with a fresh read
+    db.users["u1"] = tokens("a", "new")
+    assert registry.owns("u1", "new") is True
+    assert registry.owns("u1", "other") is False
+    assert len(db.reads) == 3
+
+
+def test_invalidate_tokens_drops_every_owner():
+    db = FakeDB({"u1": tokens("shared", "x"), "u2": tokens("shared")})
+    registry = TokenRegistry(db=db)
+    registry.resolve(["u1", "u2"])
+
+    registry.invalidate_tokens(["shared"])
+    registry.get("u1")
+    registry.get("u2")
+
+    assert db.reads == ["u1", "u2"]
+
+
+def test_cache_is_bounded_lru():
+    db = FakeDB({f"u{i}": tokens(f"t{i}") for i in range(3)})
+    registry = TokenRegistry(db=db, max_size=2)
+
+    registry.get("u0")
+    registry.get("u1")
+    registry.get("u0")  # u0 most recently used
+    registry.get("u2")  # evicts u1
+
+    db.reads.clear()
+    registry.get("u0")
+    registry.get("u1")
+    assert db.reads == ["u1"]
+
+
+def test_resolve_batches_missing_users_with_get_all():
+    db = FakeDB({"u1": tokens("a"), "u2": tokens("b", "c"), "u3": None})
+    registry = TokenRegistry(db=db)
+    registry.get("u1")
+
+    result = registry.resolve(["u1", "u2", "u3", "u2"])
+
+    assert result == {"u1": ["a"], "u2": ["b", "c"], "u3": []}
+    assert db.get_all_calls == [["u2", "u3"]]
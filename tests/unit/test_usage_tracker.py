@@ -0,0 +1,185 @@
+from datetime import date
+from types import SimpleNamespace
+
+from google.cloud.firestore_v1.transforms import Increment
+
+from monetization.usage_compaction import LocalUsageLog, compact_firestore, split_usage
+from monetization.usage_tracker import UsageTracker
+
+
+class FakeDocRef:
+    def __init__(self, store, key):
+        self.store, self.key = store, key
+        self.reads = 0
+
+    def set(self, data, merge=False):
+        doc = self.store.setdefault(self.key, {})
+        value = None
+        for field, item in data.items():
+            if field == "usage":
+                usage = doc.setdefault("usage", {})
+                for day, inc in item.items():
+                    usage[day] = value = usage.get(day, 0) + inc.value
+            else:
+                doc[field] = item
+        return SimpleNamespace(transform_results=[SimpleNamespace(integer_value=value, double_value=0)])
+
+    def get(self):
+        self.reads += 1
+        data = self.store.get(self.key)
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: data)
+
+
+class FakeDB:
+    def __init__(self):
+        self.store, self.refs = {}, {}
+
+    def collection(self, name):
+        return self
+
+    def document(self, key):
+        return self.refs.setdefault(key, FakeDocRef(self.store, key))
+
+
+def _tracker(db):
+    tracker = UsageTracker.__new__(UsageTracker)
+    tracker.use_supabase, tracker.use_memory, tracker.db = True, False, db
+    UsageTracker._usage_cache.clear()
+    return tracker
+
+
+def test_record_usage_is_a_single_write_without_reads():
+    db = FakeDB()
+    tracker = _tracker(db)
+
+    results = [tracker.record_usage("dev-1", email="a@b.c") for _ in range(3)]
+
+    assert [r["today_usage"] for r in results] == [1, 2, 3]
+    assert db.refs["dev-1"].reads == 0
+    assert db.store["dev-1"]["usage"] == {date.today().isoformat(): 3}
+    assert db.store["dev-1"]["email"] == "a@b.c"
+
+
+def test_get_user_usage_is_served_from_cache():
+    db = FakeDB()
+    tracker = _tracker(db)
+    tracker.record_usage("dev-1")
+
+    assert tracker.get_user_usage("dev-1")["today_usage"] == 1
+    assert db.refs["dev-1"].reads == 0
+
+    UsageTracker._usage_cache.clear()
+    assert tracker.get_user_usage("dev-1")["today_usage"] == 1
+    assert tracker.get_user_usage("dev-2")["today_usage"] == 0
+    assert db.refs["dev-1"].reads == 1
+    assert "dev-2" not in db.store  # reading no longer creates the document
+
+
+def test_split_usage_rolls_old_days_into_months():
+    usage = {"2026-01-30": 2, "2026-01-31": 1, "2026-02-20": 4, "2026-03-01": 5}
+    recent, rolled = split_usage(usage, today=date(2026, 3, 1), keep_days=14)
+    assert recent == {"2026-02-20": 4, "2026-03-01": 5}
+    assert rolled == {"2026-01": 3}
+
+
+def test_local_log_appends_and_snapshots(tmp_path):
+    path = str(tmp_path / "usage_data.json")
+    worker_a = LocalUsageLog(path, snapshot_every=3)
+    worker_b = LocalUsageLog(path, snapshot_every=3)
+
+    worker_a.record("dev-1", "2020-01-01", "t1")
+    worker_b.record("dev-1", "2020-01-01", "t2")
+    assert worker_a.get("dev-1")["usage"] == {"2020-01-01": 2}
+
+    today = date.today().isoformat()
+    worker_a.record("dev-1", today, "t3")  # third line -> snapshot + compaction
+    assert (tmp_path / "usage_data.log").read_text() == ""
+
+    record = worker_b.get("dev-1")
+    assert record["usage"] == {today: 1}
+    assert record["usage_monthly"] == {"2020-01": 2}
+    assert record["last_ad_watch"] == "t3"
+
+
+def test_refund_reverses_a_reserved_usage():
+    db = FakeDB()
+    tracker = _tracker(db)
+    tracker.record_usage("dev-1", "ai_interpretation")
+    tracker.record_usage("dev-1", "ai_interpretation")
+    tracker.refund_usage("dev-1")
+
+    assert db.store["dev-1"]["usage"][date.today().isoformat()] == 1
+    assert tracker.get_user_usage("dev-1")["today_usage"] == 1
+
+
+class UsageDoc:
+    def __init__(self, doc_id, usage):
+        self.id, self.usage, self.version = doc_id, dict(usage), 0
+
+    def snapshot(self):
+        return SimpleNamespace(id=self.id, reference=self, update_time=self.version,
+                               to_dict=lambda usage=dict(self.usage): {"usage": usage})
+
+    def get(self, fields=None):
+        return self.snapshot()
+
+    def update(self, updates, option=None):
+        if option != self.version:
+            raise RuntimeError("precondition failed")
+        for path in updates:
+            if path.startswith("usage."):
+                self.usage.pop(path.split(".", 1)[1].strip("`"), None)
+        self.version += 1
+
+
+class UsageBatch:
+    def __init__(self):
+        self.writes = []
+
+    def update(self, ref, updates, option=None):
+        self.writes.append((ref, updates, option))
+
+    def commit(self):
+        if any(option != ref.version for ref, _, option in self.writes):
+            raise RuntimeError("precondition failed")
+        for ref, updates, option in self.writes:
+            ref.update(updates, option)
+
+
+class UsageDB:
+    def __init__(self, docs, on_stream=None):
+        self.docs, self.on_stream = docs, on_stream
+
+    def collection(self, name):
+        return self
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        snaps = [doc.snapshot() for doc in self.docs]
+        if self.on_stream:
+            self.on_stream()
+        return iter(snaps)
+
+    def batch(self):
+        return UsageBatch()
+
+    @staticmethod
+    def write_option(last_update_time):
+        return last_update_time
+
+
+def test_compaction_retries_conflicting_batch_doc_by_doc():
+    docs = [UsageDoc(f"dev-{i}", {"2020-01-01": 1, "2026-03-01": 2}) for i in range(5)]
+    busy = docs[2]
+
+    def concurrent_write():
+        busy.version += 1  # device recorded usage after the scan read it
+
+    stats = compact_firestore(UsageDB(docs, concurrent_write), keep_days=14,
+                              today=date(2026, 3, 1), batch_size=3)
+
+    assert stats["compacted"] == 5 and stats["skipped"] == 0
+    assert stats["retried"] == 3  # only the batch holding the busy doc
+    assert all(doc.usage == {"2026-03-01": 2} for doc in docs)
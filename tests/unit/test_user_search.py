@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+from services.user_search import InMemorySearchBackend, UserSearchIndex, index_tokens
+
+
+class FakeDB:
+    def __init__(self, users):
+        self.users = users
+        self.scans = 0
+
+    def collection(self, name):
+        return self
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        self.scans += 1
+        return [SimpleNamespace(id=uid, to_dict=lambda d=data: d) for uid, data in self.users.items()]
+
+    def document(self, uid):
+        data = self.users.get(uid)
+        return SimpleNamespace(get=lambda fields=None: SimpleNamespace(exists=data is not None, to_dict=lambda: data))
+
+
+class FailingBackend(InMemorySearchBackend):
+    def __init__(self):
+        super().__init__()
+        self.locked = False
+
+    def try_lock_rebuild(self):
+        self.locked = True
+        return True
+
+    def release_rebuild(self):
+        self.locked = False
+
+    def replace_all(self, docs):
+        raise ConnectionError("redis down")
+
+
+USERS = {
+    "u1": {"email": "ayse.kaya@gmail.com", "displayName": "Ayşe Kaya"},
+    "u2": {"email": "mehmet@orbis.app", "displayName": "Mehmet Yıldız"},
+    "u3": {"email": "kaan_demir@gmail.com", "displayName": None},
+}
+
+
+def test_tokens_cover_email_parts_and_name_words():
+    assert index_tokens("ayse.kaya@gmail.com", "Ayşe Kaya") == [
+        "ayse", "ayse.kaya@gmail.com", "ayşe", "ayşe kaya", "com", "gmail", "kaya",
+    ]
+
+
+def test_prefix_search_is_paged_and_sorted_by_email():
+    db = FakeDB(USERS)
+    index = UserSearchIndex(backend=InMemorySearchBackend(), db=db)
+
+    assert index.search("ka") == (2, ["u1", "u3"])
+    assert index.search("gmail", offset=1, limit=1) == (2, ["u3"])
+    assert index.search("MEHMET") == (1, ["u2"])
+    assert index.search("xyz") == (0, [])
+    assert db.scans == 1  # snapshot built once
+
+
+def test_incremental_upsert_replaces_old_tokens():
+    index = UserSearchIndex(backend=InMemorySearchBackend(), db=FakeDB(USERS))
+    index.search("")  # build
+
+    index.upsert("u2", "mehmet@orbis.app", "Memo")
+    index.upsert("u4", "zeynep@orbis.app", "Zeynep")
+
+    assert index.search("yıldız") == (0, [])
+    assert index.search("memo") == (1, ["u2"])
+    assert index.search("orbis") == (2, ["u2", "u4"])
+
+
+def test_refresh_reads_the_user_document_not_client_data():
+    users = dict(USERS)
+    index = UserSearchIndex(backend=InMemorySearchBackend(), db=FakeDB(users))
+    index.search("")
+
+    users["u2"] = {"email": "mehmet@orbis.app", "displayName": "Memo"}
+    index.refresh_user("u2")
+    index.refresh_user("made-up-uid")
+
+    assert index.search("memo") == (1, ["u2"])
+    assert index.search("") == (3, ["u1", "u3", "u2"])
+
+
+def test_build_failure_falls_back_and_releases_the_lock():
+    backend = FailingBackend()
+    index = UserSearchIndex(backend=backend, db=FakeDB(USERS))
+
+    assert index.search("ka") is None
+    assert backend.locked is False
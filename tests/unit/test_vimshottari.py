@@ -0,0 +1,69 @@
+import random
+from datetime import datetime
+
+from services.astro_service import NAKSHATRAS, get_vimshottari_dasa, get_vimshottari_timeline
+from services.vimshottari import DASA_ORDER, DASA_YEARS, DasaTimeline, datetime_to_jd, jd_to_datetime
+
+BIRTH = datetime(1990, 5, 17, 14, 30)
+
+
+def test_nakshatra_lords_follow_dasa_order():
+    assert [n["lord"] for n in NAKSHATRAS] == [DASA_ORDER[i % 9] for i in range(27)]
+
+
+def test_first_boundary_is_birth_plus_balance():
+    # Moon at 3.4° into Magha (Ketu): 25.5% of Ketu's 7 years already elapsed
+    timeline = DasaTimeline.from_birth(datetime_to_jd(BIRTH), 123.4)
+    balance_days = (1 - 3.4 / (360 / 27)) * 7 * 365.25
+
+    assert timeline.lords[:3] == ("Ketu", "Venus", "Sun")
+    assert len(timeline.lords) == 18
+    assert abs(timeline.bounds[1] - (datetime_to_jd(BIRTH) + balance_days)) < 1e-6
+    assert abs(timeline.bounds[-1] - timeline.bounds[0] - 240 * 365.25) < 1e-6
+
+
+def test_locate_matches_linear_scan_at_every_level():
+    rng = random.Random(48)
+    timeline = DasaTimeline.from_birth(datetime_to_jd(BIRTH), rng.uniform(0, 360))
+    for _ in range(300):
+        jd = rng.uniform(timeline.bounds[0], timeline.bounds[-1])
+        found = timeline.locate(jd, depth=4)
+        path = ()
+        for period in found:
+            expected = [p for p in timeline.periods(path) if p.start <= jd < p.end]
+            assert [period] == expected
+            path += (period.index,)
+        assert len(found) == 4
+
+
+def test_sub_periods_are_expanded_lazily_and_fill_parent():
+    timeline = DasaTimeline.from_birth(0.0, 10.0)
+    assert list(timeline._levels) == [()]
+
+    maha = timeline.periods()[3]
+    antars = timeline.periods((3,))
+    assert list(timeline._levels) == [(), (3,)]
+    assert [a.lord for a in antars][0] == maha.lord
+    assert antars[0].start == maha.start and antars[-1].end == maha.end
+    assert abs((antars[1].end - antars[1].start) - (maha.end - maha.start) * DASA_YEARS[antars[1].lord] / 120) < 1e-9
+
+
+def test_serialized_timeline_round_trips():
+    timeline = get_vimshottari_timeline(BIRTH, 200.0)
+    restored = DasaTimeline.from_dict(timeline.to_dict())
+    jd = datetime_to_jd(datetime(2030, 1, 1))
+    assert restored.locate(jd) == timeline.locate(jd)
+    assert abs((jd_to_datetime(datetime_to_jd(BIRTH)) - BIRTH).total_seconds()) < 0.001
+
+
+def test_current_dasa_uses_reference_date_and_cached_timeline():
+    timeline = get_vimshottari_timeline(BIRTH, 123.4)
+    result = get_vimshottari_dasa(BIRTH, 123.4, now=datetime(2026, 10, 19), timeline=timeline)
+
+    assert result["current_period"] == "Moon-Saturn-Moon"
+    assert result["main_dasa_start_date"] == "2021-08-03"
+    assert sum(b["is_current"] for b in result["all_bhuktis_in_current_dasa"]) == 1
+    assert result["future_timeline"][0]["type"] == "Maha Dasa"
+
+    assert "error" in get_vimshottari_dasa(BIRTH, 123.4, now=datetime(2300, 1, 1))
+    assert "error" in get_vimshottari_dasa(BIRTH, None)
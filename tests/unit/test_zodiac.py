@@ -0,0 +1,38 @@
+from services import zodiac
+from services.astro_service import get_element, get_modality, get_polarity, get_zodiac_sign
+from utils import get_element_class, get_zodiac_sign as utils_get_zodiac_sign
+
+
+def test_sign_lookup_by_degree():
+    assert get_zodiac_sign(0) == "Koç"
+    assert get_zodiac_sign(29.999) == "Koç"
+    assert get_zodiac_sign(30) == "Boğa"
+    assert get_zodiac_sign(359.9) == "Balık"
+    assert get_zodiac_sign(-15) == "Balık"
+    assert get_zodiac_sign(725) == "Koç"
+    assert utils_get_zodiac_sign(45.5) == "Boğa"
+    assert zodiac.sign_index(-1e-20) == 0
+
+
+def test_sign_info_codes_and_localized_serialization():
+    scorpio = zodiac.sign_info(215)
+    assert scorpio == zodiac.SIGNS[7]
+    assert (scorpio.element, scorpio.modality, scorpio.polarity) == (zodiac.WATER, zodiac.FIXED, zodiac.FEMININE)
+    assert scorpio.ruler == "Mars"
+    assert zodiac.SIGNS[0].exaltation == "Sun"
+
+    assert scorpio.to_dict() == {"sign": "Akrep", "element": "Su", "modality": "Sabit",
+                                 "polarity": "Dişi", "ruler": "Mars", "exaltation": None}
+    assert scorpio.to_dict("en")["sign"] == "Scorpio"
+
+
+def test_name_based_helpers_keep_previous_values():
+    assert [get_element(s) for s in ("Koç", "Boğa", "İkizler", "Yengeç")] == ["Ateş", "Toprak", "Hava", "Su"]
+    assert [get_modality(s) for s in ("Terazi", "Kova", "Balık")] == ["Kardinal", "Sabit", "Değişken"]
+    assert [get_polarity(s) for s in ("Yay", "Oğlak")] == ["Erkek", "Dişi"]
+    assert get_element("???") == "Bilinmiyor"
+    assert get_element(None) == "Bilinmiyor"
+
+    assert get_element_class("Koç") == "fire"
+    assert get_element_class("aquarius") == "air"
+    assert get_element_class("") == ""
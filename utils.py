@@ -17,6 +17,8 @@ from typing import Union, Optional, Any
 from functools import singledispatch
 import logging
 
+from services import zodiac
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,10 +55,7 @@ class Constants:
     
     # Astrology Constants
     DEFAULT_HOUSE_SYSTEM = b"P"  # Porphyry (default)
-    ZODIAC_SIGNS = [
-        "Koç", "Boğa", "İkizler", "Yengeç", "Aslan", "Başak",
-        "Terazi", "Akrep", "Yay", "Oğlak", "Kova", "Balık"
-    ]
+    ZODIAC_SIGNS = zodiac.SIGN_NAMES["tr"]  # tek kaynak: services/zodiac.py
     
     # Planet Symbols
     PLANET_SYMBOLS = {
@@ -64,12 +63,7 @@ class Constants:
         "Mars": "♂", "Jupiter": "♃", "Saturn": "♄", "Uranus": "♅",
         "Neptune": "♆", "Pluto": "♇"
     }
-    
-    # Element Classes
-    ELEMENT_FIRE = ["Koç", "Aslan", "Yay", "Aries", "Leo", "Sagittarius"]
-    ELEMENT_EARTH = ["Boğa", "Başak", "Oğlak", "Taurus", "Virgo", "Capricorn"]
-    ELEMENT_AIR = ["İkizler", "Terazi", "Kova", "Gemini", "Libra", "Aquarius"]
-    ELEMENT_WATER = ["Yengeç", "Akrep", "Balık", "Cancer", "Scorpio", "Pisces"]
+    # Burç elementleri için tek kaynak: services.zodiac.element_name
 
 
 # =============================================================================
@@ -263,21 +257,8 @@ def get_element_class(sign_name: str) -> str:
         >>> get_element_class("Aries")
         'fire'
     """
-    if not sign_name:
-        return ""
-    
-    sign_lower = sign_name.lower()
-    
-    if sign_lower in [s.lower() for s in Constants.ELEMENT_FIRE]:
-        return "fire"
-    elif sign_lower in [s.lower() for s in Constants.ELEMENT_EARTH]:
-        return "earth"
-    elif sign_lower in [s.lower() for s in Constants.ELEMENT_AIR]:
-        return "air"
-    elif sign_lower in [s.lower() for s in Constants.ELEMENT_WATER]:
-        return "water"
-    else:
-        return ""
+    info = zodiac.info_for_name(sign_name)
+    return zodiac.ELEMENT_KEYS[info.element] if info else ""
 
 
 def get_planet_symbol(planet_name: str) -> str:
@@ -303,19 +284,7 @@ def get_zodiac_sign(degree: float) -> str:
     Returns:
         Burç adı
     """
-    degree = float(degree) % 360  # Normalize to 0-360
-    
-    signs = [
-        (0, "Koç"), (30, "Boğa"), (60, "İkizler"), (90, "Yengeç"),
-        (120, "Aslan"), (150, "Başak"), (180, "Terazi"), (210, "Akrep"),
-        (240, "Yay"), (270, "Oğlak"), (300, "Kova"), (330, "Balık")
-    ]
-    
-    for sign_degree, sign_name in reversed(signs):
-        if degree >= sign_degree:
-            return sign_name
-    
-    return "Bilinmeyen"
+    return zodiac.sign_name(float(degree))
 
 
 # =============================================================================